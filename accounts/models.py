@@ -3,7 +3,7 @@ import datetime
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.db import models
 
-from subscription.models import Subscription
+from subscription.models import Subscription, get_subscription_active_until
 
 from .managers import UserManager
 
@@ -43,9 +43,13 @@ class User(AbstractBaseUser, PermissionsMixin):
 
     @property
     def is_subscriber(self) -> bool:
-        """Check whether user has active subscription."""
+        """Check whether user has active subscription.
 
-        if self.get_active_subscription() is not None:
-            return True
+        Uses the cached active-until date rather than querying subscriptions.
+        """
+        active_until = get_subscription_active_until(self.pk)
 
-        return False
+        if active_until is None:
+            return False
+
+        return active_until >= datetime.date.today()
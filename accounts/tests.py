@@ -1,4 +1,5 @@
 import datetime
+from django.core.cache import cache
 from django.test import TestCase
 from .models import User
 from subscription.models import Subscription
@@ -44,6 +45,8 @@ class UserManagerTest(TestCase):
 # User model tests
 class UserModelTest(TestCase):
     def setUp(self) -> None:
+        cache.clear()
+
         self.user = User.objects.create_user(
             email="test@test.com",
             password="testpass",
@@ -98,3 +101,15 @@ class UserModelTest(TestCase):
             self.user.is_subscriber,
             False,
         )
+
+    def test_is_not_subscriber_with_expired_paid_subscription(self) -> None:
+        # Test if is_subscriber returns False once paid subscriptions have ended
+        self.active_subscription.end_date = datetime.date.today() - datetime.timedelta(
+            days=1,
+        )
+        self.active_subscription.save()
+
+        self.assertEqual(
+            self.user.is_subscriber,
+            False,
+        )
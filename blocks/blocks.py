@@ -6,6 +6,13 @@ from wagtail.images.blocks import ImageChooserBlock
 from wagtail_color_panel.blocks import NativeColorBlock
 from wagtailmedia.blocks import AbstractMediaChooserBlock
 
+from common.body_cache import CachedRenderMixin
+from common.renditions import (
+    BODY_IMAGE_FILTER_SPEC,
+    BODY_IMAGE_SRCSET_MAX_WIDTH,
+    get_responsive_filter_specs,
+)
+
 # TODO: convert to a models.TextChoices class
 # e.g. in donations/models.py
 IMAGE_ALIGN_CHOICES = [
@@ -41,8 +48,14 @@ class CardBlock(wagtail_blocks.StructBlock):
         icon = "form"
         template = "blocks/blocks/card.html"
 
+    def get_image_filter_specs(self, value):
+        return [(value.get("image"), ["fill-200x200"])]
+
 
-class FormattedImageChooserStructBlock(wagtail_blocks.StructBlock):
+class FormattedImageChooserStructBlock(
+    CachedRenderMixin,
+    wagtail_blocks.StructBlock,
+):
     image = ImageChooserBlock()
     width = wagtail_blocks.IntegerBlock(
         min_value=0,
@@ -68,6 +81,20 @@ class FormattedImageChooserStructBlock(wagtail_blocks.StructBlock):
         icon = "media"
         template = "blocks/blocks/formatted_image_block.html"
 
+    def get_render_dependencies(self, value):
+        return [value["image"]]
+
+    def get_image_filter_specs(self, value):
+        return [
+            (
+                value.get("image"),
+                get_responsive_filter_specs(
+                    BODY_IMAGE_FILTER_SPEC,
+                    BODY_IMAGE_SRCSET_MAX_WIDTH,
+                ),
+            ),
+        ]
+
 
 class HeadingBlock(wagtail_blocks.StructBlock):
     heading_level = wagtail_blocks.ChoiceBlock(
@@ -97,7 +124,10 @@ class HeadingBlock(wagtail_blocks.StructBlock):
         template = "blocks/blocks/heading.html"
 
 
-class MediaBlock(AbstractMediaChooserBlock):
+class MediaBlock(CachedRenderMixin, AbstractMediaChooserBlock):
+    def get_render_dependencies(self, value):
+        return [value]
+
     def render_basic(self, value, context=None):
         if not value:
             return ""
@@ -1,14 +1,55 @@
+from collections.abc import Iterator
+from dataclasses import dataclass, fields
 from decimal import Decimal
-from collections.abc import Generator
+from typing import Any
 
 from django.conf import settings
 from django.http import HttpRequest
+from django.utils.functional import cached_property
 
 from shipping.calculator import get_book_shipping_cost
 from store.models import Product
 
 
+@dataclass(frozen=True)
+class CartItem:
+    """A product in the cart, at its current price."""
+
+    product: Product
+    product_id: str
+    product_title: str
+    quantity: int
+    price: Decimal
+    total_price: Decimal
+    available: bool
+
+    def __getitem__(self, key: str) -> Any:
+        # Cart items used to be dicts, so keep item["price"] working
+        if key not in {field.name for field in fields(self)}:
+            raise KeyError(key)
+
+        return getattr(self, key)
+
+
+@dataclass(frozen=True)
+class CartSnapshot:
+    """The items and totals of a cart, computed once from its products."""
+
+    items: tuple[CartItem, ...]
+    subtotal_price: Decimal
+    shipping_cost: Decimal
+    total_price: Decimal
+
+
 class Cart:
+    """A cart of products, kept in the session.
+
+    The session holds the product IDs and quantities, as well as the counts
+    shown in the page header, so pages other than the cart and checkout
+    don't load products. The cart loads its products with one query, into
+    a snapshot of the items and totals.
+    """
+
     def __init__(self, request: HttpRequest) -> None:
         """Initialize the cart."""
         self.session = request.session
@@ -41,9 +82,16 @@ class Cart:
     def save(self) -> None:
         # mark the session as "modified"
         # to make sure it gets saved
-
         self.session.modified = True
 
+        self.session[settings.CART_COUNTS_SESSION_ID] = {
+            "products": len(self.cart),
+            "quantity": sum(item["quantity"] for item in self.cart.values()),
+        }
+
+        # The snapshot is loaded again with the changed items
+        self.__dict__.pop("snapshot", None)
+
     def remove(self, product: Product) -> None:
         """Remove a product from the cart."""
         product_id = str(product.id)  # type: ignore
@@ -59,51 +107,82 @@ class Cart:
         # get the product objects and add them to the cart
         return Product.objects.filter(id__in=product_ids)
 
-    def get_total_price(self) -> Decimal:
-        int_sum = sum(
-            [
-                self.get_subtotal_price(),
-                self.get_shipping_cost(),
-            ],
-        )
-        return Decimal(int_sum).quantize(Decimal("0.01"))
+    @cached_property
+    def snapshot(self) -> CartSnapshot:
+        """Load the cart products and compute the item and cart totals.
 
-    def get_subtotal_price(self) -> Decimal:
-        totals = [
-            Decimal(item["price"]) * item["quantity"] for item in self.cart.values()
-        ]
-        product_sum = sum(totals)
-        return Decimal(product_sum).quantize(Decimal("0.01"))
+        Items of products that were deleted are removed from the cart.
+        """
+        products = {
+            str(product.id): product  # type: ignore
+            for product in self.get_cart_products().select_related("image")
+        }
 
-    def get_shipping_cost(self) -> Decimal:
-        book_quantity = sum(item["quantity"] for item in self.cart.values())
+        items = []
+        removed_product_ids = []
 
-        return get_book_shipping_cost(book_quantity)
+        for product_id, item in self.cart.items():
+            product = products.get(product_id)
 
-    def clear(self) -> None:
-        # remove cart from session
-        del self.session[settings.CART_SESSION_ID]
+            if product is None:
+                removed_product_ids.append(product_id)
+                continue
 
-        self.save()
+            items.append(
+                CartItem(
+                    product=product,
+                    product_id=product_id,
+                    product_title=product.title,
+                    quantity=item["quantity"],
+                    price=product.price,
+                    total_price=product.price * item["quantity"],
+                    available=product.available,
+                ),
+            )
+
+        if removed_product_ids:
+            for product_id in removed_product_ids:
+                del self.cart[product_id]
 
-    def __iter__(self) -> Generator:
-        """Get cart products from the database."""
-        # get the product objects and add them to the cart
-        products = self.get_cart_products()
+            self.save()
 
-        cart = self.cart.copy()
+        subtotal_price = Decimal(sum(item.total_price for item in items)).quantize(
+            Decimal("0.01"),
+        )
+        shipping_cost = get_book_shipping_cost(
+            sum(item.quantity for item in items),
+        )
 
-        for product in products:
-            if str(product.id) not in cart:  # type: ignore
-                continue
+        return CartSnapshot(
+            items=tuple(items),
+            subtotal_price=subtotal_price,
+            shipping_cost=shipping_cost,
+            total_price=Decimal(subtotal_price + shipping_cost).quantize(
+                Decimal("0.01"),
+            ),
+        )
 
-            cart[str(product.id)]["product"] = product  # type: ignore
+    def get_total_price(self) -> Decimal:
+        return self.snapshot.total_price
 
-        for item in cart.values():
-            item["price"] = Decimal(item["price"])
-            item["total_price"] = item["price"] * item["quantity"]
+    def get_subtotal_price(self) -> Decimal:
+        return self.snapshot.subtotal_price
 
-            yield item
+    def get_shipping_cost(self) -> Decimal:
+        return self.snapshot.shipping_cost
+
+    def clear(self) -> None:
+        # remove cart from session
+        del self.session[settings.CART_SESSION_ID]
+        self.session.pop(settings.CART_COUNTS_SESSION_ID, None)
+
+        self.cart = {}
+        self.session.modified = True
+        self.__dict__.pop("snapshot", None)
+
+    def __iter__(self) -> Iterator[CartItem]:
+        """Get the cart items, with their products."""
+        return iter(self.snapshot.items)
 
     def __len__(self) -> int:
         """Count all items in the cart."""
@@ -113,3 +192,24 @@ class Cart:
         item_quantities = [item["quantity"] for item in self.cart.values()]
 
         return sum(item_quantities)
+
+
+def get_cart_counts(request: HttpRequest) -> dict[str, int]:
+    """Get the counts of products and items in the cart, from the session,
+    without loading the products."""
+    session = getattr(request, "session", None)
+
+    if session is None:
+        return {"products": 0, "quantity": 0}
+
+    cart_counts = session.get(settings.CART_COUNTS_SESSION_ID)
+
+    if cart_counts is None:
+        # Carts saved before the counts were kept in the session
+        cart = session.get(settings.CART_SESSION_ID) or {}
+        cart_counts = {
+            "products": len(cart),
+            "quantity": sum(item["quantity"] for item in cart.values()),
+        }
+
+    return cart_counts
@@ -0,0 +1,9 @@
+from django.http import HttpRequest
+
+from .cart import get_cart_counts
+
+
+def cart_counts(request: HttpRequest) -> dict:
+    """Add the cart counts for the page header, which are kept in the
+    session, so pages don't load the cart products."""
+    return {"cart_counts": get_cart_counts(request)}
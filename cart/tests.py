@@ -1,4 +1,5 @@
 from decimal import Decimal
+from django.conf import settings
 from unittest.mock import Mock, patch
 from django.test import RequestFactory, TestCase
 from django.template.response import TemplateResponse
@@ -10,7 +11,7 @@ from content_migration.management.shared import get_or_create_site_root_page
 
 from store.factories import ProductFactory
 
-from .cart import Cart
+from .cart import Cart, get_cart_counts
 from store.models import Product, ProductIndexPage, StoreIndexPage
 
 
@@ -151,6 +152,76 @@ class CartTestCase(TestCase):
         self.assertEqual(cart_items[1]["price"], Decimal("19.99"))
         self.assertEqual(cart_items[1]["total_price"], Decimal("39.98"))
 
+    def test_cart_snapshot_loads_products_once(self) -> None:
+        cart = Cart(self.request)
+
+        cart.add(self.product1)
+        cart.add(self.product2, quantity=2)
+
+        with self.assertNumQueries(1):
+            list(cart)
+            cart.get_subtotal_price()
+            cart.get_shipping_cost()
+            cart.get_total_price()
+            list(cart)
+
+        self.assertEqual(cart.get_total_price(), Decimal("58.97"))
+
+    def test_cart_iteration_does_not_change_session(self) -> None:
+        cart = Cart(self.request)
+
+        cart.add(self.product1)
+        list(cart)
+
+        self.assertEqual(
+            self.request.session[settings.CART_SESSION_ID][str(self.product1.id)],
+            {
+                "product_title": "Product 1",
+                "product_id": str(self.product1.id),
+                "quantity": 1,
+                "price": "9.99",
+            },
+        )
+
+    def test_cart_uses_current_product_prices(self) -> None:
+        cart = Cart(self.request)
+
+        cart.add(self.product1)
+        Product.objects.filter(id=self.product1.id).update(price=Decimal("12.50"))
+
+        self.assertEqual(Cart(self.request).get_subtotal_price(), Decimal("12.50"))
+
+    def test_deleted_products_are_removed(self) -> None:
+        cart = Cart(self.request)
+
+        cart.add(self.product1)
+        cart.add(self.product2, quantity=2)
+        self.product2.delete()
+
+        cart = Cart(self.request)
+
+        self.assertEqual([item.product for item in cart], [self.product1])
+        self.assertEqual(len(cart), 1)
+        self.assertEqual(get_cart_counts(self.request)["quantity"], 1)
+
+    def test_cart_counts_are_kept_in_session(self) -> None:
+        cart = Cart(self.request)
+
+        cart.add(self.product1)
+        cart.add(self.product2, quantity=3)
+
+        with self.assertNumQueries(0):
+            cart_counts = get_cart_counts(self.request)
+
+        self.assertEqual(cart_counts, {"products": 2, "quantity": 4})
+
+        cart.clear()
+
+        self.assertEqual(
+            get_cart_counts(self.request),
+            {"products": 0, "quantity": 0},
+        )
+
     def tearDown(self) -> None:
         # delete all pages
         Page.objects.all().delete()
@@ -50,13 +50,6 @@ def cart_detail(
 ) -> TemplateResponse:
     cart = Cart(request)
 
-    for item in cart:
-        item["update_quantity_form"] = CartAddProductForm(
-            initial={
-                "quantity": item["quantity"],
-            },
-        )
-
     context = {
         "cart": cart,
     }
@@ -4,3 +4,16 @@ from django.apps import AppConfig
 class CommonConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "common"
+
+    def ready(self) -> None:
+        from .signals import (
+            connect_body_cache_signals,
+            connect_page_cache_signals,
+            connect_redirect_map_signals,
+            connect_rendition_signals,
+        )
+
+        connect_body_cache_signals()
+        connect_page_cache_signals()
+        connect_redirect_map_signals()
+        connect_rendition_signals()
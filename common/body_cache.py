@@ -0,0 +1,137 @@
+"""Cache the rendered HTML of page StreamFields and of expensive blocks.
+
+Rendered bodies are cached by page, latest revision and page generation,
+so saving a new revision or publishing the page renders the body again.
+Blocks whose rendering queries the database, such as image renditions,
+are also cached on their own, by their value and the generations of the
+images, documents or media they show, so a new revision only renders the
+blocks that changed.
+
+Saving or deleting an image, document or media item starts a new
+generation of it and of the pages that reference it.
+"""
+import hashlib
+import json
+import uuid
+from collections.abc import Iterable
+from typing import Any
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model
+from django.http import HttpRequest
+from django.utils.safestring import SafeString, mark_safe
+from wagtail.models import Page, ReferenceIndex
+
+from .page_cache import get_page_generation, invalidate_page_responses
+
+# New revisions and publishing change the cache keys, so the timeouts only
+# bound how long unused renderings are kept
+RENDERED_BODY_CACHE_TIMEOUT = 60 * 60 * 24
+RENDERED_BLOCK_CACHE_TIMEOUT = 60 * 60 * 24 * 7
+
+
+def get_object_generation_cache_key(obj: Model) -> str:
+    return f"rendered_block_generation:{obj._meta.label_lower}:{obj.pk}"
+
+
+def get_object_generations(objects: Iterable[Model]) -> list[str]:
+    """Get the current generations of objects, starting those there are none of."""
+    cache_keys = [get_object_generation_cache_key(obj) for obj in objects]
+
+    generations = cache.get_many(cache_keys)
+
+    for cache_key in cache_keys:
+        if cache_key not in generations:
+            cache.add(cache_key, uuid.uuid4().hex, timeout=None)
+            generations[cache_key] = cache.get(cache_key)
+
+    return [generations[cache_key] for cache_key in cache_keys]
+
+
+def invalidate_rendered_object(obj: Model) -> None:
+    """Start new generations of an object and of the pages that reference it."""
+    cache.set(get_object_generation_cache_key(obj), uuid.uuid4().hex, timeout=None)
+
+    page_ids = [
+        int(object_id)
+        for object_id in ReferenceIndex.get_references_to(obj)
+        .filter(base_content_type=ContentType.objects.get_for_model(Page))
+        .values_list("object_id", flat=True)
+        .distinct()
+    ]
+
+    if page_ids:
+        invalidate_page_responses(page_ids)
+
+
+class CachedRenderMixin:
+    """Cache the rendered HTML of a block.
+
+    The HTML must not depend on the template context. Blocks return the
+    objects their rendering depends on from `get_render_dependencies`.
+    """
+
+    def get_render_dependencies(self, value: Any) -> list[Model]:
+        return []
+
+    def get_render_cache_key(self, value: Any) -> str:
+        block_class = type(self)
+        value_json = json.dumps(
+            [
+                self.get_prep_value(value),  # type: ignore[attr-defined]
+                get_object_generations(
+                    [obj for obj in self.get_render_dependencies(value) if obj],
+                ),
+            ],
+            cls=DjangoJSONEncoder,
+            sort_keys=True,
+        )
+        value_hash = hashlib.md5(value_json.encode()).hexdigest()
+
+        return f"rendered_block:{block_class.__module__}.{block_class.__name__}:{value_hash}"  # noqa: E501
+
+    def render(self, value: Any, context: dict | None = None) -> SafeString:
+        cache_key = self.get_render_cache_key(value)
+
+        html = cache.get(cache_key)
+
+        if html is None:
+            html = str(super().render(value, context))  # type: ignore[misc]
+            cache.set(cache_key, html, RENDERED_BLOCK_CACHE_TIMEOUT)
+
+        return mark_safe(html)  # noqa: S308
+
+
+def get_rendered_body_cache_key(page: Page, field_name: str) -> str:
+    return (
+        f"rendered_body:{page.pk}:{page.latest_revision_id}:"  # type: ignore
+        f"{get_page_generation(page.pk)}:{field_name}"
+    )
+
+
+def get_rendered_stream_field(
+    page: Page,
+    field_name: str,
+    context: dict,
+) -> SafeString:
+    """Render a StreamField of a page, cached by page revision.
+
+    Previews, which render unsaved content, are never cached.
+    """
+    stream_value = getattr(page, field_name)
+    request: HttpRequest | None = context.get("request")
+
+    if page.pk is None or getattr(request, "is_preview", False):
+        return stream_value.render_as_block(context)
+
+    cache_key = get_rendered_body_cache_key(page, field_name)
+
+    html = cache.get(cache_key)
+
+    if html is None:
+        html = str(stream_value.render_as_block(context))
+        cache.set(cache_key, html, RENDERED_BODY_CACHE_TIMEOUT)
+
+    return mark_safe(html)  # noqa: S308
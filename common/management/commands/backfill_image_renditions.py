@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+from wagtail.images import get_image_model
+from wagtail.models import Page
+
+from common.models import ImageRenditionRequest
+from common.renditions import (
+    get_page_image_filter_specs,
+    request_image_renditions,
+    request_uploaded_image_renditions,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Request the renditions of all images and live pages, e.g. after the "
+        "content migration, for process_image_renditions to generate"
+    )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        request_uploaded_image_renditions(
+            get_image_model().objects.values_list("id", flat=True).iterator(),
+        )
+
+        for page in Page.objects.live().specific().iterator():
+            request_image_renditions(get_page_image_filter_specs(page))
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{ImageRenditionRequest.objects.count()} renditions are " "requested",
+            ),
+        )
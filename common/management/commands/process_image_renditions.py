@@ -0,0 +1,68 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from common.renditions import (
+    RENDITION_BATCH_SIZE,
+    RENDITION_WORKERS,
+    ImageRenditionResult,
+    process_image_rendition_requests,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate the requested image renditions, until none are left or, "
+        "with --forever, as a background worker"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=RENDITION_WORKERS,
+            help="Number of threads generating renditions",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=RENDITION_BATCH_SIZE,
+            help="Number of renditions each batch takes off the queue",
+        )
+        parser.add_argument(
+            "--forever",
+            action="store_true",
+            help="Keep waiting for requests once the queue is empty",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5,
+            help="Seconds to wait between checks of an empty queue",
+        )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        total = ImageRenditionResult()
+
+        while True:
+            result = process_image_rendition_requests(
+                batch_size=options["batch_size"],  # type: ignore
+                workers=options["workers"],  # type: ignore
+            )
+            total.generated += result.generated
+            total.failed += result.failed
+
+            if result.generated or result.failed:
+                continue
+
+            if not options["forever"]:
+                break
+
+            time.sleep(options["poll_interval"])  # type: ignore
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated the renditions of {total.generated} images, "
+                f"{total.failed} images failed",
+            ),
+        )
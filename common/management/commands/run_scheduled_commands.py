@@ -0,0 +1,50 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandParser
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the management commands in the SCHEDULED_COMMANDS setting at "
+        "their intervals, as a background process, or each once with --once"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run each command once and exit, e.g. from cron",
+        )
+
+    def run_command(self, command_name: str) -> None:
+        try:
+            call_command(command_name, stdout=self.stdout, stderr=self.stderr)
+        except Exception:
+            # A failing command is retried at its next run, without stopping
+            # the other commands
+            logger.exception("Scheduled command %s failed", command_name)
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        # Commands run when the process starts, so restarts and deploys
+        # don't delay them by a whole interval
+        next_runs = {
+            command_name: time.monotonic()
+            for command_name, _ in settings.SCHEDULED_COMMANDS
+        }
+        intervals = dict(settings.SCHEDULED_COMMANDS)
+
+        while True:
+            for command_name, next_run in next_runs.items():
+                if next_run <= time.monotonic():
+                    self.run_command(command_name)
+                    next_runs[command_name] = time.monotonic() + intervals[command_name]
+
+            if options["once"]:
+                break
+
+            time.sleep(max(min(next_runs.values()) - time.monotonic(), 0))
@@ -0,0 +1,78 @@
+from collections.abc import Callable
+
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponsePermanentRedirect,
+    HttpResponseRedirect,
+)
+
+from .page_cache import (
+    cache_page_response,
+    get_cached_page_response,
+    is_cacheable_request,
+    is_cacheable_response,
+)
+from .redirects import find_redirect
+
+
+class PageResponseCacheMiddleware:
+    """Serve cached page responses to anonymous visitors.
+
+    Responses of Wagtail pages are cached when the `before_serve_page` hook
+    marked the request with the served page and its generation.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        if not is_cacheable_request(request):
+            return self.get_response(request)
+
+        response = get_cached_page_response(request)
+
+        if response is not None:
+            return response
+
+        response = self.get_response(request)
+
+        served_page = getattr(request, "page_response_cache_page", None)
+
+        if served_page is not None and is_cacheable_response(request, response):
+            page_id, generation = served_page
+            cache_page_response(request, response, page_id, generation)
+
+        return response
+
+
+class RedirectMapMiddleware:
+    """Redirect old paths that aren't found, like Wagtail's RedirectMiddleware.
+
+    Redirects are found in the redirect map of the process, so paths without
+    a redirect, e.g. probed by bots, don't query the database.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        response = self.get_response(request)
+
+        if response.status_code != 404:
+            return response
+
+        redirect = find_redirect(request)
+
+        if redirect is None:
+            return response
+
+        link = redirect.get_link()
+
+        if link is None:
+            return response
+
+        if redirect.is_permanent:
+            return HttpResponsePermanentRedirect(link)
+
+        return HttpResponseRedirect(link)
@@ -0,0 +1,46 @@
+# Generated by Django 4.2.4 on 2026-10-18 08:48
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("wagtailimages", "0025_alter_image_file_alter_rendition_file"),
+        ("common", "0001_create_cache_table"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ImageRenditionRequest",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("filter_spec", models.CharField(max_length=255)),
+                ("requested_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "image",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="wagtailimages.image",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name="imagerenditionrequest",
+            constraint=models.UniqueConstraint(
+                fields=("image", "filter_spec"), name="unique_image_rendition_request"
+            ),
+        ),
+    ]
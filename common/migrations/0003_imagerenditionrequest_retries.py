@@ -0,0 +1,22 @@
+# Generated by Django 4.2.4 on 2026-10-18 09:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("common", "0002_imagerenditionrequest"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="imagerenditionrequest",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="imagerenditionrequest",
+            name="retry_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -8,3 +8,29 @@ class DrupalFields(models.Model):
 
     class Meta:
         abstract = True
+
+
+class ImageRenditionRequest(models.Model):
+    """A rendition of an image to generate in the background."""
+
+    image = models.ForeignKey(
+        "wagtailimages.Image",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    filter_spec = models.CharField(max_length=255)
+    requested_at = models.DateTimeField(auto_now_add=True)
+    # Failed renditions are requested again, after a delay
+    attempts = models.PositiveSmallIntegerField(default=0)
+    retry_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["image", "filter_spec"],
+                name="unique_image_rendition_request",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.image_id}: {self.filter_spec}"
@@ -0,0 +1,170 @@
+"""Cache rendered Wagtail page responses for anonymous visitors.
+
+Responses are cached by host, path and the querystring parameters that
+pages read, and served by `PageResponseCacheMiddleware` without routing or
+rendering the page. Each cached response records the generation of its
+page. Publishing or unpublishing a page starts a new generation for the
+page, its ancestors and the pages that list it, which invalidates all of
+their cached responses at once.
+"""
+import hashlib
+import uuid
+from collections.abc import Iterable
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpRequest, HttpResponse
+from django.utils.http import urlencode
+from wagtail.models import Page
+
+from library.helpers import QUERYSTRING_FACETS
+
+# Publishing invalidates the cached responses, so the timeout only bounds
+# staleness from changes outside of pages, e.g. menus and site settings
+PAGE_RESPONSE_CACHE_TIMEOUT = 60 * 60
+
+# Querystring parameters that change what pages show, other parameters
+# such as campaign tracking are left out of the cache key
+PAGE_RESPONSE_CACHE_QUERYSTRING_KEYS = {
+    "archive-issues-page",
+    "category",
+    "cursor",
+    "decade",
+    "memorial_meeting__title",
+    "page",
+    "publication_date__year",
+    "tag",
+    "title",
+    "year",
+    *QUERYSTRING_FACETS,
+}
+
+
+def get_page_response_cache_key(request: HttpRequest) -> str:
+    querystring = urlencode(
+        sorted(
+            (key, value)
+            for key, values in request.GET.lists()
+            if key in PAGE_RESPONSE_CACHE_QUERYSTRING_KEYS
+            for value in values
+        ),
+    )
+    url = f"{request.get_host()}{request.path}?{querystring}"
+
+    return f"page_response:{hashlib.md5(url.encode()).hexdigest()}"
+
+
+def get_page_generation_cache_key(page_id: int) -> str:
+    return f"page_response_generation:{page_id}"
+
+
+def get_page_generation(page_id: int) -> str:
+    """Get the current generation of a page, starting one if there is none."""
+    cache_key = get_page_generation_cache_key(page_id)
+
+    cache.add(cache_key, uuid.uuid4().hex, timeout=None)
+
+    return cache.get(cache_key)
+
+
+def is_cacheable_request(request: HttpRequest) -> bool:
+    """Check whether a request can be answered from the page response cache.
+
+    Visitors with a session, such as logged in subscribers and visitors with
+    a cart, or with pending messages, see personalized pages.
+    """
+    return (
+        request.method in ("GET", "HEAD")
+        and settings.SESSION_COOKIE_NAME not in request.COOKIES
+        and "messages" not in request.COOKIES
+        and not request.user.is_authenticated
+    )
+
+
+def is_cacheable_response(request: HttpRequest, response: HttpResponse) -> bool:
+    """Check whether a response is the same for every anonymous visitor.
+
+    Responses that set cookies or contain a CSRF token, e.g. forms, and
+    responses that showed messages are personal.
+    """
+    messages = getattr(request, "_messages", None)
+
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get("CSRF_COOKIE_USED")
+        and not (messages is not None and len(messages))
+    )
+
+
+def get_cached_page_response(request: HttpRequest) -> HttpResponse | None:
+    cached = cache.get(get_page_response_cache_key(request))
+
+    if cached is None:
+        return None
+
+    page_id, generation, response = cached
+
+    if cache.get(get_page_generation_cache_key(page_id)) != generation:
+        return None
+
+    return response
+
+
+def cache_page_response(
+    request: HttpRequest,
+    response: HttpResponse,
+    page_id: int,
+    generation: str,
+) -> None:
+    """Cache a page response with the page generation it was rendered in.
+
+    The generation is read before rendering, so a page published while it
+    renders doesn't leave the old content cached.
+    """
+    cache.set(
+        get_page_response_cache_key(request),
+        (page_id, generation, response),
+        PAGE_RESPONSE_CACHE_TIMEOUT,
+    )
+
+
+def get_dependent_page_ids(page: Page) -> set[int]:
+    """Get the IDs of a page, its ancestors and the pages that list it.
+
+    Page models can declare the other pages that list them, such as author
+    or facet pages, with a `get_listing_page_ids` method.
+    """
+    page_ids = {page.pk}
+    page_ids.update(page.get_ancestors().values_list("id", flat=True))
+
+    specific_page = page.specific_deferred
+
+    if hasattr(specific_page, "get_listing_page_ids"):
+        page_ids.update(specific_page.get_listing_page_ids())
+
+    return page_ids
+
+
+def invalidate_page_responses(page_ids: Iterable[int]) -> None:
+    """Start new generations of pages, invalidating their cached responses.
+
+    The generations are started again after the transaction commits, so a
+    request that rendered the old content before the commit can't leave it
+    cached.
+    """
+    page_ids = set(page_ids)
+
+    def start_generations() -> None:
+        cache.set_many(
+            {
+                get_page_generation_cache_key(page_id): uuid.uuid4().hex
+                for page_id in page_ids
+            },
+            timeout=None,
+        )
+
+    start_generations()
+    transaction.on_commit(start_generations)
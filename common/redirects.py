@@ -0,0 +1,205 @@
+"""Answer redirect lookups from a map of old paths held in each process.
+
+Wagtail's redirect middleware queries the redirects table for every 404,
+which includes bots probing the thousands of old Drupal paths. Instead,
+each process compiles the redirects into a map of normalized old paths,
+so paths without a redirect are answered without a query.
+
+Saving or deleting redirects, and changing page slugs, moving pages or
+changing sites, which changes the redirect links, starts a new generation
+of the map in the cache. Processes check the generation at most every few seconds and
+compile the map again when it changed.
+"""
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from urllib.parse import urlparse
+
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpRequest
+from django.utils.encoding import uri_to_iri
+from wagtail.contrib.redirects.models import Redirect
+from wagtail.models import Page, Site
+
+REDIRECT_MAP_GENERATION_CACHE_KEY = "redirect_map_generation"
+
+# Seconds between generation checks, which bounds how long other processes
+# answer with a stale map
+REDIRECT_MAP_GENERATION_CHECK_INTERVAL = 5
+
+
+@dataclass(frozen=True)
+class CompiledRedirect:
+    """A redirect with its link, if the link could be compiled."""
+
+    redirect_id: int
+    is_permanent: bool
+    link: str | None
+
+    def get_link(self) -> str | None:
+        if self.link is not None:
+            return self.link
+
+        # Links to routes of pages are checked by the page model
+        redirect = Redirect.objects.filter(id=self.redirect_id).first()
+
+        return redirect.link if redirect is not None else None
+
+
+def get_redirect_map_generation() -> str:
+    """Get the current generation of the map, starting one if there is none."""
+    cache.add(REDIRECT_MAP_GENERATION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+
+    return cache.get(REDIRECT_MAP_GENERATION_CACHE_KEY)
+
+
+def compile_redirects() -> dict[str, dict[int | None, CompiledRedirect]]:
+    """Get the redirects by normalized old path and site ID.
+
+    Redirects to pages are linked to the page URLs with one query for all
+    pages, and one load of the site root paths, rather than one per
+    redirect.
+    """
+    redirects = list(
+        Redirect.objects.values_list(
+            "id",
+            "old_path",
+            "site_id",
+            "is_permanent",
+            "redirect_page_id",
+            "redirect_page_route_path",
+            "redirect_link",
+        ),
+    )
+
+    pages = Page.objects.only("id", "url_path", "locale_id").in_bulk(
+        {redirect[4] for redirect in redirects if redirect[4] is not None},
+    )
+
+    # Without a request, each page loads the site root paths for its URL, so
+    # give all pages the ones loaded once
+    site_root_paths = Site.get_site_root_paths()
+
+    for page in pages.values():
+        page._wagtail_cached_site_root_paths = site_root_paths
+
+    compiled_redirects: dict[str, dict[int | None, CompiledRedirect]] = {}
+
+    for (
+        redirect_id,
+        old_path,
+        site_id,
+        is_permanent,
+        redirect_page_id,
+        redirect_page_route_path,
+        redirect_link,
+    ) in redirects:
+        if redirect_page_id is not None:
+            page = pages.get(redirect_page_id)
+            link = None if page is None or redirect_page_route_path else page.get_url()
+        else:
+            link = redirect_link or None
+
+        compiled_redirects.setdefault(Redirect.normalise_path(old_path), {})[
+            site_id
+        ] = CompiledRedirect(
+            redirect_id=redirect_id,
+            is_permanent=is_permanent,
+            link=link,
+        )
+
+    return compiled_redirects
+
+
+class RedirectMap:
+    """Redirects compiled in this process, until their generation changes."""
+
+    def __init__(
+        self,
+        check_interval: float = REDIRECT_MAP_GENERATION_CHECK_INTERVAL,
+    ) -> None:
+        self.check_interval = check_interval
+        self.redirects: dict[str, dict[int | None, CompiledRedirect]] | None = None
+        self.generation: str | None = None
+        self.last_checked_at = 0.0
+        self.lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self.lock:
+            self.redirects = None
+
+    def get_redirects(self) -> dict[str, dict[int | None, CompiledRedirect]]:
+        with self.lock:
+            now = time.monotonic()
+
+            if self.redirects is not None and (
+                now - self.last_checked_at < self.check_interval
+            ):
+                return self.redirects
+
+            generation = get_redirect_map_generation()
+            self.last_checked_at = now
+
+            if self.redirects is None or generation != self.generation:
+                self.redirects = compile_redirects()
+                self.generation = generation
+
+            return self.redirects
+
+    def find(self, request: HttpRequest, path: str) -> CompiledRedirect | None:
+        """Find the redirect of a path, preferring redirects of the request
+        site over redirects of all sites."""
+        if "\0" in path:
+            return None
+
+        redirects = self.get_redirects()
+        redirects_by_site = redirects.get(path) or redirects.get(uri_to_iri(path))
+
+        if not redirects_by_site:
+            return None
+
+        # Only paths with a redirect need the site, which may run a query
+        if set(redirects_by_site) != {None}:
+            site = Site.find_for_request(request)
+            site_id = site.pk if site is not None else None
+
+            if site_id in redirects_by_site:
+                return redirects_by_site[site_id]
+
+        return redirects_by_site.get(None)
+
+
+redirect_map = RedirectMap()
+
+
+def find_redirect(request: HttpRequest) -> CompiledRedirect | None:
+    """Find the redirect of a request path, with or without its querystring."""
+    path = Redirect.normalise_path(request.get_full_path())
+
+    redirect = redirect_map.find(request, path)
+
+    if redirect is None:
+        path_without_query = urlparse(path).path
+
+        if path_without_query != path:
+            redirect = redirect_map.find(request, path_without_query)
+
+    return redirect
+
+
+def invalidate_redirect_map() -> None:
+    """Start a new generation of the redirect map.
+
+    The map of this process is cleared at once, and other processes compile
+    theirs again at their next check. The generation is started again after
+    the transaction commits, so processes don't compile uncommitted changes.
+    """
+
+    def start_generation() -> None:
+        cache.set(REDIRECT_MAP_GENERATION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        redirect_map.clear()
+
+    start_generation()
+    transaction.on_commit(start_generation)
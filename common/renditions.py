@@ -0,0 +1,394 @@
+"""Generate image renditions in the background, before visitors need them.
+
+Wagtail generates renditions when a template first asks for them, so the
+first visitor waits for the resize and the upload to storage. Instead,
+uploading an image or publishing a page requests the renditions it will
+need, and `process_image_renditions` workers generate them, including WebP
+variants in a ladder of widths for `srcset`.
+
+Templates only use renditions that exist, falling back to the original
+image and requesting the missing renditions.
+
+Page models can declare the renditions of their images with a
+`get_image_filter_specs` method, and StreamField blocks with a
+`get_image_filter_specs` method taking the raw block value.
+"""
+import logging
+from collections import defaultdict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+from wagtail.fields import StreamField
+from wagtail.images import get_image_model
+from wagtail.images.models import AbstractImage, Filter
+from wagtail.models import Page
+
+from .body_cache import invalidate_rendered_object
+from .models import ImageRenditionRequest
+
+logger = logging.getLogger(__name__)
+
+# Widths of the WebP renditions offered in `srcset`
+RENDITION_SRCSET_WIDTHS = [320, 480, 800, 1200]
+
+# Renditions of body images, e.g. in `FormattedImageChooserStructBlock`
+BODY_IMAGE_FILTER_SPEC = "width-800|jpegquality-80"
+BODY_IMAGE_SRCSET_MAX_WIDTH = 800
+
+# Uploaded images are mostly shown in bodies, and in the admin image listing
+ADMIN_THUMBNAIL_FILTER_SPEC = "max-165x165"
+
+RENDITION_BATCH_SIZE = 50
+RENDITION_REQUEST_BATCH_SIZE = 1000
+RENDITION_WORKERS = 4
+
+# Failed renditions are requested again after a delay that doubles with
+# each attempt, until they have failed this many times
+RENDITION_MAX_ATTEMPTS = 5
+RENDITION_RETRY_DELAY = timedelta(minutes=5)
+
+ImageFilterSpecs = list[tuple[int | None, list[str]]]
+
+
+def get_srcset_filter_specs(max_width: int | None) -> list[str]:
+    if max_width is None:
+        return []
+
+    return [
+        f"width-{width}|format-webp"
+        for width in RENDITION_SRCSET_WIDTHS
+        if width <= max_width
+    ]
+
+
+def get_responsive_filter_specs(filter_spec: str, max_width: int | None) -> list[str]:
+    return [filter_spec, *get_srcset_filter_specs(max_width)]
+
+
+def get_uploaded_image_filter_specs() -> list[str]:
+    return [
+        ADMIN_THUMBNAIL_FILTER_SPEC,
+        *get_responsive_filter_specs(
+            BODY_IMAGE_FILTER_SPEC,
+            BODY_IMAGE_SRCSET_MAX_WIDTH,
+        ),
+    ]
+
+
+def request_image_renditions(image_filter_specs: ImageFilterSpecs) -> None:
+    """Request renditions of images, ignoring those already requested."""
+    ImageRenditionRequest.objects.bulk_create(
+        [
+            ImageRenditionRequest(image_id=image_id, filter_spec=filter_spec)
+            for image_id, filter_specs in image_filter_specs
+            if image_id is not None
+            for filter_spec in filter_specs
+        ],
+        batch_size=RENDITION_REQUEST_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def get_stream_field_image_filter_specs(
+    stream_field: StreamField,
+    raw_data: list,
+) -> ImageFilterSpecs:
+    """Get the renditions of the images in a StreamField, from its raw data,
+    without loading the images."""
+    child_blocks = stream_field.stream_block.child_blocks
+    image_filter_specs: ImageFilterSpecs = []
+
+    for raw_block in raw_data or []:
+        block = child_blocks.get(raw_block.get("type"))
+
+        if hasattr(block, "get_image_filter_specs"):
+            image_filter_specs.extend(
+                block.get_image_filter_specs(raw_block.get("value") or {}),
+            )
+
+    return image_filter_specs
+
+
+def get_page_image_filter_specs(page: Page) -> ImageFilterSpecs:
+    """Get the renditions of the images of a page and its StreamFields."""
+    specific_page = page.specific_deferred
+    image_filter_specs: ImageFilterSpecs = []
+
+    if hasattr(specific_page, "get_image_filter_specs"):
+        image_filter_specs.extend(specific_page.get_image_filter_specs())
+
+    for field in specific_page._meta.get_fields():
+        if isinstance(field, StreamField):
+            image_filter_specs.extend(
+                get_stream_field_image_filter_specs(
+                    field,
+                    getattr(specific_page, field.name).raw_data,
+                ),
+            )
+
+    return image_filter_specs
+
+
+@dataclass
+class ClaimedImageRenditions:
+    """The filter specs requested for an image, and their failed attempts."""
+
+    filter_specs: list[str]
+    attempts: int = 0
+
+
+def claim_image_rendition_requests(
+    batch_size: int,
+) -> dict[int, ClaimedImageRenditions]:
+    """Take a batch of requests off the queue, by image.
+
+    Requests locked by other workers, and failed requests waiting for their
+    retry, are skipped. Claimed requests are deleted, and requested again
+    if their renditions fail, since the blocks showing the original image
+    instead are cached until the renditions are generated.
+    """
+    with transaction.atomic():
+        rendition_requests = list(
+            ImageRenditionRequest.objects.select_for_update(skip_locked=True)
+            .filter(Q(retry_at__isnull=True) | Q(retry_at__lte=timezone.now()))
+            .order_by("id")
+            .values_list("id", "image_id", "filter_spec", "attempts")[:batch_size],
+        )
+        ImageRenditionRequest.objects.filter(
+            id__in=[request_id for request_id, _, _, _ in rendition_requests],
+        ).delete()
+
+    claimed_by_image: dict[int, ClaimedImageRenditions] = defaultdict(
+        lambda: ClaimedImageRenditions(filter_specs=[]),
+    )
+
+    for _, image_id, filter_spec, attempts in rendition_requests:
+        claimed = claimed_by_image[image_id]
+        claimed.filter_specs.append(filter_spec)
+        claimed.attempts = max(claimed.attempts, attempts)
+
+    return claimed_by_image
+
+
+def retry_image_renditions(claimed_by_image: dict[int, ClaimedImageRenditions]) -> None:
+    """Request failed renditions again, after a delay, unless they failed too
+    often or their image was deleted."""
+    image_ids = set(
+        get_image_model()
+        .objects.filter(id__in=claimed_by_image)
+        .values_list("id", flat=True),
+    )
+    now = timezone.now()
+    retries = []
+
+    for image_id, claimed in claimed_by_image.items():
+        if image_id not in image_ids:
+            continue
+
+        attempts = claimed.attempts + 1
+
+        if attempts >= RENDITION_MAX_ATTEMPTS:
+            logger.error(
+                "Gave up generating renditions of image %s after %s attempts",
+                image_id,
+                attempts,
+            )
+            continue
+
+        retry_at = now + RENDITION_RETRY_DELAY * 2 ** (attempts - 1)
+        retries.extend(
+            ImageRenditionRequest(
+                image_id=image_id,
+                filter_spec=filter_spec,
+                attempts=attempts,
+                retry_at=retry_at,
+            )
+            for filter_spec in claimed.filter_specs
+        )
+
+    # Requests made since the claim are kept, since they are due sooner
+    ImageRenditionRequest.objects.bulk_create(
+        retries,
+        batch_size=RENDITION_REQUEST_BATCH_SIZE,
+        ignore_conflicts=True,
+    )
+
+
+def generate_image_renditions(image_id: int, filter_specs: list[str]) -> bool:
+    """Generate renditions of an image, and invalidate the rendered blocks
+    and pages that fell back to the original image."""
+    image = get_image_model().objects.filter(id=image_id).first()
+
+    if image is None:
+        return False
+
+    try:
+        image.get_renditions(*filter_specs)
+    except Exception:
+        logger.exception("Could not generate renditions of image %s", image_id)
+        return False
+
+    invalidate_rendered_object(image)
+
+    return True
+
+
+def generate_image_renditions_in_thread(image_id: int, filter_specs: list[str]) -> bool:
+    try:
+        return generate_image_renditions(image_id, filter_specs)
+    finally:
+        connection.close()
+
+
+@dataclass
+class ImageRenditionResult:
+    """Counts of the images whose renditions a worker generated."""
+
+    generated: int = 0
+    failed: int = 0
+
+
+def process_image_rendition_requests(
+    batch_size: int = RENDITION_BATCH_SIZE,
+    workers: int = RENDITION_WORKERS,
+) -> ImageRenditionResult:
+    """Generate the renditions of a batch of requests, in worker threads or
+    in this one for one worker."""
+    claimed_by_image = claim_image_rendition_requests(batch_size)
+    image_ids = list(claimed_by_image)
+    filter_specs = [claimed.filter_specs for claimed in claimed_by_image.values()]
+
+    if workers <= 1:
+        generated = list(map(generate_image_renditions, image_ids, filter_specs))
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            generated = list(
+                executor.map(
+                    generate_image_renditions_in_thread,
+                    image_ids,
+                    filter_specs,
+                ),
+            )
+
+    retry_image_renditions(
+        {
+            image_id: claimed_by_image[image_id]
+            for image_id, image_generated in zip(image_ids, generated)
+            if not image_generated
+        },
+    )
+
+    return ImageRenditionResult(
+        generated=generated.count(True),
+        failed=generated.count(False),
+    )
+
+
+def get_rendition_size(
+    filter_spec: str,
+    width: int,
+    height: int,
+) -> tuple[int, int]:
+    """Estimate the size of a rendition from its resize operations, which
+    never enlarge the image."""
+    for operation in filter_spec.split("|"):
+        name, _, value = operation.partition("-")
+
+        if name in ("width", "height") and value.isdigit():
+            size = int(value)
+            scale = min(1, size / (width if name == "width" else height))
+        elif name in ("max", "fill") and "x" in value:
+            max_width, _, max_height = value.partition("x")
+
+            if not (max_width.isdigit() and max_height.isdigit()):
+                continue
+
+            if name == "fill":
+                return min(width, int(max_width)), min(height, int(max_height))
+
+            scale = min(1, int(max_width) / width, int(max_height) / height)
+        else:
+            continue
+
+        width, height = max(round(width * scale), 1), max(round(height * scale), 1)
+
+    return width, height
+
+
+@dataclass
+class ResponsiveRendition:
+    """The URL and size of a rendition, or of the original image while the
+    rendition is generated, with the `srcset` of the WebP renditions."""
+
+    url: str
+    width: int
+    height: int
+    alt: str
+    srcset: str
+
+
+def get_responsive_rendition(
+    image: AbstractImage,
+    filter_spec: str,
+    srcset_max_width: int | None = None,
+) -> ResponsiveRendition:
+    """Get the existing renditions of an image, without generating any.
+
+    Missing renditions are requested from the workers.
+    """
+    srcset_filter_specs = get_srcset_filter_specs(srcset_max_width)
+    filters = [Filter(spec) for spec in [filter_spec, *srcset_filter_specs]]
+
+    renditions = {
+        rendition_filter.spec: rendition
+        for rendition_filter, rendition in image.find_existing_renditions(
+            *filters,
+        ).items()
+    }
+
+    missing_filter_specs = [
+        rendition_filter.spec
+        for rendition_filter in filters
+        if rendition_filter.spec not in renditions
+    ]
+
+    if missing_filter_specs:
+        request_image_renditions([(image.pk, missing_filter_specs)])
+
+    srcset = ", ".join(
+        f"{renditions[spec].url} {renditions[spec].width}w"
+        for spec in srcset_filter_specs
+        if spec in renditions
+    )
+
+    rendition = renditions.get(filter_spec)
+
+    if rendition is not None:
+        return ResponsiveRendition(
+            url=rendition.url,
+            width=rendition.width,
+            height=rendition.height,
+            alt=image.default_alt_text,
+            srcset=srcset,
+        )
+
+    width, height = get_rendition_size(filter_spec, image.width, image.height)
+
+    return ResponsiveRendition(
+        url=image.file.url,
+        width=width,
+        height=height,
+        alt=image.default_alt_text,
+        srcset=srcset,
+    )
+
+
+def request_uploaded_image_renditions(image_ids: Iterable[int]) -> None:
+    filter_specs = get_uploaded_image_filter_specs()
+
+    request_image_renditions([(image_id, filter_specs) for image_id in image_ids])
@@ -0,0 +1,140 @@
+"""Invalidate cached page responses when pages are published or removed,
+rendered bodies when pages or the images, documents and media they show
+change, and the redirect map when redirects or their links change.
+Request image renditions when images are uploaded or pages published."""
+from typing import Any
+
+from django.db.models import Model
+from django.db.models.signals import post_delete, post_save
+from wagtail.contrib.redirects.models import Redirect
+from wagtail.documents import get_document_model
+from wagtail.images import get_image_model
+from wagtail.models import Page, Site, get_page_models
+from wagtail.signals import (
+    page_published,
+    page_slug_changed,
+    page_unpublished,
+    post_page_move,
+)
+from wagtailmedia.models import get_media_model
+
+from .body_cache import invalidate_rendered_object
+from .page_cache import get_dependent_page_ids, invalidate_page_responses
+from .redirects import invalidate_redirect_map
+from .renditions import (
+    get_page_image_filter_specs,
+    request_image_renditions,
+    request_uploaded_image_renditions,
+)
+
+
+def invalidate_page_responses_of_page(
+    sender: type[Model],
+    instance: Model,
+    **kwargs: Any,
+) -> None:
+    if not isinstance(instance, Page):
+        return
+
+    invalidate_page_responses(get_dependent_page_ids(instance))
+
+
+def invalidate_page_responses_of_deleted_page(
+    sender: type[Model],
+    instance: Model,
+    **kwargs: Any,
+) -> None:
+    """Invalidate a deleted page and its ancestors.
+
+    The relations of a deleted page are gone, so pages that listed it are
+    left to expire.
+    """
+    if not isinstance(instance, Page):
+        return
+
+    invalidate_page_responses(
+        [instance.pk, *instance.get_ancestors().values_list("id", flat=True)],
+    )
+
+
+def connect_page_cache_signals() -> None:
+    # Page models are subclasses, so listen to every sender
+    page_published.connect(invalidate_page_responses_of_page)
+    page_unpublished.connect(invalidate_page_responses_of_page)
+    post_delete.connect(invalidate_page_responses_of_deleted_page)
+
+
+def invalidate_rendered_bodies_of_page(
+    sender: type[Page],
+    instance: Page,
+    raw: bool = False,
+    update_fields: frozenset[str] | None = None,
+    **kwargs: Any,
+) -> None:
+    """Invalidate the rendered bodies of a saved page.
+
+    Bodies are cached by revision, but pages saved without a revision, such
+    as imported pages, keep their revision ID. Saves of a few fields, such
+    as the revision ID when publishing, are left to the publishing signals.
+    """
+    if raw or update_fields is not None:
+        return
+
+    invalidate_page_responses([instance.pk])
+
+
+def invalidate_rendered_object_of_change(
+    sender: type[Model],
+    instance: Model,
+    **kwargs: Any,
+) -> None:
+    invalidate_rendered_object(instance)
+
+
+def connect_body_cache_signals() -> None:
+    # Signals are sent by the concrete model, so connect each page model
+    # rather than every model saved
+    for page_model in get_page_models():
+        post_save.connect(invalidate_rendered_bodies_of_page, sender=page_model)
+
+    for model in (get_image_model(), get_document_model(), get_media_model()):
+        post_save.connect(invalidate_rendered_object_of_change, sender=model)
+        post_delete.connect(invalidate_rendered_object_of_change, sender=model)
+
+
+def invalidate_redirect_map_of_change(sender: type[Model], **kwargs: Any) -> None:
+    invalidate_redirect_map()
+
+
+def connect_redirect_map_signals() -> None:
+    post_save.connect(invalidate_redirect_map_of_change, sender=Redirect)
+    post_delete.connect(invalidate_redirect_map_of_change, sender=Redirect)
+
+    # Redirect links are page URLs, which change with slugs, moves and sites
+    page_slug_changed.connect(invalidate_redirect_map_of_change)
+    post_page_move.connect(invalidate_redirect_map_of_change)
+    post_save.connect(invalidate_redirect_map_of_change, sender=Site)
+    post_delete.connect(invalidate_redirect_map_of_change, sender=Site)
+
+
+def request_renditions_of_uploaded_image(
+    sender: type[Model],
+    instance: Model,
+    created: bool,
+    **kwargs: Any,
+) -> None:
+    if created:
+        request_uploaded_image_renditions([instance.pk])
+
+
+def request_renditions_of_published_page(
+    sender: type[Model],
+    instance: Page,
+    **kwargs: Any,
+) -> None:
+    request_image_renditions(get_page_image_filter_specs(instance))
+
+
+def connect_rendition_signals() -> None:
+    post_save.connect(request_renditions_of_uploaded_image, sender=get_image_model())
+    page_published.connect(request_renditions_of_published_page)
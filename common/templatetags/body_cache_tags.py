@@ -0,0 +1,18 @@
+from django import template
+from django.template import Context
+from django.utils.safestring import SafeString
+from wagtail.models import Page
+
+from common.body_cache import get_rendered_stream_field
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def cached_stream_field(
+    context: Context,
+    page: Page,
+    field_name: str = "body",
+) -> SafeString:
+    """Render a StreamField of a page, like `include_block`, from the cache."""
+    return get_rendered_stream_field(page, field_name, context.flatten())
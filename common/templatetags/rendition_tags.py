@@ -0,0 +1,37 @@
+from typing import Any
+
+from django import template
+from wagtail.images.models import AbstractImage
+
+from common.renditions import ResponsiveRendition, get_responsive_rendition
+
+register = template.Library()
+
+
+@register.simple_tag
+def responsive_rendition(
+    image: AbstractImage | None,
+    filter_spec: str,
+    srcset_max_width: int | None = None,
+) -> ResponsiveRendition | None:
+    """Get an existing rendition of an image, like `{% image ... as ... %}`,
+    without generating it."""
+    if not image:
+        return None
+
+    return get_responsive_rendition(image, filter_spec, srcset_max_width)
+
+
+@register.inclusion_tag("common/responsive_image.html")
+def responsive_image(
+    image: AbstractImage | None,
+    filter_spec: str,
+    srcset_max_width: int | None = None,
+    **attributes: Any,
+) -> dict:
+    """Render an existing rendition of an image, like `{% image %}`, without
+    generating it."""
+    return {
+        "rendition": responsive_rendition(image, filter_spec, srcset_max_width),
+        "attributes": attributes,
+    }
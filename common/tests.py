@@ -1 +1,504 @@
-# Create your tests here.
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models.signals import post_save
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from wagtail.contrib.redirects.models import Redirect
+from wagtail.images.models import Image
+from wagtail.images.tests.utils import get_test_image_file
+from wagtail.models import Page, Site
+from wagtail.rich_text import RichText
+
+from accounts.models import User
+from contact.factories import PersonFactory
+from content_migration.management.shared import PermanentRedirectBatch
+from home.models import HomePage
+from library.models import LibraryIndexPage, LibraryItem, LibraryItemAuthor
+
+from .body_cache import get_rendered_stream_field
+from .models import ImageRenditionRequest
+from .page_cache import get_page_generation, is_cacheable_response
+from .redirects import compile_redirects, redirect_map
+from .renditions import (
+    RENDITION_MAX_ATTEMPTS,
+    get_rendition_size,
+    get_responsive_rendition,
+    get_uploaded_image_filter_specs,
+    process_image_rendition_requests,
+)
+
+
+class PageResponseCacheTestCase(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+        site_root = Page.objects.get(id=2)
+
+        self.home_page = HomePage(title="Home")
+        site_root.add_child(instance=self.home_page)
+
+        Site.objects.all().update(root_page=self.home_page)
+
+        self.library_index = LibraryIndexPage(title="Library")
+        self.home_page.add_child(instance=self.library_index)
+
+        self.library_item = self.add_library_item("First library item")
+
+    def add_library_item(self, title: str) -> LibraryItem:
+        library_item = self.library_index.add_child(
+            instance=LibraryItem(title=title),
+        )
+        library_item.save_revision().publish()
+
+        return library_item
+
+    def count_queries(self, url: str) -> int:
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+
+        return len(queries)
+
+    def test_anonymous_responses_are_cached(self) -> None:
+        first_response = self.client.get(self.library_index.url)
+
+        with self.assertNumQueries(0):
+            cached_response = self.client.get(self.library_index.url)
+
+        self.assertEqual(cached_response.content, first_response.content)
+
+    def test_querystring_keys_outside_whitelist_share_cached_response(self) -> None:
+        self.client.get(self.library_index.url)
+
+        self.assertEqual(
+            self.count_queries(f"{self.library_index.url}?utm_source=newsletter"),
+            0,
+        )
+        self.assertGreater(self.count_queries(f"{self.library_index.url}?page=2"), 0)
+
+    def test_publishing_page_invalidates_parent_index(self) -> None:
+        self.client.get(self.library_index.url)
+
+        self.add_library_item("Second library item")
+
+        self.assertContains(
+            self.client.get(self.library_index.url),
+            "Second library item",
+        )
+
+    def test_unpublishing_page_invalidates_it(self) -> None:
+        self.client.get(self.library_item.url)
+
+        self.library_item.unpublish()
+
+        self.assertEqual(self.client.get(self.library_item.url).status_code, 404)
+
+    def test_publishing_page_invalidates_listing_pages(self) -> None:
+        author = PersonFactory.create()
+
+        self.client.get(author.url)
+
+        LibraryItemAuthor.objects.create(
+            library_item=self.library_item,
+            author=author,
+        )
+        self.library_item.save_revision().publish()
+
+        self.assertContains(self.client.get(author.url), "First library item")
+
+    def test_logged_in_users_bypass_cache(self) -> None:
+        user = User.objects.create_user(
+            email="subscriber@example.com",
+            password="password",
+        )
+        self.client.force_login(user)
+
+        self.client.get(self.library_index.url)
+        self.assertGreater(self.count_queries(self.library_index.url), 0)
+
+        # Nor do logged in users fill the cache for anonymous visitors
+        self.client.logout()
+        self.client.cookies.clear()
+
+        self.assertGreater(self.count_queries(self.library_index.url), 0)
+
+    def test_responses_with_csrf_token_are_not_cacheable(self) -> None:
+        request = RequestFactory().get("/")
+        request.META["CSRF_COOKIE_USED"] = True
+
+        self.assertFalse(is_cacheable_response(request, HttpResponse()))
+
+
+class RedirectMapTestCase(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+        redirect_map.clear()
+
+        site_root = Page.objects.get(id=2)
+
+        self.home_page = HomePage(title="Home")
+        site_root.add_child(instance=self.home_page)
+
+        self.site = Site.objects.get(is_default_site=True)
+        self.site.root_page = self.home_page
+        self.site.save()
+
+        self.library_index = LibraryIndexPage(title="Library")
+        self.home_page.add_child(instance=self.library_index)
+
+        self.library_item = self.library_index.add_child(
+            instance=LibraryItem(title="Library item"),
+        )
+
+        Redirect.objects.create(
+            old_path="/node/1",
+            redirect_page=self.library_item,
+        )
+
+    def test_old_paths_are_redirected(self) -> None:
+        response = self.client.get("/node/1/?utm_source=newsletter")
+
+        self.assertRedirects(
+            response,
+            self.library_item.url,
+            status_code=301,
+            fetch_redirect_response=False,
+        )
+
+    def test_paths_without_redirect_do_not_query_redirects(self) -> None:
+        self.client.get("/node/1")
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/node/2/")
+
+        self.assertEqual(response.status_code, 404)
+        self.assertFalse(
+            [
+                query
+                for query in queries.captured_queries
+                if Redirect._meta.db_table in query["sql"]
+            ],
+        )
+
+    def test_saving_redirects_invalidates_map(self) -> None:
+        self.client.get("/node/1")
+
+        Redirect.objects.create(
+            old_path="/node/2",
+            redirect_link="https://example.com/",
+            is_permanent=False,
+        )
+
+        self.assertRedirects(
+            self.client.get("/node/2"),
+            "https://example.com/",
+            fetch_redirect_response=False,
+        )
+
+    def test_site_redirects_are_preferred(self) -> None:
+        Redirect.objects.create(
+            old_path="/node/1",
+            site=self.site,
+            redirect_page=self.library_index,
+        )
+
+        self.assertRedirects(
+            self.client.get("/node/1"),
+            self.library_index.url,
+            status_code=301,
+            fetch_redirect_response=False,
+        )
+
+    def test_site_root_paths_are_loaded_once(self) -> None:
+        for number in range(3):
+            Redirect.objects.create(
+                old_path=f"/node/{number + 10}",
+                redirect_page=self.library_index.add_child(
+                    instance=LibraryItem(title=f"Library item {number}"),
+                ),
+            )
+
+        with patch.object(
+            Site,
+            "get_site_root_paths",
+            side_effect=Site.get_site_root_paths,
+        ) as get_site_root_paths:
+            redirects = compile_redirects()
+
+        get_site_root_paths.assert_called_once()
+        self.assertEqual(
+            redirects["/node/12"][None].link,
+            "/library/library-item-2/",
+        )
+
+    def test_redirects_are_created_in_batches(self) -> None:
+        self.client.get("/node/1")
+
+        with PermanentRedirectBatch(batch_size=2) as redirect_batch:
+            redirect_batch.add("/node/2", self.library_index)
+            redirect_batch.add("/node/1", self.library_index)
+            redirect_batch.add("/node/3", self.library_item)
+
+            # The first batch is created once it is full
+            self.assertEqual(Redirect.objects.count(), 2)
+
+        self.assertEqual(Redirect.objects.count(), 3)
+        self.assertRedirects(
+            self.client.get("/node/3"),
+            self.library_item.url,
+            status_code=301,
+            fetch_redirect_response=False,
+        )
+
+
+class RenderedBodyCacheTestCase(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+        site_root = Page.objects.get(id=2)
+
+        self.home_page = HomePage(title="Home")
+        site_root.add_child(instance=self.home_page)
+
+        self.library_index = LibraryIndexPage(title="Library")
+        self.home_page.add_child(instance=self.library_index)
+
+        self.image = Image.objects.create(
+            title="Image",
+            file=get_test_image_file(),
+        )
+
+        self.library_item = self.library_index.add_child(
+            instance=LibraryItem(
+                title="Library item",
+                body=[
+                    ("rich_text", RichText("<p>First version</p>")),
+                    ("image", {"image": self.image, "width": 400}),
+                ],
+            ),
+        )
+        self.library_item.save_revision().publish()
+
+    def render_body(self) -> str:
+        library_item = LibraryItem.objects.get(id=self.library_item.id)
+
+        return get_rendered_stream_field(library_item, "body", {})
+
+    def publish_body(self, text: str) -> None:
+        self.library_item.body = [
+            ("rich_text", RichText(f"<p>{text}</p>")),
+            ("image", {"image": self.image, "width": 400}),
+        ]
+        self.library_item.save_revision().publish()
+
+    def test_body_is_cached_until_new_revision_is_published(self) -> None:
+        self.assertIn("First version", self.render_body())
+
+        # Changes without a revision or save, e.g. raw updates, are not seen
+        LibraryItem.objects.filter(id=self.library_item.id).update(body=[])
+
+        with self.assertNumQueries(1):
+            self.assertIn("First version", self.render_body())
+
+        self.publish_body("Second version")
+
+        self.assertIn("Second version", self.render_body())
+
+    def test_saving_page_without_revision_invalidates_it(self) -> None:
+        page_generation = get_page_generation(self.library_item.id)
+
+        self.library_item.title = "Renamed library item"
+        self.library_item.save()
+
+        self.assertNotEqual(
+            get_page_generation(self.library_item.id),
+            page_generation,
+        )
+
+    def test_loading_page_fixtures_does_not_invalidate_it(self) -> None:
+        page_generation = get_page_generation(self.library_item.id)
+
+        # Fixtures are loaded as raw saves
+        post_save.send(
+            sender=LibraryItem,
+            instance=self.library_item,
+            created=False,
+            raw=True,
+        )
+
+        self.assertEqual(get_page_generation(self.library_item.id), page_generation)
+
+    def test_unchanged_blocks_are_reused_across_revisions(self) -> None:
+        self.render_body()
+
+        self.publish_body("Second version")
+
+        with patch.object(
+            Image,
+            "find_existing_renditions",
+            autospec=True,
+            side_effect=Image.find_existing_renditions,
+        ) as find_existing_renditions:
+            body = self.render_body()
+
+        self.assertIn("Second version", body)
+        self.assertIn("<img", body)
+        find_existing_renditions.assert_not_called()
+
+    def test_saving_image_invalidates_pages_that_show_it(self) -> None:
+        page_generation = get_page_generation(self.library_item.id)
+
+        self.render_body()
+
+        self.image.title = "Renamed image"
+        self.image.save()
+
+        self.assertNotEqual(
+            get_page_generation(self.library_item.id),
+            page_generation,
+        )
+
+        with patch.object(
+            Image,
+            "find_existing_renditions",
+            autospec=True,
+            side_effect=Image.find_existing_renditions,
+        ) as find_existing_renditions:
+            self.render_body()
+
+        find_existing_renditions.assert_called_once()
+
+
+class ImageRenditionTestCase(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+        self.image = Image.objects.create(
+            title="Image",
+            file=get_test_image_file(),
+        )
+
+    def test_uploading_image_requests_renditions(self) -> None:
+        self.assertEqual(
+            set(
+                ImageRenditionRequest.objects.filter(image=self.image).values_list(
+                    "filter_spec",
+                    flat=True,
+                ),
+            ),
+            set(get_uploaded_image_filter_specs()),
+        )
+
+    def test_publishing_page_requests_renditions_of_body_images(self) -> None:
+        ImageRenditionRequest.objects.all().delete()
+
+        site_root = Page.objects.get(id=2)
+        library_index = site_root.add_child(instance=LibraryIndexPage(title="Library"))
+        library_item = library_index.add_child(
+            instance=LibraryItem(
+                title="Library item",
+                body=[("image", {"image": self.image, "width": 400})],
+            ),
+        )
+        library_item.save_revision().publish()
+
+        self.assertTrue(
+            ImageRenditionRequest.objects.filter(
+                image=self.image,
+                filter_spec="width-320|format-webp",
+            ).exists(),
+        )
+
+    def test_missing_renditions_fall_back_to_original_image(self) -> None:
+        ImageRenditionRequest.objects.all().delete()
+
+        with patch.object(Image, "create_renditions") as create_renditions:
+            rendition = get_responsive_rendition(self.image, "max-320x200", 800)
+
+        create_renditions.assert_not_called()
+        self.assertEqual(rendition.url, self.image.file.url)
+        self.assertEqual((rendition.width, rendition.height), (267, 200))
+        self.assertEqual(rendition.srcset, "")
+        self.assertEqual(ImageRenditionRequest.objects.count(), 4)
+
+    def test_processing_requests_generates_renditions(self) -> None:
+        get_responsive_rendition(self.image, "max-320x200", 800)
+
+        result = process_image_rendition_requests(workers=1)
+
+        self.assertEqual(result.generated, 1)
+        self.assertFalse(ImageRenditionRequest.objects.exists())
+
+        rendition = get_responsive_rendition(self.image, "max-320x200", 800)
+
+        self.assertNotEqual(rendition.url, self.image.file.url)
+        self.assertIn(" 320w", rendition.srcset)
+        self.assertIn(" 480w", rendition.srcset)
+        self.assertFalse(ImageRenditionRequest.objects.exists())
+
+    def test_failed_renditions_are_requested_again(self) -> None:
+        ImageRenditionRequest.objects.all().delete()
+        get_responsive_rendition(self.image, "max-320x200")
+
+        for attempt in range(1, RENDITION_MAX_ATTEMPTS):
+            with patch.object(Image, "get_renditions", side_effect=OSError):
+                result = process_image_rendition_requests(workers=1)
+
+            self.assertEqual(result.failed, 1)
+
+            rendition_request = ImageRenditionRequest.objects.get()
+            self.assertEqual(rendition_request.attempts, attempt)
+            self.assertGreater(rendition_request.retry_at, timezone.now())
+
+            # The request waits for its retry
+            self.assertEqual(process_image_rendition_requests(workers=1).failed, 0)
+
+            ImageRenditionRequest.objects.update(retry_at=timezone.now())
+
+        with patch.object(Image, "get_renditions", side_effect=OSError):
+            process_image_rendition_requests(workers=1)
+
+        self.assertFalse(ImageRenditionRequest.objects.exists())
+
+    def test_rendition_size_is_estimated_without_enlarging(self) -> None:
+        self.assertEqual(get_rendition_size("max-286x300", 640, 480), (286, 214))
+        self.assertEqual(
+            get_rendition_size("width-800|jpegquality-80", 640, 480), (640, 480)
+        )
+        self.assertEqual(get_rendition_size("height-333", 640, 480), (444, 333))
+        self.assertEqual(get_rendition_size("fill-200x200", 640, 480), (200, 200))
+
+
+@override_settings(
+    SCHEDULED_COMMANDS=[
+        ("update_magazine_access_tiers", 60 * 60),
+        ("process_image_renditions", 60),
+    ],
+)
+class RunScheduledCommandsTestCase(TestCase):
+    def test_commands_run_once(self) -> None:
+        with patch(
+            "common.management.commands.run_scheduled_commands.call_command",
+        ) as scheduled_call_command:
+            call_command("run_scheduled_commands", "--once", stdout=StringIO())
+
+        self.assertEqual(
+            [command_call.args for command_call in scheduled_call_command.mock_calls],
+            [("update_magazine_access_tiers",), ("process_image_renditions",)],
+        )
+
+    def test_failing_commands_do_not_stop_others(self) -> None:
+        with patch(
+            "common.management.commands.run_scheduled_commands.call_command",
+            side_effect=[Exception("Failed"), None],
+        ) as scheduled_call_command:
+            call_command("run_scheduled_commands", "--once", stdout=StringIO())
+
+        self.assertEqual(scheduled_call_command.call_count, 2)
@@ -0,0 +1,20 @@
+from django.http import HttpRequest
+from wagtail import hooks
+from wagtail.models import Page
+
+from .page_cache import get_page_generation, is_cacheable_request
+
+
+@hooks.register("before_serve_page")
+def mark_page_response_cacheable(
+    page: Page,
+    request: HttpRequest,
+    serve_args: tuple,
+    serve_kwargs: dict,
+) -> None:
+    """Record the served page, so the middleware can cache its response."""
+    if is_cacheable_request(request):
+        request.page_response_cache_page = (  # type: ignore
+            page.pk,
+            get_page_generation(page.pk),
+        )
@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class ContactConfig(AppConfig):
     name = "contact"
+
+    def ready(self) -> None:
+        from .signals import connect_bibliography_signals
+
+        connect_bibliography_signals()
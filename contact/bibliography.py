@@ -0,0 +1,141 @@
+"""Load everything a contact authored for the contact page."""
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpRequest
+from wagtail.models import Page
+
+# Authorship changes invalidate the cached bibliography,
+# so the timeout only bounds staleness from e.g. unpublished works
+BIBLIOGRAPHY_CACHE_TIMEOUT = 60 * 60
+
+
+def get_bibliography_cache_key(author_id: int) -> str:
+    return f"contact_bibliography:{author_id}"
+
+
+def invalidate_bibliography(author_id: int | None) -> None:
+    """Remove the cached bibliography of a contact.
+
+    The bibliography is removed again after the transaction commits, so a
+    request that read the old rows before the commit can't leave it cached.
+    """
+    if author_id is None:
+        return
+
+    cache_key = get_bibliography_cache_key(author_id)
+
+    cache.delete(cache_key)
+    transaction.on_commit(lambda: cache.delete(cache_key))
+
+
+class AuthorBibliographyMixin:
+    """Add the works a contact authored to the contact page context.
+
+    Works are loaded through the authorship relations to the contact page,
+    with their authors and issues prefetched, so the number of queries
+    doesn't grow with the number of works. StreamField bodies are deferred,
+    since the page doesn't show them and they can't be cached.
+    """
+
+    def get_bibliography(self) -> dict:
+        article_authors = (
+            self.articles_authored.filter(  # type: ignore
+                article__live=True,
+            )
+            .select_related("article")
+            .order_by("article__title")
+            .defer("article__body", "article__body_migrated")
+            .prefetch_related("article__authors__author")
+        )
+
+        articles = [article_author.article for article_author in article_authors]
+
+        # Load the parent issues by path, rather than one get_parent per article
+        issues_by_path = {
+            issue.path: issue
+            for issue in Page.objects.filter(
+                path__in={article.path[: -article.steplen] for article in articles},
+            ).specific()
+        }
+
+        for article in articles:
+            article.issue = issues_by_path[article.path[: -article.steplen]]
+
+        archive_article_authors = (
+            self.archive_articles_authored.filter(  # type: ignore
+                article__issue__live=True,
+            )
+            .select_related("article__issue")
+            .order_by("article__title")
+        )
+
+        archive_articles = [
+            archive_article_author.article
+            for archive_article_author in archive_article_authors
+        ]
+
+        book_authors = (
+            self.books_authored.filter(  # type: ignore
+                book__live=True,
+            )
+            .select_related("book__image")
+            .order_by("book__title")
+            .prefetch_related("book__authors__author", "book__image__renditions")
+        )
+
+        books = [book_author.book for book_author in book_authors]
+
+        library_item_authors = (
+            self.library_items_authored.filter(  # type: ignore
+                library_item__live=True,
+            )
+            .select_related("library_item")
+            .order_by("library_item__title")
+            .defer("library_item__body")
+            .prefetch_related("library_item__authors__author")
+        )
+
+        library_items = [
+            library_item_author.library_item
+            for library_item_author in library_item_authors
+        ]
+
+        # Only meetings have memorial minutes
+        if hasattr(self, "memorial_minutes"):
+            memorial_minutes = list(
+                self.memorial_minutes.live().select_related("memorial_person"),
+            )
+        else:
+            memorial_minutes = []
+
+        return {
+            "articles": articles,
+            "archive_articles": archive_articles,
+            "books": books,
+            "library_items": library_items,
+            "memorial_minutes": memorial_minutes,
+        }
+
+    def get_cached_bibliography(self) -> dict:
+        cache_key = get_bibliography_cache_key(self.pk)  # type: ignore
+
+        bibliography = cache.get(cache_key)
+
+        if bibliography is None:
+            bibliography = self.get_bibliography()
+
+            cache.set(cache_key, bibliography, BIBLIOGRAPHY_CACHE_TIMEOUT)
+
+        return bibliography
+
+    def get_context(
+        self,
+        request: HttpRequest,
+        *args: tuple,
+        **kwargs: dict,
+    ) -> dict:
+        context = super().get_context(request, *args, **kwargs)  # type: ignore
+
+        context["bibliography"] = self.get_cached_bibliography()
+
+        return context
@@ -15,8 +15,10 @@ from wagtail.search import index
 
 from addresses.models import Address
 
+from .bibliography import AuthorBibliographyMixin
 
-class Person(Page):
+
+class Person(AuthorBibliographyMixin, Page):
     given_name = models.CharField(
         max_length=255,
         default="",
@@ -138,7 +140,7 @@ class MeetingPresidingClerk(Orderable):
     ]
 
 
-class Meeting(Page):
+class Meeting(AuthorBibliographyMixin, Page):
     class MeetingTypeChoices(TextChoices):
         MONTHLY_MEETING = "monthly_meeting", "Monthly Meeting"
         QUARTERLY_MEETING = "quarterly_meeting", "Quarterly Meeting"
@@ -310,7 +312,7 @@ class MeetingIndexPage(Page):
     template = "contact/meeting_index_page.html"
 
 
-class Organization(Page):
+class Organization(AuthorBibliographyMixin, Page):
     description = models.CharField(
         max_length=255,
         blank=True,
@@ -0,0 +1,57 @@
+"""Invalidate cached bibliographies when authorship rows change."""
+from typing import Any
+
+from django.db import models
+from django.db.models.signals import post_delete, post_save, pre_save
+
+from library.models import LibraryItemAuthor
+from magazine.models import ArchiveArticleAuthor, MagazineArticleAuthor
+from memorials.models import Memorial
+from store.models import BookAuthor
+
+from .bibliography import invalidate_bibliography
+
+# Models that link works to contacts, with the field of the contact
+BIBLIOGRAPHY_RELATIONS: dict[type[models.Model], str] = {
+    MagazineArticleAuthor: "author_id",
+    ArchiveArticleAuthor: "author_id",
+    BookAuthor: "author_id",
+    LibraryItemAuthor: "author_id",
+    Memorial: "memorial_meeting_id",
+}
+
+
+def invalidate_previous_contact_bibliography(
+    sender: type[models.Model],
+    instance: models.Model,
+    **kwargs: Any,
+) -> None:
+    """Invalidate the bibliography of the contact a row is being moved from."""
+    if instance.pk is None:
+        return
+
+    contact_field = BIBLIOGRAPHY_RELATIONS[sender]
+
+    previous_contact_id = (
+        sender._default_manager.filter(pk=instance.pk)
+        .values_list(contact_field, flat=True)
+        .first()
+    )
+
+    if previous_contact_id != getattr(instance, contact_field):
+        invalidate_bibliography(previous_contact_id)
+
+
+def invalidate_contact_bibliography(
+    sender: type[models.Model],
+    instance: models.Model,
+    **kwargs: Any,
+) -> None:
+    invalidate_bibliography(getattr(instance, BIBLIOGRAPHY_RELATIONS[sender]))
+
+
+def connect_bibliography_signals() -> None:
+    for model in BIBLIOGRAPHY_RELATIONS:
+        pre_save.connect(invalidate_previous_contact_bibliography, sender=model)
+        post_save.connect(invalidate_contact_bibliography, sender=model)
+        post_delete.connect(invalidate_contact_bibliography, sender=model)
@@ -1,5 +1,29 @@
+import datetime
+
+from django.core.cache import cache
+from django.db import connection
 from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
+from wagtail.models import Page, Site
+
 from community.models import CommunityPage
+from home.models import HomePage
+from library.factories import LibraryItemFactory
+from library.models import LibraryItemAuthor
+from magazine.models import (
+    ArchiveArticle,
+    ArchiveArticleAuthor,
+    ArchiveIssue,
+    DeepArchiveIndexPage,
+    MagazineArticle,
+    MagazineArticleAuthor,
+    MagazineDepartment,
+    MagazineDepartmentIndexPage,
+    MagazineIndexPage,
+    MagazineIssue,
+)
+from store.factories import ProductIndexPageFactory
+from store.models import Book, BookAuthor
 
 from contact.factories import (
     MeetingFactory,
@@ -170,3 +194,172 @@ class TestMeetingGetContext(TestCase):
             list(context["worship_groups"]),
             [self.child_worship_group],
         )
+
+
+class AuthorBibliographyTestCase(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+        site_root = Page.objects.get(id=2)
+
+        self.home_page = HomePage(title="Home")
+        site_root.add_child(instance=self.home_page)
+
+        Site.objects.all().update(root_page=self.home_page)
+
+        self.magazine_index = MagazineIndexPage(title="Magazine")
+        self.home_page.add_child(instance=self.magazine_index)
+
+        self.magazine_department_index = MagazineDepartmentIndexPage(
+            title="Departments",
+        )
+        self.magazine_index.add_child(instance=self.magazine_department_index)
+
+        self.magazine_department = MagazineDepartment(title="Department")
+        self.magazine_department_index.add_child(instance=self.magazine_department)
+
+        self.magazine_issue = MagazineIssue(
+            title="Issue",
+            publication_date=datetime.date(2023, 1, 1),
+        )
+        self.magazine_index.add_child(instance=self.magazine_issue)
+
+        self.deep_archive_index = DeepArchiveIndexPage(title="Deep Archive")
+        self.magazine_index.add_child(instance=self.deep_archive_index)
+
+        self.archive_issue = ArchiveIssue(
+            title="Archive Issue",
+            internet_archive_identifier="archive-issue",
+            publication_date=datetime.date(1950, 1, 1),
+        )
+        self.deep_archive_index.add_child(instance=self.archive_issue)
+
+        self.product_index = ProductIndexPageFactory.create()
+
+        self.person = PersonFactory.create()
+        self.co_author = PersonFactory.create()
+
+    def add_works(self, number_of_works: int) -> None:
+        """Add each kind of work, authored by the person and a co-author."""
+        for work_number in range(number_of_works):
+            article = self.magazine_issue.add_child(
+                instance=MagazineArticle(
+                    title=f"Article {work_number}",
+                    department=self.magazine_department,
+                ),
+            )
+            archive_article = ArchiveArticle.objects.create(
+                title=f"Archive article {work_number}",
+                issue=self.archive_issue,
+            )
+            book = self.product_index.add_child(
+                instance=Book(title=f"Book {work_number}", price=10),
+            )
+            library_item = LibraryItemFactory.create(
+                title=f"Library item {work_number}",
+            )
+
+            for author in [self.person, self.co_author]:
+                MagazineArticleAuthor.objects.create(article=article, author=author)
+                ArchiveArticleAuthor.objects.create(
+                    article=archive_article,
+                    author=author,
+                )
+                BookAuthor.objects.create(book=book, author=author)
+                LibraryItemAuthor.objects.create(
+                    library_item=library_item,
+                    author=author,
+                )
+
+    def test_get_bibliography(self) -> None:
+        self.add_works(1)
+
+        bibliography = self.person.get_bibliography()
+
+        self.assertEqual(
+            [article.title for article in bibliography["articles"]],
+            ["Article 0"],
+        )
+        self.assertEqual(bibliography["articles"][0].issue, self.magazine_issue)
+        self.assertEqual(
+            [article.title for article in bibliography["archive_articles"]],
+            ["Archive article 0"],
+        )
+        self.assertEqual(
+            [book.title for book in bibliography["books"]],
+            ["Book 0"],
+        )
+        self.assertEqual(
+            [item.title for item in bibliography["library_items"]],
+            ["Library item 0"],
+        )
+        self.assertEqual(bibliography["memorial_minutes"], [])
+
+    def test_get_bibliography_excludes_unpublished_works(self) -> None:
+        self.add_works(1)
+        MagazineArticle.objects.get(title="Article 0").unpublish()
+
+        self.assertEqual(self.person.get_bibliography()["articles"], [])
+
+    def test_contact_page_query_count_is_constant(self) -> None:
+        """Test that rendering a contact runs the same number of queries
+        however many works the contact authored."""
+        query_counts = []
+
+        # Warm up process-wide caches, e.g. content types
+        self.client.get(self.person.url)
+
+        for number_of_works in [1, 5]:
+            self.add_works(number_of_works)
+            cache.clear()
+
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.person.url)
+
+            self.assertEqual(response.status_code, 200)
+            self.assertContains(response, f"Library item {number_of_works - 1}")
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_get_cached_bibliography(self) -> None:
+        self.add_works(1)
+        self.person.get_cached_bibliography()
+
+        with self.assertNumQueries(0):
+            self.person.get_cached_bibliography()
+
+    def test_authorship_changes_invalidate_cached_bibliography(self) -> None:
+        self.add_works(1)
+        self.person.get_cached_bibliography()
+
+        book = self.product_index.add_child(
+            instance=Book(title="New book", price=10),
+        )
+        book_author = BookAuthor.objects.create(book=book, author=self.person)
+
+        self.assertEqual(
+            [book.title for book in self.person.get_cached_bibliography()["books"]],
+            ["Book 0", "New book"],
+        )
+
+        # Moving the authorship to another contact invalidates both contacts
+        self.co_author.get_cached_bibliography()
+        book_author.author = self.co_author
+        book_author.save()
+
+        self.assertEqual(
+            [book.title for book in self.person.get_cached_bibliography()["books"]],
+            ["Book 0"],
+        )
+        self.assertEqual(
+            [book.title for book in self.co_author.get_cached_bibliography()["books"]],
+            ["Book 0", "New book"],
+        )
+
+        book_author.delete()
+
+        self.assertEqual(
+            [book.title for book in self.co_author.get_cached_bibliography()["books"]],
+            ["Book 0"],
+        )
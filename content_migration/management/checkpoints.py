@@ -0,0 +1,148 @@
+"""Per-row checkpoints for resumable content imports."""
+import os
+from collections.abc import Iterable, Iterator
+from typing import TypeVar
+
+RowType = TypeVar("RowType")
+
+
+class RowCheckpoint:
+    """Record of the CSV rows an import stage has finished.
+
+    Completed row keys are appended to a plain text file, one key per
+    line, so that an interrupted import can skip rows it already
+    processed when it is run again.
+    """
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path = file_path
+        self.completed_keys: set[str] = set()
+        self.rows_completed = 0
+
+        if os.path.exists(file_path):
+            with open(file_path) as checkpoint_file:
+                self.completed_keys = {
+                    line.strip() for line in checkpoint_file if line.strip()
+                }
+
+    def is_completed(self, key: str) -> bool:
+        """Check whether the row with the given key was already imported."""
+        return key in self.completed_keys
+
+    def mark_completed(self, key: str) -> None:
+        """Persist the given row key as completed."""
+        directory = os.path.dirname(self.file_path)
+
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory, exist_ok=True)
+
+        with open(self.file_path, "a") as checkpoint_file:
+            checkpoint_file.write(f"{key}\n")
+
+        self.completed_keys.add(key)
+        self.rows_completed += 1
+
+    def clear(self) -> None:
+        """Remove all recorded progress."""
+        if os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+        self.completed_keys = set()
+        self.rows_completed = 0
+
+
+class PendingRowCheckpoint:
+    """Rows completed since they were last committed to a checkpoint.
+
+    Rows whose work is only saved later, e.g. in a bulk create, are held
+    until `commit` is called once the work is saved, so an interrupted
+    import doesn't skip them when it is run again.
+    """
+
+    def __init__(self, checkpoint: RowCheckpoint) -> None:
+        self.checkpoint = checkpoint
+        self.pending_keys: list[str] = []
+
+    def is_completed(self, key: str) -> bool:
+        return self.checkpoint.is_completed(key)
+
+    def mark_completed(self, key: str) -> None:
+        self.pending_keys.append(key)
+
+    def commit(self) -> None:
+        """Persist the pending rows as completed."""
+        for key in self.pending_keys:
+            self.checkpoint.mark_completed(key)
+
+        self.pending_keys = []
+
+
+def iterate_checkpointed_rows(
+    rows: Iterable[RowType],
+    checkpoint: RowCheckpoint | PendingRowCheckpoint | None,
+    namespace: str = "",
+) -> Iterator[RowType]:
+    """Yield the rows that have not been completed in a previous run.
+
+    Rows are keyed by their position in the source file, prefixed by the
+    namespace when a handler imports several files. A row is marked as
+    completed once the loop body has finished with it, i.e. when the
+    next row is requested, so a row that raises an exception is retried
+    on the next run.
+    """
+    if checkpoint is None:
+        yield from rows
+        return
+
+    for row_number, row in enumerate(rows):
+        key = f"{namespace}{row_number}"
+
+        if checkpoint.is_completed(key):
+            continue
+
+        yield row
+
+        checkpoint.mark_completed(key)
+
+
+def iterate_checkpointed_batches(
+    rows: Iterable[RowType],
+    checkpoint: RowCheckpoint | None,
+    batch_size: int,
+) -> Iterator[list[RowType]]:
+    """Yield batches of the rows that have not been completed in a previous
+    run.
+
+    Like `iterate_checkpointed_rows`, except the rows of a batch are
+    marked as completed together, once the next batch is requested.
+    """
+    batch: list[RowType] = []
+    batch_keys: list[str] = []
+
+    for row_number, row in enumerate(rows):
+        key = str(row_number)
+
+        if checkpoint is not None and checkpoint.is_completed(key):
+            continue
+
+        batch.append(row)
+        batch_keys.append(key)
+
+        if len(batch) < batch_size:
+            continue
+
+        yield batch
+
+        if checkpoint is not None:
+            for batch_key in batch_keys:
+                checkpoint.mark_completed(batch_key)
+
+        batch = []
+        batch_keys = []
+
+    if batch:
+        yield batch
+
+        if checkpoint is not None:
+            for batch_key in batch_keys:
+                checkpoint.mark_completed(batch_key)
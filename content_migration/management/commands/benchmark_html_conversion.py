@@ -0,0 +1,94 @@
+"""Django management command to benchmark HTML body conversion."""
+import importlib.util
+import time
+from collections.abc import Callable
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from content_migration.management.csv_reader import iterate_csv_rows
+from content_migration.management.import_magazine_articles_handler import (
+    parse_teaser_from_body,
+)
+from content_migration.management.shared import (
+    adapt_html_to_generic_blocks,
+    convert_html_body,
+    extract_image_urls,
+)
+
+HTML_BODIES_FIXTURE = "content_migration/management/test_html_bodies.csv"
+
+
+def convert_with_separate_parses(body: str) -> None:
+    """Convert a body the way the importers did before convert_html_body."""
+    adapt_html_to_generic_blocks(body)
+    parse_teaser_from_body(body)
+    extract_image_urls(body)
+
+
+class Command(BaseCommand):
+    """Django management command to benchmark HTML body conversion."""
+
+    help = "Compare the throughput of the HTML body converters"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--file",
+            default=HTML_BODIES_FIXTURE,
+            help="CSV file with the HTML bodies, e.g. an article export",
+        )
+        parser.add_argument(
+            "--column",
+            default="body",
+            help="Name of the CSV column with the HTML bodies",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=50,
+            help="Number of times to convert each body",
+        )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        bodies = [
+            row[options["column"]]
+            for row in iterate_csv_rows(
+                options["file"],  # type: ignore
+                columns=[options["column"]],  # type: ignore
+            )
+        ]
+        bodies *= options["repeat"]  # type: ignore
+
+        converters: dict[str, Callable[[str], object]] = {
+            "separate parses": convert_with_separate_parses,
+            "convert_html_body (html.parser)": convert_html_body,
+        }
+
+        if importlib.util.find_spec("lxml") is not None:
+            converters["convert_html_body (lxml)"] = lambda body: convert_html_body(
+                body,
+                parser="lxml",
+            )
+
+        for name, converter in converters.items():
+            seconds = self.time_conversion(converter, bodies)
+
+            self.stdout.write(
+                f"{name}: {len(bodies)} bodies in {seconds:.2f}s "
+                f"({len(bodies) / seconds:.1f} bodies/s)",
+            )
+
+    def time_conversion(
+        self,
+        converter: Callable[[str], object],
+        bodies: list[str],
+    ) -> float:
+        start_time = time.perf_counter()
+
+        for body in bodies:
+            try:
+                converter(body)
+            except ValueError:
+                # Bodies with images from other sites can't be converted
+                continue
+
+        return time.perf_counter() - start_time
@@ -1,5 +1,11 @@
 """Django management command to run all content importers."""
-from django.core.management import BaseCommand, call_command
+from django.core.management import BaseCommand, CommandParser
+
+from content_migration.management.errors import ImportPipelineError
+from content_migration.management.import_pipeline import (
+    StageResult,
+    run_import_pipeline,
+)
 
 
 class Command(BaseCommand):
@@ -7,21 +13,39 @@ class Command(BaseCommand):
 
     help = "Import all content from Drupal"
 
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="Number of processes used to run independent importers",
+        )
+        parser.add_argument(
+            "--restart",
+            action="store_true",
+            help="Discard checkpoints from a previous, interrupted run",
+        )
+
     def handle(self, *args: tuple, **options: dict) -> None:
         """Run all content importers."""
-        call_command("import_magazine")
-        call_command("import_library")
-        call_command("import_archive")
-        call_command("import_memorials")
-        call_command("import_events")
-        call_command("import_board_documents")
-        call_command("import_meeting_documents")
-        call_command("import_molly_wingate_blog")
-        call_command("import_news")
-        call_command("import_online_worship")
-        call_command("import_pages")
-        call_command("import_civicrm_contacts")
-        call_command("import_civicrm_relationships")
-        call_command("import_books")
         # TODO: add remaining importers
         # - CiviCRM clerk relationships (are we planning to use these going forward?)
+        try:
+            results = run_import_pipeline(
+                max_workers=options["workers"],  # type: ignore
+                restart=options["restart"],  # type: ignore
+            )
+        except ImportPipelineError as error:
+            self.write_report(error.results)
+            raise
+
+        self.write_report(results)
+
+    def write_report(self, results: list[StageResult]) -> None:
+        """Write the wall time and throughput of each finished stage."""
+        for result in results:
+            self.stdout.write(
+                f"{result.name}: {result.rows} rows "
+                f"in {result.seconds:.1f}s "
+                f"({result.rows_per_second:.1f} rows/s)",
+            )
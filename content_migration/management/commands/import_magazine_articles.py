@@ -1,4 +1,4 @@
-from django.core.management.base import BaseCommand
+from django.core.management.base import BaseCommand, CommandParser
 from content_migration.management.constants import (
     IMPORT_FILENAMES,
     LOCAL_MIGRATION_DATA_DIRECTORY,
@@ -6,15 +6,30 @@ from content_migration.management.constants import (
 
 from content_migration.management.import_magazine_articles_handler import (
     handle_import_magazine_articles,
+    handle_import_magazine_articles_in_batches,
 )
 
 
 class Command(BaseCommand):
     help = "Import Articles from Drupal site while linking them to related content"
 
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=None,
+            help="Import articles in batches of this size, using bulk queries",
+        )
+
     def handle(self, *args: tuple, **options: dict[str, str]) -> None:
         file_name = (
             LOCAL_MIGRATION_DATA_DIRECTORY + IMPORT_FILENAMES["magazine_articles"]
         )
 
-        handle_import_magazine_articles(file_name)  # type: ignore
+        if options["batch_size"]:
+            handle_import_magazine_articles_in_batches(
+                file_name,
+                batch_size=options["batch_size"],  # type: ignore
+            )
+        else:
+            handle_import_magazine_articles(file_name)  # type: ignore
@@ -2,6 +2,14 @@ DEFAULT_IMAGE_WIDTH = 350
 DEFAULT_IMAGE_ALIGN = None
 
 LOCAL_MIGRATION_DATA_DIRECTORY = "migration_data/"
+IMPORT_CHECKPOINT_DIRECTORY = f"{LOCAL_MIGRATION_DATA_DIRECTORY}checkpoints/"
+MEDIA_CACHE_DIRECTORY = f"{LOCAL_MIGRATION_DATA_DIRECTORY}media_cache/"
+MEDIA_FETCH_TIMEOUT = 30
+MEDIA_FETCH_WORKERS = 8
+CSV_BATCH_SIZE = 500
+REDIRECT_BATCH_SIZE = 500
+# Set to "lxml" to parse migrated HTML faster, when lxml is installed
+HTML_PARSER = "html.parser"
 SITE_BASE_URL = "https://westernfriend.org/"
 WESTERN_FRIEND_LOGO_URL = "https://westernfriend.org/sites/default/files/logo-2020-%20transparency-120px_0.png"
 WESTERN_FRIEND_LOGO_FILE_NAME = "logo-2020-%20transparency-120px_0.png"
@@ -0,0 +1,84 @@
+"""Stream migration CSV files without loading them into memory."""
+import csv
+from collections.abc import Callable, Iterable, Iterator
+from itertools import groupby, islice
+from typing import Any
+
+from content_migration.management.constants import CSV_BATCH_SIZE
+from content_migration.management.errors import UnsortedCsvError
+
+
+def iterate_csv_rows(
+    csv_file_path: str,
+    columns: Iterable[str] | None = None,
+    converters: dict[str, Callable[[str], Any]] | None = None,
+) -> Iterator[dict]:
+    """Yield the rows of a CSV file one at a time.
+
+    When `columns` are given, rows only contain those columns, so large
+    columns that a pass doesn't need are dropped as soon as they are read.
+    Values of columns in `converters` are passed through their converter,
+    e.g. `{"drupal_node_id": int}`.
+    """
+    with open(csv_file_path, newline="") as csv_file:
+        csv_reader = csv.DictReader(csv_file)
+
+        if columns is not None:
+            columns = list(columns)
+            missing_columns = set(columns) - set(csv_reader.fieldnames or [])
+
+            if missing_columns:
+                raise ValueError(
+                    f"Missing columns in {csv_file_path}: "
+                    f"{', '.join(sorted(missing_columns))}",
+                )
+
+        for row in csv_reader:
+            if columns is not None:
+                row = {column: row[column] for column in columns}
+
+            if converters is not None:
+                for column, converter in converters.items():
+                    if column in row:
+                        row[column] = converter(row[column])
+
+            yield row
+
+
+def iterate_csv_batches(
+    csv_file_path: str,
+    batch_size: int = CSV_BATCH_SIZE,
+    columns: Iterable[str] | None = None,
+    converters: dict[str, Callable[[str], Any]] | None = None,
+) -> Iterator[list[dict]]:
+    """Yield the rows of a CSV file in lists of up to `batch_size` rows."""
+    rows = iterate_csv_rows(
+        csv_file_path,
+        columns=columns,
+        converters=converters,
+    )
+
+    while batch := list(islice(rows, batch_size)):
+        yield batch
+
+
+def iterate_sorted_groups(
+    rows: Iterable[dict],
+    group_by_key: str,
+) -> Iterator[tuple[str, list[dict]]]:
+    """Group rows that are sorted by a key, yielding one group at a time.
+
+    Unlike `create_group_by`, only the current group is held in memory.
+    Raises an UnsortedCsvError if a key appears again after its group ended.
+    """
+    finished_keys: set[str] = set()
+
+    for key, group in groupby(rows, key=lambda row: row[group_by_key]):
+        if key in finished_keys:
+            raise UnsortedCsvError(
+                f"Rows are not sorted by {group_by_key}: {key} appears more than once",
+            )
+
+        finished_keys.add(key)
+
+        yield key, list(group)
@@ -12,3 +12,14 @@ class DuplicateContactError(Exception):
 
 class BlockFactoryError(Exception):
     pass
+
+
+class ImportPipelineError(Exception):
+    def __init__(self, message: str, results: list) -> None:
+        super().__init__(message)
+        # Results of the stages that did finish
+        self.results = results
+
+
+class UnsortedCsvError(Exception):
+    pass
@@ -3,15 +3,19 @@ import logging
 from django.core.exceptions import ObjectDoesNotExist
 from django.db import IntegrityError
 from tqdm import tqdm
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_rows,
+)
+from content_migration.management.csv_reader import iterate_csv_rows
 from content_migration.management.errors import (
     CouldNotFindMatchingContactError,
     DuplicateContactError,
 )
 
 from content_migration.management.shared import (
+    AuthorIndex,
     create_archive_issues_from_articles_dicts,
-    get_existing_magazine_author_from_db,
-    parse_csv_file,
 )
 from magazine.models import ArchiveArticle, ArchiveArticleAuthor, ArchiveIssue
 
@@ -26,6 +30,7 @@ logger = logging.getLogger(__name__)
 def create_archive_article_authors(
     archive_article: ArchiveArticle,
     authors: str,
+    author_index: AuthorIndex,
 ) -> None:
     """Create an ArchiveArticleAuthor instance for each author, if any."""
 
@@ -42,10 +47,7 @@ def create_archive_article_authors(
 
         for drupal_author_id in authors_list:
             try:
-                # TODO: determine if this is the cause of importer slowness
-                contact = get_existing_magazine_author_from_db(
-                    drupal_author_id,
-                )
+                contact = author_index.get(drupal_author_id)
             except (
                 CouldNotFindMatchingContactError,
                 DuplicateContactError,
@@ -69,16 +71,18 @@ def create_archive_article_authors(
                 continue
 
 
-def handle_import_archive_articles(file_name: str) -> None:
-    articles = parse_csv_file(file_name)
-
+def handle_import_archive_articles(
+    file_name: str,
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
     archive_issues = create_archive_issues_from_articles_dicts(
-        articles=articles,
+        articles=iterate_csv_rows(file_name),
     )
+    author_index = AuthorIndex()
 
     # for issue in tqdm(issues, desc="Archive issues", unit="row"):
     for archive_issue in tqdm(
-        archive_issues,
+        iterate_checkpointed_rows(archive_issues, checkpoint),
         desc="Archive articles",
         unit="row",
     ):
@@ -133,4 +137,5 @@ def handle_import_archive_articles(file_name: str) -> None:
                 create_archive_article_authors(
                     archive_article,
                     article_data["authors"],
+                    author_index,
                 )
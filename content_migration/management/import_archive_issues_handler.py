@@ -1,4 +1,8 @@
 from tqdm import tqdm
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_rows,
+)
 from content_migration.management.shared import (
     parse_csv_file,
     create_permanent_redirect,
@@ -39,14 +43,18 @@ def create_or_update_archive_issue(
     return archive_issue
 
 
-def handle_import_archive_issues(file_name: str) -> None:
+def handle_import_archive_issues(
+    file_name: str,
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
     # Get the only instance of Deep Archive Index Page
     deep_archive_index_page = DeepArchiveIndexPage.objects.get()
 
     issues = parse_csv_file(file_name)
 
     for issue in tqdm(
-        issues,
+        iterate_checkpointed_rows(issues, checkpoint),
+        total=len(issues),
         desc="Archive issues",
         unit="row",
     ):
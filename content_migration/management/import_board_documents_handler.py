@@ -2,12 +2,17 @@ from django.core.exceptions import ValidationError
 
 from tqdm import tqdm
 
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_rows,
+)
+from content_migration.management.csv_reader import iterate_csv_rows
 from content_migration.management.shared import (
     create_permanent_redirect,
     parse_body_blocks,
-    parse_csv_file,
     parse_media_blocks,
     parse_media_string_to_list,
+    prefetch_csv_media,
 )
 
 from documents.models import PublicBoardDocument, PublicBoardDocumentIndexPage
@@ -32,18 +37,20 @@ def get_board_document_category_key(category_label: str) -> str | None:
     return category_value
 
 
-def handle_import_board_documents(file_name: str) -> None:
+def handle_import_board_documents(
+    file_name: str,
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
     # Get references to relevant index pages
     public_board_documents_index = PublicBoardDocumentIndexPage.objects.get()
 
     # get a reference to the root site
     public_board_documents_index.get_site()
 
-    board_docs_data = parse_csv_file(file_name)
+    prefetch_csv_media(file_name)
 
     for document_data in tqdm(
-        board_docs_data,
-        total=len(board_docs_data),
+        iterate_checkpointed_rows(iterate_csv_rows(file_name), checkpoint),
         desc="Documents",
         unit="row",
     ):
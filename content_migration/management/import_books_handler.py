@@ -1,19 +1,30 @@
 import csv
 
 from tqdm import tqdm
-from content_migration.management.shared import get_or_create_book_author
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_rows,
+)
+from content_migration.management.shared import (
+    AuthorIndex,
+    get_or_create_book_author,
+)
 
 from content_migration.models import RawBook
 from store.models import Book, ProductIndexPage
 
 
-def handle_import_books(file_name: str) -> None:
+def handle_import_books(
+    file_name: str,
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
     product_index_page = ProductIndexPage.objects.get()
+    author_index = AuthorIndex()
 
     with open(file_name) as csv_file:
         reader = csv.DictReader(csv_file)
         for row in tqdm(
-            reader,
+            iterate_checkpointed_rows(reader, checkpoint),
             desc="Books",
             unit="book",
         ):
@@ -48,4 +59,5 @@ def handle_import_books(file_name: str) -> None:
                 _ = get_or_create_book_author(
                     book=book,
                     drupal_author_id=drupal_author_id,
+                    author_index=author_index,
                 )
@@ -12,6 +12,10 @@ from contact.models import (
     MeetingWorshipTime,
     Organization,
 )
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_rows,
+)
 from content_migration.management.shared import parse_csv_file
 
 logging.basicConfig(
@@ -140,11 +144,12 @@ def determine_meeting_type(
 
 def handle_import_civicrm_contacts(
     file_name: str,
+    checkpoint: RowCheckpoint | None = None,
 ) -> None:
     contacts = parse_csv_file(file_name)
 
     for contact in tqdm(
-        contacts,
+        iterate_checkpointed_rows(contacts, checkpoint),
         total=len(contacts),
         desc="Contacts",
         unit="row",
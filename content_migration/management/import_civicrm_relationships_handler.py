@@ -9,6 +9,10 @@ from django.core.exceptions import ObjectDoesNotExist
 from tqdm import tqdm
 
 from contact.models import Meeting
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_rows,
+)
 from content_migration.management.shared import parse_csv_file
 
 
@@ -32,11 +36,14 @@ def extract_contact_ids_from(relationship: dict) -> dict[str, int]:
     return {"parent_id": parent_id, "child_id": child_id}
 
 
-def handle_import_civicrm_relationships(file_name: str) -> None:
+def handle_import_civicrm_relationships(
+    file_name: str,
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
     relationships = parse_csv_file(file_name)
 
     for relationship in tqdm(
-        relationships,
+        iterate_checkpointed_rows(relationships, checkpoint),
         total=len(relationships),
         desc="Relationships",
         unit="row",
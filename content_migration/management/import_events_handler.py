@@ -2,6 +2,10 @@ from datetime import datetime
 
 from tqdm import tqdm
 from wagtail.rich_text import RichText
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_rows,
+)
 from content_migration.management.shared import (
     create_permanent_redirect,
     parse_csv_file,
@@ -13,13 +17,21 @@ from events.models import Event, EventsIndexPage
 date_format = "%Y-%m-%dT%H:%M%z"
 
 
-def handle_import_events(file_name: str) -> None:
+def handle_import_events(
+    file_name: str,
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
     # Get the only instance of Magazine Department Index Page
     events_index_page = EventsIndexPage.objects.get()
 
     events_list = parse_csv_file(file_name)
 
-    for event in tqdm(events_list, desc="events", unit="row"):
+    for event in tqdm(
+        iterate_checkpointed_rows(events_list, checkpoint),
+        total=len(events_list),
+        desc="events",
+        unit="row",
+    ):
         event_body_blocks = []
         # Create rich text block for event body blocks list
         rich_text_block = ("rich_text", RichText(event["body"]))
@@ -1,4 +1,8 @@
 from tqdm import tqdm
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_rows,
+)
 from content_migration.management.shared import parse_csv_file
 
 from facets.models import (
@@ -43,7 +47,10 @@ facets = [
 ]
 
 
-def handle_import_library_item_facets(folder: str) -> None:
+def handle_import_library_item_facets(
+    folder: str,
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
     for facet in tqdm(facets, desc="Library item facets", unit="taxonomy"):
         # Get the only index page instance for this facet
         facet_index_page = facet["index_page"].objects.get()  # type: ignore
@@ -52,7 +59,11 @@ def handle_import_library_item_facets(folder: str) -> None:
 
         facet_items = parse_csv_file(file_path)
 
-        for facet_item in facet_items:
+        for facet_item in iterate_checkpointed_rows(
+            facet_items,
+            checkpoint,
+            namespace=f"{facet['file_name']}:",
+        ):
             if (
                 not facet["facet_class"]  # type: ignore
                 .objects.filter(title=facet_item["drupal_full_name"])
@@ -1,5 +1,10 @@
 import logging
 from tqdm import tqdm  # type: ignore
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_rows,
+)
+from content_migration.management.csv_reader import iterate_csv_rows
 from content_migration.management.errors import (
     CouldNotFindMatchingContactError,
     DuplicateContactError,
@@ -15,15 +20,16 @@ from library.models import (
     LibraryIndexPage,
     LibraryItem,
     LibraryItemAuthor,
+    update_library_item_facets,
 )
 
 from content_migration.management.shared import (
-    create_permanent_redirect,
-    get_existing_magazine_author_from_db,
+    AuthorIndex,
+    PermanentRedirectBatch,
     parse_body_blocks,
-    parse_csv_file,
     parse_media_blocks,
     parse_media_string_to_list,
+    prefetch_csv_media,
 )
 
 logging.basicConfig(
@@ -37,6 +43,7 @@ logger = logging.getLogger(__name__)
 def add_library_item_authors(
     library_item: LibraryItem,
     drupal_author_ids: str,
+    author_index: AuthorIndex,
 ) -> None:
     drupal_author_ids_int = [
         int(author_id) for author_id in drupal_author_ids.split(", ")
@@ -44,9 +51,7 @@ def add_library_item_authors(
 
     for drupal_author_id in drupal_author_ids_int:
         try:
-            author = get_existing_magazine_author_from_db(
-                drupal_author_id,
-            )
+            author = author_index.get(drupal_author_id)
         except CouldNotFindMatchingContactError:
             logger.error(
                 f"Could not find magazine author by ID: { int(drupal_author_id) }",
@@ -81,112 +86,121 @@ def add_library_item_keywords(
         library_item.tags.add(keyword)
 
 
-def handle_import_library_items(file_name: str) -> None:
+def handle_import_library_items(
+    file_name: str,
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
     # Get the only instance of Magazine Department Index Page
     library_item_index_page = LibraryIndexPage.objects.get()
 
-    library_items = parse_csv_file(file_name)
-
-    for import_library_item in tqdm(
-        library_items,
-        desc="Library items",
-        unit="row",
-    ):
-        library_item_exists = LibraryItem.objects.filter(
-            drupal_node_id=import_library_item["drupal_node_id"],
-        ).exists()
-
-        if library_item_exists:
-            library_item = LibraryItem.objects.get(
+    prefetch_csv_media(file_name, html_fields=("description",))
+    author_index = AuthorIndex()
+
+    with PermanentRedirectBatch(checkpoint) as redirect_batch:
+        for import_library_item in tqdm(
+            iterate_checkpointed_rows(
+                iterate_csv_rows(file_name), redirect_batch.checkpoint
+            ),
+            desc="Library items",
+            unit="row",
+        ):
+            library_item_exists = LibraryItem.objects.filter(
                 drupal_node_id=import_library_item["drupal_node_id"],
-            )
-        else:
-            library_item = LibraryItem(
-                title=import_library_item["title"],
-                drupal_node_id=import_library_item["drupal_node_id"],
-            )
+            ).exists()
 
-            # Add library item to library branch of content tree
-            library_item_index_page.add_child(instance=library_item)
+            if library_item_exists:
+                library_item = LibraryItem.objects.get(
+                    drupal_node_id=import_library_item["drupal_node_id"],
+                )
+            else:
+                library_item = LibraryItem(
+                    title=import_library_item["title"],
+                    drupal_node_id=import_library_item["drupal_node_id"],
+                )
 
-            library_item_index_page.save()
+                # Add library item to library branch of content tree
+                library_item_index_page.add_child(instance=library_item)
 
-        library_item.title = import_library_item["title"]
-        library_item.body = parse_body_blocks(import_library_item["description"])
+                library_item_index_page.save()
 
-        library_item.body += parse_media_blocks(
-            parse_media_string_to_list(import_library_item["media"]),
-        )
+            library_item.title = import_library_item["title"]
+            library_item.body = parse_body_blocks(import_library_item["description"])
 
-        # # Facets
-        if import_library_item["audience"] != "":
-            try:
-                library_item.item_audience = Audience.objects.get(
-                    title=import_library_item["audience"],
-                )
-            except Audience.DoesNotExist:
-                logger.error(
-                    f"Could not find audience by title: { import_library_item['audience'] }",  # noqa: E501
-                )
+            library_item.body += parse_media_blocks(
+                parse_media_string_to_list(import_library_item["media"]),
+            )
 
-        if import_library_item["genre"] != "":
-            try:
-                library_item.item_genre = Genre.objects.get(
-                    title=import_library_item["genre"],
-                )
-            except Genre.DoesNotExist:
-                logger.error(
-                    f"Could not find genre by title: { import_library_item['genre'] }",
+            # # Facets
+            if import_library_item["audience"] != "":
+                try:
+                    library_item.item_audience = Audience.objects.get(
+                        title=import_library_item["audience"],
+                    )
+                except Audience.DoesNotExist:
+                    logger.error(
+                        f"Could not find audience by title: { import_library_item['audience'] }",  # noqa: E501
+                    )
+
+            if import_library_item["genre"] != "":
+                try:
+                    library_item.item_genre = Genre.objects.get(
+                        title=import_library_item["genre"],
+                    )
+                except Genre.DoesNotExist:
+                    logger.error(
+                        f"Could not find genre by title: { import_library_item['genre'] }",  # noqa: E501
+                    )
+
+            if import_library_item["medium"] != "":
+                try:
+                    library_item.item_medium = Medium.objects.get(
+                        title=import_library_item["medium"],
+                    )
+                except Medium.DoesNotExist:
+                    logger.error(
+                        f"Could not find medium by title: { import_library_item['medium'] }",  # noqa: E501
+                    )
+
+            if import_library_item["time_period"] != "":
+                try:
+                    library_item.item_time_period = TimePeriod.objects.get(
+                        title=import_library_item["time_period"],
+                    )
+                except TimePeriod.DoesNotExist:
+                    logger.error(
+                        f"Could not find time period by title: { import_library_item['time_period'] }",  # noqa: E501
+                    )
+
+            # Authors
+            if import_library_item["drupal_magazine_author_ids"] != "":
+                add_library_item_authors(
+                    library_item,
+                    import_library_item["drupal_magazine_author_ids"],
+                    author_index,
                 )
 
-        if import_library_item["medium"] != "":
-            try:
-                library_item.item_medium = Medium.objects.get(
-                    title=import_library_item["medium"],
-                )
-            except Medium.DoesNotExist:
-                logger.error(
-                    f"Could not find medium by title: { import_library_item['medium'] }",  # noqa: E501
+            # Keywords
+            if import_library_item["keywords"] != "":
+                add_library_item_keywords(
+                    library_item,
+                    import_library_item["keywords"],
                 )
 
-        if import_library_item["time_period"] != "":
-            try:
-                library_item.item_time_period = TimePeriod.objects.get(
-                    title=import_library_item["time_period"],
-                )
-            except TimePeriod.DoesNotExist:
-                logger.error(
-                    f"Could not find time period by title: { import_library_item['time_period'] }",  # noqa: E501
+            # Website
+            if import_library_item["website"] != "":
+                url_stream_block = (
+                    "url",
+                    import_library_item["website"],
                 )
 
-        # Authors
-        if import_library_item["drupal_magazine_author_ids"] != "":
-            add_library_item_authors(
-                library_item,
-                import_library_item["drupal_magazine_author_ids"],
-            )
-
-        # Keywords
-        if import_library_item["keywords"] != "":
-            add_library_item_keywords(
-                library_item,
-                import_library_item["keywords"],
-            )
-
-        # Website
-        if import_library_item["website"] != "":
-            url_stream_block = (
-                "url",
-                import_library_item["website"],
-            )
+                # TODO: Remember to remove this type ignore and make this line safer
+                library_item.body.append(url_stream_block)  # type: ignore
 
-            # TODO: Remember to remove this type ignore and make this line safer
-            library_item.body.append(url_stream_block)  # type: ignore
+            library_item.save()
 
-        library_item.save()
+            # Imported items aren't published through Wagtail,
+            # so add them to the faceted search directly
+            update_library_item_facets(library_item)
 
-        # create redirect to library item
-        create_permanent_redirect(
-            redirect_path=import_library_item["url_path"],
-            redirect_entity=library_item,
-        )
+            # create redirect to library item
+            redirect_batch.add(import_library_item["url_path"], library_item)
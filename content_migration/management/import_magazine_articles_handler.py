@@ -1,8 +1,20 @@
 import logging
+from collections import defaultdict
 
 from bs4 import BeautifulSoup
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import transaction
+from taggit.models import Tag  # type: ignore
 from tqdm import tqdm
+from wagtail.models import Page
+
+from common.page_cache import invalidate_page_responses
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_batches,
+    iterate_checkpointed_rows,
+)
+from content_migration.management.csv_reader import iterate_csv_rows
 from content_migration.management.errors import (
     CouldNotFindMatchingContactError,
     DuplicateContactError,
@@ -11,17 +23,22 @@ from content_migration.management.errors import (
 from magazine.models import (
     MagazineArticle,
     MagazineArticleAuthor,
+    MagazineArticleTag,
     MagazineDepartment,
     MagazineIssue,
 )
+from search.models import update_page_search_entries
 
 from content_migration.management.shared import (
+    AuthorIndex,
+    ConvertedHtml,
+    convert_html_body,
+    create_streamfield_blocks,
+    bulk_create_permanent_redirects,
     create_permanent_redirect,
-    get_existing_magazine_author_from_db,
-    parse_csv_file,
     parse_media_blocks,
-    parse_body_blocks,
     parse_media_string_to_list,
+    prefetch_csv_media,
 )
 
 logging.basicConfig(
@@ -32,17 +49,18 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+MAGAZINE_ARTICLES_BATCH_SIZE = 250
+
 
 def parse_article_authors(
     article: MagazineArticle,
     article_authors: str,
+    author_index: AuthorIndex,
 ) -> MagazineArticle:
     """Fetch all related article authors and create an article relationship."""
     for drupal_author_id in article_authors.split(", "):
         try:
-            author = get_existing_magazine_author_from_db(
-                drupal_author_id,
-            )
+            author = author_index.get(drupal_author_id)
         except (
             CouldNotFindMatchingContactError,
             DuplicateContactError,
@@ -86,13 +104,16 @@ def assign_article_to_issue(
     )
 
 
-def parse_article_body_blocks(row: dict, article: MagazineArticle) -> list[tuple]:
+def parse_article_body_blocks(
+    row: dict,
+    converted_body: ConvertedHtml,
+) -> list[tuple]:
     """Parse article body and media blocks."""
 
     article_body_blocks = []
 
     if row["body"] != "":
-        article_body_blocks = parse_body_blocks(row["body"])
+        article_body_blocks = create_streamfield_blocks(converted_body.blocks)
 
     # Download and parse article media
     if row["media"] != "":
@@ -127,11 +148,15 @@ def parse_teaser_from_body(body: str) -> str:
     return teaser.text
 
 
-def handle_import_magazine_articles(file_name: str) -> None:
-    articles_data = parse_csv_file(file_name)
+def handle_import_magazine_articles(
+    file_name: str,
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
+    prefetch_csv_media(file_name)
+    author_index = AuthorIndex()
 
     for row in tqdm(
-        articles_data,
+        iterate_checkpointed_rows(iterate_csv_rows(file_name), checkpoint),
         desc="Articles",
         unit="row",
     ):
@@ -156,10 +181,10 @@ def handle_import_magazine_articles(file_name: str) -> None:
         article.department = MagazineDepartment.objects.get(
             title=row["department"],
         )
-        article.teaser = parse_teaser_from_body(row["body"])
-
         # Parse article body
-        article.body = parse_article_body_blocks(row, article)
+        converted_body = convert_html_body(row["body"])
+        article.teaser = converted_body.teaser
+        article.body = parse_article_body_blocks(row, converted_body)
 
         article.body_migrated = row["body"]
 
@@ -175,6 +200,7 @@ def handle_import_magazine_articles(file_name: str) -> None:
             article = parse_article_authors(
                 article,
                 row["authors"],
+                author_index,
             )
 
         # Assign keywards to article
@@ -188,3 +214,259 @@ def handle_import_magazine_articles(file_name: str) -> None:
             redirect_path=row["url_path"],
             redirect_entity=article,
         )
+
+
+def get_or_create_tags(tag_names: set[str]) -> dict[str, Tag]:
+    """Get tags by name, creating any missing tags in bulk."""
+    tags = {tag.name: tag for tag in Tag.objects.filter(name__in=tag_names)}
+
+    missing_tag_names = tag_names - tags.keys()
+
+    if missing_tag_names:
+        Tag.objects.bulk_create(
+            [
+                Tag(name=tag_name, slug=Tag().slugify(tag_name))
+                for tag_name in missing_tag_names
+            ],
+            ignore_conflicts=True,
+        )
+
+        for tag in Tag.objects.filter(name__in=missing_tag_names):
+            tags[tag.name] = tag
+
+    # Tags whose slug collided with an existing tag
+    # need Tag.save() to pick a unique slug
+    for tag_name in tag_names - tags.keys():
+        tags[tag_name], _ = Tag.objects.get_or_create(name=tag_name)
+
+    return tags
+
+
+def resolve_article_authors(
+    author_ids: set[str],
+    author_index: AuthorIndex,
+) -> dict[str, Page]:
+    """Find the contact page for each Drupal author ID.
+
+    Authors that can't be found are logged and left out.
+    """
+    authors: dict[str, Page] = {}
+
+    for drupal_author_id in author_ids:
+        try:
+            authors[drupal_author_id] = author_index.get(drupal_author_id)
+        except (
+            CouldNotFindMatchingContactError,
+            DuplicateContactError,
+        ):
+            logger.error(
+                f"Could not find author from Drupal ID: { drupal_author_id }",
+            )
+
+    return authors
+
+
+def import_magazine_article_batch(
+    rows: list[dict],
+    departments: dict[str, MagazineDepartment],
+    issues: dict[str, MagazineIssue],
+    author_index: AuthorIndex,
+) -> None:
+    """Create or update the articles in a batch of CSV rows.
+
+    Besides the per-article inserts that the page tree requires for new
+    articles, the number of queries does not depend on the batch size.
+    """
+    existing_articles = {
+        str(article.drupal_node_id): article
+        for article in MagazineArticle.objects.filter(
+            drupal_node_id__in=[row["drupal_node_id"] for row in rows],
+        )
+    }
+
+    articles_to_update: list[MagazineArticle] = []
+    new_articles_by_issue: dict[str, list[MagazineArticle]] = defaultdict(list)
+    imported_articles: list[tuple[dict, MagazineArticle]] = []
+
+    for row in rows:
+        article = existing_articles.get(row["drupal_node_id"])
+
+        if article is None:
+            if row["related_issue_id"] not in issues:
+                error_message = (
+                    f"Could not find issue from Drupal ID: { row['related_issue_id'] }"
+                )
+                logger.error(error_message)
+                raise ObjectDoesNotExist(error_message)
+
+            article = MagazineArticle()
+            new_articles_by_issue[row["related_issue_id"]].append(article)
+        else:
+            articles_to_update.append(article)
+
+        if row["department"] not in departments:
+            raise MagazineDepartment.DoesNotExist(
+                f"Could not find department: { row['department'] }",
+            )
+
+        article.title = row["title"]
+        article.drupal_node_id = row["drupal_node_id"]
+        article.is_featured = row["is_featured"] == "True"
+        article.department = departments[row["department"]]
+        converted_body = convert_html_body(row["body"])
+        article.teaser = converted_body.teaser
+        article.body = parse_article_body_blocks(row, converted_body)
+        article.body_migrated = row["body"]
+
+        imported_articles.append((row, article))
+
+    # Group inserts by issue, so each issue is only loaded once
+    # and treebeard can append the articles as consecutive children
+    for issue_id, new_articles in new_articles_by_issue.items():
+        issue = issues[issue_id]
+
+        for article in new_articles:
+            issue.add_child(instance=article)
+
+    if articles_to_update:
+        MagazineArticle.objects.bulk_update(
+            articles_to_update,
+            fields=[
+                "title",
+                "is_featured",
+                "department",
+                "teaser",
+                "body",
+                "body_migrated",
+            ],
+        )
+
+    article_ids = [article.id for _, article in imported_articles]
+
+    # Authors
+    authors = resolve_article_authors(
+        {
+            drupal_author_id
+            for row, _ in imported_articles
+            if row["authors"] != ""
+            for drupal_author_id in row["authors"].split(", ")
+        },
+        author_index,
+    )
+    existing_article_authors = set(
+        MagazineArticleAuthor.objects.filter(
+            article_id__in=article_ids,
+        ).values_list("article_id", "author_id"),
+    )
+    new_article_authors: list[MagazineArticleAuthor] = []
+
+    for row, article in imported_articles:
+        if row["authors"] == "":
+            continue
+
+        for drupal_author_id in row["authors"].split(", "):
+            author = authors.get(drupal_author_id)
+
+            if author is None or (article.id, author.id) in existing_article_authors:
+                continue
+
+            existing_article_authors.add((article.id, author.id))
+            new_article_authors.append(
+                MagazineArticleAuthor(
+                    article=article,
+                    author=author,
+                ),
+            )
+
+    MagazineArticleAuthor.objects.bulk_create(new_article_authors)
+
+    # Keywords
+    tags = get_or_create_tags(
+        {
+            keyword
+            for row, _ in imported_articles
+            if row["keywords"] != ""
+            for keyword in row["keywords"].split(", ")
+        },
+    )
+    existing_article_tags = set(
+        MagazineArticleTag.objects.filter(
+            content_object_id__in=article_ids,
+        ).values_list("content_object_id", "tag_id"),
+    )
+    new_article_tags: list[MagazineArticleTag] = []
+
+    for row, article in imported_articles:
+        if row["keywords"] == "":
+            continue
+
+        for keyword in row["keywords"].split(", "):
+            tag = tags[keyword]
+
+            if (article.id, tag.id) in existing_article_tags:
+                continue
+
+            existing_article_tags.add((article.id, tag.id))
+            new_article_tags.append(
+                MagazineArticleTag(
+                    content_object=article,
+                    tag=tag,
+                ),
+            )
+
+    MagazineArticleTag.objects.bulk_create(new_article_tags)
+
+    bulk_create_permanent_redirects(
+        [(row["url_path"], article) for row, article in imported_articles],
+    )
+
+    # Bulk updates skip the save signals, and new articles were indexed on
+    # save, before their authors and tags were added
+    update_page_search_entries(
+        MagazineArticle.objects.filter(id__in=article_ids).prefetch_related(
+            "authors__author",
+            # Cluster tags are read through their tagged items
+            "tagged_items__tag",
+        ),
+    )
+    invalidate_page_responses(article.id for article in articles_to_update)
+
+
+def handle_import_magazine_articles_in_batches(
+    file_name: str,
+    batch_size: int = MAGAZINE_ARTICLES_BATCH_SIZE,
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
+    """Import magazine articles in batches.
+
+    Departments, issues and authors are loaded once up front and each batch
+    fetches its existing articles, authors, tags and redirects with a
+    fixed number of queries, instead of several queries per row.
+    """
+    prefetch_csv_media(file_name)
+    author_index = AuthorIndex()
+
+    departments = {
+        department.title: department for department in MagazineDepartment.objects.all()
+    }
+    issues = {
+        str(issue.drupal_node_id): issue
+        for issue in MagazineIssue.objects.filter(drupal_node_id__isnull=False)
+    }
+
+    for batch in tqdm(
+        iterate_checkpointed_batches(
+            iterate_csv_rows(file_name),
+            checkpoint,
+            batch_size,
+        ),
+        desc="Article batches",
+        unit="batch",
+    ):
+        with transaction.atomic():
+            import_magazine_article_batch(
+                rows=batch,
+                departments=departments,
+                issues=issues,
+                author_index=author_index,
+            )
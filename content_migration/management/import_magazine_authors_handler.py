@@ -10,6 +10,10 @@ from contact.models import (
     Person,
     PersonIndexPage,
 )
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_rows,
+)
 from content_migration.management.shared import (
     parse_csv_file,
 )
@@ -133,7 +137,10 @@ def create_person(
     return person
 
 
-def import_author_records(authors_list: list[dict]) -> None:
+def import_author_records(
+    authors_list: list[dict],
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
     meeting_index_page = MeetingIndexPage.objects.get()
     organization_index_page = OrganizationIndexPage.objects.get()
     person_index_page = PersonIndexPage.objects.get()
@@ -142,7 +149,8 @@ def import_author_records(authors_list: list[dict]) -> None:
         raise Exception("Could not find author index pages")
 
     for author in tqdm(
-        authors_list,
+        iterate_checkpointed_rows(authors_list, checkpoint),
+        total=len(authors_list),
         desc="Primary Author records",
         unit="row",
     ):
@@ -170,7 +178,10 @@ def import_author_records(authors_list: list[dict]) -> None:
                 )
 
 
-def handle_import_magazine_authors(file_name: str) -> None:
+def handle_import_magazine_authors(
+    file_name: str,
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
     authors_list = parse_csv_file(file_name)
 
-    import_author_records(authors_list)
+    import_author_records(authors_list, checkpoint)
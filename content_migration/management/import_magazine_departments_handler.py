@@ -1,16 +1,28 @@
 from tqdm import tqdm
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_rows,
+)
 from content_migration.management.shared import parse_csv_file
 
 from magazine.models import MagazineDepartment, MagazineDepartmentIndexPage
 
 
-def handle_import_magazine_departments(file_name: str) -> None:
+def handle_import_magazine_departments(
+    file_name: str,
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
     # Get the only instance of Magazine Department Index Page
     magazine_department_index_page = MagazineDepartmentIndexPage.objects.get()
 
     departments_list = parse_csv_file(file_name)
 
-    for department in tqdm(departments_list, desc="Departments", unit="row"):
+    for department in tqdm(
+        iterate_checkpointed_rows(departments_list, checkpoint),
+        total=len(departments_list),
+        desc="Departments",
+        unit="row",
+    ):
         department_exists = MagazineDepartment.objects.filter(
             title=department["title"],
         ).exists()
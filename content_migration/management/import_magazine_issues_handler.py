@@ -7,6 +7,10 @@ from django.core.files.images import ImageFile
 from django.utils.timezone import make_aware
 from tqdm import tqdm
 from wagtail.images.models import Image
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_rows,
+)
 from content_migration.management.shared import (
     create_permanent_redirect,
     parse_csv_file,
@@ -15,13 +19,21 @@ from content_migration.management.shared import (
 from magazine.models import MagazineIndexPage, MagazineIssue
 
 
-def handle_import_magazine_issues(file_name: str) -> None:
+def handle_import_magazine_issues(
+    file_name: str,
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
     # Get the only instance of Magazine Index Page
     magazine_index_page = MagazineIndexPage.objects.get()
 
     issues_list = parse_csv_file(file_name)
 
-    for issue in tqdm(issues_list, desc="Issues", unit="row"):
+    for issue in tqdm(
+        iterate_checkpointed_rows(issues_list, checkpoint),
+        total=len(issues_list),
+        desc="Issues",
+        unit="row",
+    ):
         issue_exists = MagazineIssue.objects.filter(
             title=issue["title"],
         ).exists()
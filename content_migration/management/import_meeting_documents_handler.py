@@ -1,12 +1,17 @@
 from tqdm import tqdm
 
 from contact.models import Meeting
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_rows,
+)
+from content_migration.management.csv_reader import iterate_csv_rows
 from content_migration.management.shared import (
     create_permanent_redirect,
     parse_body_blocks,
-    parse_csv_file,
     parse_media_blocks,
     parse_media_string_to_list,
+    prefetch_csv_media,
 )
 
 from documents.models import MeetingDocument, MeetingDocumentIndexPage
@@ -27,18 +32,20 @@ def get_meeting_document_type_key(category_label: str) -> str | None:
     return category_value
 
 
-def handle_import_meeting_documents(file_name: str) -> None:
+def handle_import_meeting_documents(
+    file_name: str,
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
     # Get references to relevant index pages
     meeting_documents_index = MeetingDocumentIndexPage.objects.get()
 
     # get a reference to the root site
     meeting_documents_index.get_site()
 
-    meeting_docs_data = parse_csv_file(file_name)
+    prefetch_csv_media(file_name)
 
     for document_data in tqdm(
-        meeting_docs_data,
-        total=len(meeting_docs_data),
+        iterate_checkpointed_rows(iterate_csv_rows(file_name), checkpoint),
         desc="Documents",
         unit="row",
     ):
@@ -1,9 +1,14 @@
 """Parse and import the Molly Wingate blog."""
 from tqdm import tqdm
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_rows,
+)
+from content_migration.management.csv_reader import iterate_csv_rows
 from content_migration.management.shared import (
     create_permanent_redirect,
     parse_body_blocks,
-    parse_csv_file,
+    prefetch_csv_media,
 )
 from content_migration.management.constants import (
     IMPORT_FILENAMES,
@@ -13,18 +18,19 @@ from content_migration.management.constants import (
 from wf_pages.models import MollyWingateBlogIndexPage, MollyWingateBlogPage
 
 
-def handle_import_molly_wingate_blog() -> None:
+def handle_import_molly_wingate_blog(
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
     """Parse and import the Molly Wingate blog."""
     # Get references to relevant index pages
     molly_wingate_blog_index_page = MollyWingateBlogIndexPage.objects.get()
 
     file_name = LOCAL_MIGRATION_DATA_DIRECTORY + IMPORT_FILENAMES["molly_wingate_blog"]
 
-    pages = parse_csv_file(file_name)
+    prefetch_csv_media(file_name, media_fields=())
 
     for page in tqdm(
-        pages,
-        total=len(pages),
+        iterate_checkpointed_rows(iterate_csv_rows(file_name), checkpoint),
         desc="Molly Wingate Blog",
         unit="row",
     ):
@@ -1,10 +1,15 @@
 from tqdm import tqdm
 
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_rows,
+)
+from content_migration.management.csv_reader import iterate_csv_rows
 from content_migration.management.shared import (
-    create_permanent_redirect,
-    parse_csv_file,
+    PermanentRedirectBatch,
     parse_media_blocks,
     parse_media_string_to_list,
+    prefetch_csv_media,
 )
 
 from content_migration.management.shared import (
@@ -56,23 +61,24 @@ def handle_import_news_item(
     return news_item_db
 
 
-def handle_import_news() -> None:
+def handle_import_news(
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
     """Import news from Drupal."""
-    news_items_data = parse_csv_file(
-        construct_import_file_path(file_key="extra_extra"),
-    )
+    file_name = construct_import_file_path(file_key="extra_extra")
+    prefetch_csv_media(file_name)
     news_index_page = NewsIndexPage.objects.get()
 
-    for news_item_data in tqdm(
-        news_items_data,
-        desc="News items",
-    ):
-        news_item_db: NewsItem = handle_import_news_item(
-            news_item=news_item_data,
-            news_index_page=news_index_page,
-        )
+    with PermanentRedirectBatch(checkpoint) as redirect_batch:
+        for news_item_data in tqdm(
+            iterate_checkpointed_rows(
+                iterate_csv_rows(file_name), redirect_batch.checkpoint
+            ),
+            desc="News items",
+        ):
+            news_item_db: NewsItem = handle_import_news_item(
+                news_item=news_item_data,
+                news_index_page=news_index_page,
+            )
 
-        create_permanent_redirect(
-            redirect_path=news_item_data["url_path"],
-            redirect_entity=news_item_db,
-        )
+            redirect_batch.add(news_item_data["url_path"], news_item_db)
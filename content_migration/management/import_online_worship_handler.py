@@ -1,14 +1,18 @@
 from datetime import datetime
 from tqdm import tqdm
 from community.models import OnlineWorship, OnlineWorshipIndexPage
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_rows,
+)
 from content_migration.management.errors import (
     CouldNotFindMatchingContactError,
     CouldNotParseAuthorIdError,
 )
 from content_migration.management.shared import (
+    AuthorIndex,
     construct_import_file_path,
     create_permanent_redirect,
-    get_existing_magazine_author_from_db,
     parse_csv_file,
 )
 
@@ -49,6 +53,7 @@ def get_timezone_or_none(timezone: str) -> str | None:
 def handle_import_online_worship_item(
     item: dict,
     index_page: OnlineWorshipIndexPage,
+    author_index: AuthorIndex,
 ) -> OnlineWorship:
     """Import a single online worship item from Drupal."""
 
@@ -59,9 +64,7 @@ def handle_import_online_worship_item(
 
     title = item["title"]
     description = item["body"]
-    hosted_by = get_existing_magazine_author_from_db(
-        drupal_author_id=item["magazine_author_id"],
-    )
+    hosted_by = author_index.get(item["magazine_author_id"])
     # times_of_worship = item["times_of_worship"]
     website = item["online_worship_url"]
     drupal_node_id = item["drupal_node_id"]
@@ -107,21 +110,26 @@ def handle_import_online_worship_item(
     return online_worship_db
 
 
-def handle_import_online_worship() -> None:
+def handle_import_online_worship(
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
     """Import news from Drupal."""
     online_worship_items_data = parse_csv_file(
         construct_import_file_path(file_key="online_worship"),
     )
     index_page = OnlineWorshipIndexPage.objects.get()
+    author_index = AuthorIndex()
 
     for online_worship_item_data in tqdm(
-        online_worship_items_data,
+        iterate_checkpointed_rows(online_worship_items_data, checkpoint),
+        total=len(online_worship_items_data),
         desc="Online worship items",
     ):
         try:
             online_worship_db: OnlineWorship = handle_import_online_worship_item(
                 item=online_worship_item_data,
                 index_page=index_page,
+                author_index=author_index,
             )
         except CouldNotFindMatchingContactError:
             continue
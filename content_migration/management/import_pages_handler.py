@@ -1,8 +1,13 @@
 from tqdm import tqdm
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_rows,
+)
+from content_migration.management.csv_reader import iterate_csv_rows
 from content_migration.management.shared import (
-    parse_csv_file,
     parse_media_blocks,
     parse_media_string_to_list,
+    prefetch_csv_media,
 )
 from wagtail.models import Page
 from home.models import HomePage
@@ -50,15 +55,17 @@ def import_page_item(page_data: dict[str, str], home_page: HomePage) -> Page:
     return page
 
 
-def handle_import_pages(file_name: str) -> None:
+def handle_import_pages(
+    file_name: str,
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
     # Get references to relevant index pages
     home_page = HomePage.objects.get()
 
-    pages = parse_csv_file(file_name)
+    prefetch_csv_media(file_name)
 
     for page_data in tqdm(
-        pages,
-        total=len(pages),
+        iterate_checkpointed_rows(iterate_csv_rows(file_name), checkpoint),
         desc="Pages",
         unit="row",
     ):
@@ -0,0 +1,373 @@
+"""Run the content importers as a dependency-ordered, resumable pipeline."""
+import os
+import time
+from collections.abc import Callable
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from graphlib import TopologicalSorter
+
+import django
+from django.db import connections
+
+from content_migration.management.checkpoints import RowCheckpoint
+from content_migration.management.constants import (
+    IMPORT_CHECKPOINT_DIRECTORY,
+    LOCAL_MIGRATION_DATA_DIRECTORY,
+)
+from content_migration.management.errors import ImportPipelineError
+from content_migration.management.import_archive_articles_handler import (
+    handle_import_archive_articles,
+)
+from content_migration.management.import_archive_issues_handler import (
+    handle_import_archive_issues,
+)
+from content_migration.management.import_board_documents_handler import (
+    handle_import_board_documents,
+)
+from content_migration.management.import_books_handler import handle_import_books
+from content_migration.management.import_civicrm_contacts_handler import (
+    handle_import_civicrm_contacts,
+)
+from content_migration.management.import_civicrm_relationships_handler import (
+    handle_import_civicrm_relationships,
+)
+from content_migration.management.import_events_handler import handle_import_events
+from content_migration.management.import_library_item_facets_handler import (
+    handle_import_library_item_facets,
+)
+from content_migration.management.import_library_items_handler import (
+    handle_import_library_items,
+)
+from content_migration.management.import_magazine_articles_handler import (
+    handle_import_magazine_articles_in_batches,
+)
+from content_migration.management.import_magazine_authors_handler import (
+    handle_import_magazine_authors,
+)
+from content_migration.management.import_magazine_departments_handler import (
+    handle_import_magazine_departments,
+)
+from content_migration.management.import_magazine_issues_handler import (
+    handle_import_magazine_issues,
+)
+from content_migration.management.import_meeting_documents_handler import (
+    handle_import_meeting_documents,
+)
+from content_migration.management.import_memorials_handler import (
+    handle_import_memorials,
+)
+from content_migration.management.import_molly_wingate_blog_handler import (
+    handle_import_molly_wingate_blog,
+)
+from content_migration.management.import_news_handler import handle_import_news
+from content_migration.management.import_online_worship_handler import (
+    handle_import_online_worship,
+)
+from content_migration.management.import_pages_handler import handle_import_pages
+from content_migration.management.shared import construct_import_file_path
+
+
+@dataclass
+class ImportStage:
+    """A single importer and the stages that must finish before it runs."""
+
+    name: str
+    handler: Callable[..., None]
+    handler_kwargs: dict = field(default_factory=dict)
+    depends_on: list[str] = field(default_factory=list)
+
+
+@dataclass
+class StageResult:
+    """Timing and throughput for a finished import stage."""
+
+    name: str
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        if self.seconds == 0:
+            return 0.0
+
+        return self.rows / self.seconds
+
+
+# Stages only declare the data they read from other stages, e.g. articles
+# need their authors, issues and departments to exist before they run.
+IMPORT_STAGES = [
+    ImportStage(
+        name="magazine_departments",
+        handler=handle_import_magazine_departments,
+        handler_kwargs={
+            "file_name": construct_import_file_path("magazine_departments")
+        },
+    ),
+    ImportStage(
+        name="magazine_authors",
+        handler=handle_import_magazine_authors,
+        handler_kwargs={"file_name": construct_import_file_path("magazine_authors")},
+    ),
+    ImportStage(
+        name="magazine_issues",
+        handler=handle_import_magazine_issues,
+        handler_kwargs={"file_name": construct_import_file_path("magazine_issues")},
+    ),
+    ImportStage(
+        name="magazine_articles",
+        handler=handle_import_magazine_articles_in_batches,
+        handler_kwargs={"file_name": construct_import_file_path("magazine_articles")},
+        depends_on=[
+            "magazine_authors",
+            "magazine_departments",
+            "magazine_issues",
+        ],
+    ),
+    ImportStage(
+        name="library_item_facets",
+        handler=handle_import_library_item_facets,
+        handler_kwargs={"folder": LOCAL_MIGRATION_DATA_DIRECTORY},
+    ),
+    ImportStage(
+        name="library_items",
+        handler=handle_import_library_items,
+        handler_kwargs={"file_name": construct_import_file_path("library_items")},
+        depends_on=[
+            "library_item_facets",
+            "magazine_authors",
+        ],
+    ),
+    ImportStage(
+        name="archive_issues",
+        handler=handle_import_archive_issues,
+        handler_kwargs={"file_name": construct_import_file_path("archive_issues")},
+    ),
+    ImportStage(
+        name="archive_articles",
+        handler=handle_import_archive_articles,
+        handler_kwargs={"file_name": construct_import_file_path("archive_articles")},
+        depends_on=[
+            "archive_issues",
+            "magazine_authors",
+        ],
+    ),
+    ImportStage(
+        name="memorials",
+        handler=handle_import_memorials,
+        handler_kwargs={"file_name": construct_import_file_path("memorials")},
+        depends_on=["magazine_authors"],
+    ),
+    ImportStage(
+        name="events",
+        handler=handle_import_events,
+        handler_kwargs={"file_name": construct_import_file_path("events")},
+    ),
+    ImportStage(
+        name="board_documents",
+        handler=handle_import_board_documents,
+        handler_kwargs={"file_name": construct_import_file_path("board_documents")},
+    ),
+    ImportStage(
+        name="meeting_documents",
+        handler=handle_import_meeting_documents,
+        handler_kwargs={"file_name": construct_import_file_path("meeting_documents")},
+        depends_on=["magazine_authors"],
+    ),
+    ImportStage(
+        name="molly_wingate_blog",
+        handler=handle_import_molly_wingate_blog,
+    ),
+    ImportStage(
+        name="news",
+        handler=handle_import_news,
+    ),
+    ImportStage(
+        name="online_worship",
+        handler=handle_import_online_worship,
+        depends_on=["magazine_authors"],
+    ),
+    ImportStage(
+        name="pages",
+        handler=handle_import_pages,
+        handler_kwargs={"file_name": construct_import_file_path("pages")},
+    ),
+    ImportStage(
+        name="civicrm_contacts",
+        handler=handle_import_civicrm_contacts,
+        handler_kwargs={"file_name": construct_import_file_path("civicrm_contacts")},
+        depends_on=["magazine_authors"],
+    ),
+    ImportStage(
+        name="civicrm_relationships",
+        handler=handle_import_civicrm_relationships,
+        handler_kwargs={
+            "file_name": construct_import_file_path("civicrm_relationships"),
+        },
+        depends_on=["civicrm_contacts"],
+    ),
+    ImportStage(
+        name="books",
+        handler=handle_import_books,
+        handler_kwargs={"file_name": construct_import_file_path("books")},
+        depends_on=["magazine_authors"],
+    ),
+]
+
+
+def get_stage_checkpoint(
+    stage_name: str,
+    checkpoint_directory: str = IMPORT_CHECKPOINT_DIRECTORY,
+) -> RowCheckpoint:
+    """Get the row checkpoint for a stage."""
+    return RowCheckpoint(os.path.join(checkpoint_directory, f"{stage_name}.txt"))
+
+
+def build_stage_graph(stages: list[ImportStage]) -> TopologicalSorter:
+    """Build a dependency graph of import stages.
+
+    Raises a ValueError if a stage depends on an unknown stage and a
+    graphlib.CycleError if the dependencies are circular.
+    """
+    stage_names = {stage.name for stage in stages}
+    graph: TopologicalSorter = TopologicalSorter()
+
+    for stage in stages:
+        unknown_dependencies = set(stage.depends_on) - stage_names
+
+        if unknown_dependencies:
+            raise ValueError(
+                f"Stage '{stage.name}' depends on unknown stages: "
+                f"{', '.join(sorted(unknown_dependencies))}",
+            )
+
+        graph.add(stage.name, *stage.depends_on)
+
+    graph.prepare()
+
+    return graph
+
+
+def run_import_stage(
+    stage_name: str,
+    checkpoint_directory: str = IMPORT_CHECKPOINT_DIRECTORY,
+    stages: list[ImportStage] | None = None,
+) -> StageResult:
+    """Run a single import stage, skipping rows completed by earlier runs."""
+    stages = stages if stages is not None else IMPORT_STAGES
+    stage = next(stage for stage in stages if stage.name == stage_name)
+    checkpoint = get_stage_checkpoint(stage_name, checkpoint_directory)
+
+    start_time = time.perf_counter()
+    stage.handler(**stage.handler_kwargs, checkpoint=checkpoint)
+    seconds = time.perf_counter() - start_time
+
+    return StageResult(
+        name=stage_name,
+        rows=checkpoint.rows_completed,
+        seconds=seconds,
+    )
+
+
+def initialize_worker() -> None:
+    """Prepare a worker process to use the Django ORM."""
+    django.setup()
+
+
+def run_import_pipeline(
+    stages: list[ImportStage] | None = None,
+    max_workers: int = 1,
+    checkpoint_directory: str = IMPORT_CHECKPOINT_DIRECTORY,
+    restart: bool = False,
+) -> list[StageResult]:
+    """Run the import stages in dependency order.
+
+    Stages whose dependencies have finished are run concurrently in a
+    process pool of `max_workers` processes, or one after another in the
+    current process when `max_workers` is 1. A failed stage skips its
+    dependents and raises an ImportPipelineError once the other stages
+    have finished. Row checkpoints are kept
+    until every stage has succeeded, so an interrupted or failed run
+    resumes where it stopped. Pass `restart=True` to discard them first.
+    """
+    stages = stages if stages is not None else IMPORT_STAGES
+
+    if restart:
+        clear_checkpoints(stages, checkpoint_directory)
+
+    graph = build_stage_graph(stages)
+    results: list[StageResult] = []
+    failed_stages: list[str] = []
+
+    if max_workers == 1:
+        while graph.is_active():
+            ready_stages = graph.get_ready()
+
+            if not ready_stages:
+                # The remaining stages depend on a failed stage
+                break
+
+            for stage_name in ready_stages:
+                try:
+                    results.append(
+                        run_import_stage(stage_name, checkpoint_directory, stages),
+                    )
+                except Exception as error:
+                    failed_stages.append(f"{stage_name} ({error})")
+                    continue
+
+                graph.done(stage_name)
+    else:
+        # Worker processes must open their own database connections
+        connections.close_all()
+
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=initialize_worker,
+        ) as executor:
+            running: dict[Future, str] = {}
+
+            while graph.is_active():
+                for stage_name in graph.get_ready():
+                    future = executor.submit(
+                        run_import_stage,
+                        stage_name,
+                        checkpoint_directory,
+                        stages,
+                    )
+                    running[future] = stage_name
+
+                if not running:
+                    # The remaining stages depend on a failed stage
+                    break
+
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in finished:
+                    stage_name = running.pop(future)
+
+                    try:
+                        results.append(future.result())
+                    except Exception as error:
+                        failed_stages.append(f"{stage_name} ({error})")
+                        continue
+
+                    graph.done(stage_name)
+
+    if failed_stages:
+        raise ImportPipelineError(
+            f"Import stages failed: {', '.join(failed_stages)}",
+            results=results,
+        )
+
+    clear_checkpoints(stages, checkpoint_directory)
+
+    return results
+
+
+def clear_checkpoints(
+    stages: list[ImportStage],
+    checkpoint_directory: str = IMPORT_CHECKPOINT_DIRECTORY,
+) -> None:
+    """Discard the row checkpoints of all stages."""
+    for stage in stages:
+        get_stage_checkpoint(stage.name, checkpoint_directory).clear()
@@ -0,0 +1,174 @@
+"""Download migration media into a content-addressed disk cache.
+
+Downloaded files are stored under the SHA-256 of their contents, and each
+URL gets a small JSON entry pointing at its file. A URL referenced by many
+rows is downloaded once, and identical files are stored once.
+"""
+import functools
+import hashlib
+import html
+import json
+import logging
+import os
+import tempfile
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from io import BytesIO
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from content_migration.management.constants import (
+    MEDIA_CACHE_DIRECTORY,
+    MEDIA_FETCH_TIMEOUT,
+    MEDIA_FETCH_WORKERS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedFile:
+    """A downloaded file stored in the media cache."""
+
+    url: str
+    file_name: str
+    content_type: str
+    sha256: str
+    path: str
+
+    def read(self) -> BytesIO:
+        with open(self.path, "rb") as cached_file:
+            return BytesIO(cached_file.read())
+
+
+def write_file_atomically(path: str, content: bytes) -> None:
+    """Write a file so that concurrent readers never see partial content."""
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as temporary_file:
+        temporary_file.write(content)
+
+    os.replace(temporary_file.name, path)
+
+
+class MediaFetcher:
+    """Fetch media over a pooled HTTP session, caching files on disk."""
+
+    def __init__(
+        self,
+        cache_directory: str = MEDIA_CACHE_DIRECTORY,
+        max_workers: int = MEDIA_FETCH_WORKERS,
+        timeout: float = MEDIA_FETCH_TIMEOUT,
+    ) -> None:
+        self.cache_directory = cache_directory
+        self.max_workers = max_workers
+        self.timeout = timeout
+
+        adapter = HTTPAdapter(
+            pool_connections=max_workers,
+            pool_maxsize=max_workers,
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.5,
+                status_forcelist=[500, 502, 503, 504],
+            ),
+        )
+        self.session = requests.Session()
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get_entry_path(self, url: str) -> str:
+        url_hash = hashlib.sha256(url.encode()).hexdigest()
+
+        return os.path.join(self.cache_directory, "urls", f"{url_hash}.json")
+
+    def get_file_path(self, sha256: str) -> str:
+        return os.path.join(self.cache_directory, "files", sha256[:2], sha256)
+
+    def get_cached(self, url: str) -> CachedFile | None:
+        """Get a previously downloaded file, if it is still in the cache."""
+        if not isinstance(url, str):
+            # Not a URL, leave it to requests to raise the appropriate error
+            return None
+
+        try:
+            with open(self.get_entry_path(url)) as entry_file:
+                entry = json.load(entry_file)
+        except FileNotFoundError:
+            return None
+
+        path = self.get_file_path(entry["sha256"])
+
+        if not os.path.exists(path):
+            return None
+
+        return CachedFile(url=url, path=path, **entry)
+
+    def download(self, url: str) -> CachedFile:
+        """Download a file and add it to the cache.
+
+        Raises a requests.exceptions.RequestException if the file could not be
+        downloaded, including error responses, which are not cached.
+        """
+        response = self.session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+
+        sha256 = hashlib.sha256(response.content).hexdigest()
+        path = self.get_file_path(sha256)
+
+        if not os.path.exists(path):
+            write_file_atomically(path, response.content)
+
+        entry = {
+            "file_name": html.unescape(url.split("/")[-1]),
+            "content_type": response.headers.get("content-type", ""),
+            "sha256": sha256,
+        }
+        write_file_atomically(
+            self.get_entry_path(url),
+            json.dumps(entry).encode(),
+        )
+
+        return CachedFile(url=url, path=path, **entry)
+
+    def fetch(self, url: str) -> CachedFile:
+        """Get a file from the cache, downloading it if necessary."""
+        cached_file = self.get_cached(url)
+
+        if cached_file is None:
+            cached_file = self.download(url)
+
+        return cached_file
+
+    def prefetch(self, urls: Iterable[str]) -> int:
+        """Download every uncached URL concurrently.
+
+        Failed downloads are logged and skipped, so the importer reports them
+        again when it reaches the row. Returns the number of files downloaded.
+        """
+        missing_urls = {url for url in urls if self.get_cached(url) is None}
+        downloaded = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.download, url): url for url in missing_urls}
+
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except requests.exceptions.RequestException:
+                    logger.error(f"Could not prefetch: { futures[future] }")
+                    continue
+
+                downloaded += 1
+
+        return downloaded
+
+
+@functools.cache
+def get_media_fetcher() -> MediaFetcher:
+    """Get the media fetcher shared by the importers in this process."""
+    return MediaFetcher()
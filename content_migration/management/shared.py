@@ -1,9 +1,8 @@
 """Shared functions for content migration."""
 
-import csv
-import html
 import logging
-from dataclasses import dataclass
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
 from io import BytesIO
 from itertools import chain
 from urllib.parse import urlparse
@@ -19,8 +18,9 @@ from wagtail.embeds.embeds import get_embed
 from wagtail.embeds.models import Embed
 from wagtail.embeds.exceptions import EmbedNotFoundException
 from wagtail.images.models import Image
-from wagtail.models import Page
+from wagtail.models import Page, Site
 from wagtail.rich_text import RichText
+from wagtail.utils.file import hash_filelike
 from wagtailmedia.models import Media  # type: ignore
 
 from contact.models import Meeting, Organization, Person
@@ -34,10 +34,22 @@ from content_migration.management.errors import (
 from content_migration.management.constants import (
     DEFAULT_IMAGE_ALIGN,
     DEFAULT_IMAGE_WIDTH,
+    HTML_PARSER,
     IMPORT_FILENAMES,
     LOCAL_MIGRATION_DATA_DIRECTORY,
+    REDIRECT_BATCH_SIZE,
     SITE_BASE_URL,
 )
+from content_migration.management.csv_reader import (
+    iterate_csv_rows,
+    iterate_sorted_groups,
+)
+from common.redirects import invalidate_redirect_map
+from content_migration.management.checkpoints import (
+    PendingRowCheckpoint,
+    RowCheckpoint,
+)
+from content_migration.management.media_fetcher import get_media_fetcher
 from store.models import Book, BookAuthor
 
 ALLOWED_AUDIO_CONTENT_TYPES = [
@@ -111,9 +123,15 @@ def get_or_create_site_root_page() -> Page:
 def get_or_create_book_author(
     book: Book,
     drupal_author_id: int,
+    author_index: "AuthorIndex | None" = None,
 ) -> BookAuthor:
     """Create a BookAuthor object from a Book and a Drupal author ID."""
-    author = get_existing_magazine_author_from_db(drupal_author_id=drupal_author_id)
+    if author_index is not None:
+        author = author_index.get(drupal_author_id)
+    else:
+        author = get_existing_magazine_author_from_db(
+            drupal_author_id=drupal_author_id,
+        )
 
     book_author_exists = BookAuthor.objects.filter(
         book=book,
@@ -256,7 +274,7 @@ def get_file_bytes_from_url(file_url: str) -> BytesIO:
     """Get file bytes from a URL."""
 
     try:
-        response = requests.get(file_url)
+        cached_file = get_media_fetcher().fetch(file_url)
     except requests.exceptions.MissingSchema:
         logger.error(f"Invalid URL, missing schema: { file_url }")
         raise
@@ -267,7 +285,7 @@ def get_file_bytes_from_url(file_url: str) -> BytesIO:
         logger.error(f"Could not download file: { file_url }")
         raise
 
-    return BytesIO(response.content)
+    return cached_file.read()
 
 
 def get_or_create_image(
@@ -325,7 +343,12 @@ def get_image_align_from_style(style_string: str) -> str | None:
 
 
 def adapt_html_to_generic_blocks(html_string: str) -> list[GenericBlock]:
-    """Adapt HTML string to a list of generic blocks."""
+    """Adapt HTML string to a list of generic blocks.
+
+    Importers use `convert_html_body`, which produces the same blocks in a
+    single parse. This version is kept as the reference it is compared and
+    benchmarked against.
+    """
 
     generic_blocks: list[GenericBlock] = []
 
@@ -445,11 +468,192 @@ def adapt_html_to_generic_blocks(html_string: str) -> list[GenericBlock]:
     return generic_blocks
 
 
+@dataclass
+class ConvertedHtml:
+    """The generic blocks and other content found in an HTML body."""
+
+    blocks: list[GenericBlock]
+    teaser: str = ""
+    pullquotes: list[str] = field(default_factory=list)
+    image_urls: list[str] = field(default_factory=list)
+
+
+def get_image_block_content(image_tag: Tag) -> dict:
+    """Get the generic image block content for an image tag."""
+
+    image_url = ensure_absolute_url(image_tag["src"])
+
+    # get image alignment from style attribute float property
+    if "style" in image_tag.attrs:
+        image_align = get_image_align_from_style(image_tag["style"])
+    else:
+        image_align = DEFAULT_IMAGE_ALIGN
+
+    # make sure the URL contains westernfriend.org
+    if "westernfriend.org" not in image_url:
+        raise ValueError(
+            f"Image URL must contain westernfriend.org: {image_url}",
+        )
+
+    # check if image is wrapped in a link
+    if image_tag.parent.name == "a":
+        image_link_url = image_tag.parent["href"]
+    else:
+        image_link_url = None
+
+    return {
+        "image": image_url,
+        "link": image_link_url,
+        "align": image_align,
+    }
+
+
+def convert_html_body(html_string: str, parser: str = HTML_PARSER) -> ConvertedHtml:
+    """Convert an HTML body to generic blocks, parsing it only once.
+
+    Produces the same blocks as `adapt_html_to_generic_blocks`, along with
+    the first paragraph as a teaser, the pull quotes, and the URLs of the
+    image blocks. Pass `parser="lxml"` to use lxml, if it is installed.
+    """
+
+    converted = ConvertedHtml(blocks=[])
+
+    try:
+        soup = BeautifulSoup(html_string, parser)
+    except TypeError:
+        logger.error(f"Could not parse body: { html_string }")
+        return converted
+
+    # Parsers other than html.parser wrap the fragment in <html><body>
+    if parser != "html.parser" and soup.body is not None:
+        root: Tag = soup.body
+    else:
+        root = soup
+
+    teaser_found = False
+    rich_text_value = ""
+
+    for soup_item in list(root.contents):
+        # skip non-Tag items
+        if not isinstance(soup_item, Tag):
+            continue
+
+        if not teaser_found:
+            teaser_paragraph = (
+                soup_item if soup_item.name == "p" else soup_item.find("p")
+            )
+
+            if teaser_paragraph is not None:
+                converted.teaser = teaser_paragraph.text
+                teaser_found = True
+
+        item_string = str(soup_item)
+
+        # skip empty items
+        if item_string in EMPTY_ITEM_VALUES:
+            continue
+
+        item_contains_pullquote = "pullquote" in item_string
+        item_contains_image = "img" in item_string
+
+        if not item_contains_pullquote and not item_contains_image:
+            rich_text_value += item_string
+            continue
+
+        if rich_text_value != "":
+            converted.blocks.append(
+                GenericBlock(
+                    block_type="rich_text",
+                    block_content=rich_text_value,
+                ),
+            )
+
+            rich_text_value = ""
+
+        # Images are read before pull quotes are unwrapped,
+        # since unwrapping can change whether an image is inside a link
+        image_blocks: list[GenericBlock] = []
+
+        if item_contains_image:
+            for image_tag in soup_item.find_all("img"):
+                if "src" not in image_tag.attrs:
+                    continue
+
+                image_block_content = get_image_block_content(image_tag)
+
+                converted.image_urls.append(image_block_content["image"])
+                image_blocks.append(
+                    GenericBlock(
+                        block_type="image",
+                        block_content=image_block_content,
+                    ),
+                )
+
+        if item_contains_pullquote:
+            pullquote_spans = soup_item.find_all("span", {"class": "pullquote"})
+            item_is_pullquote = soup_item.name == "span" and "pullquote" in (
+                soup_item.get("class") or []
+            )
+
+            if item_is_pullquote:
+                pullquote_spans.insert(0, soup_item)
+
+            for pullquote_span in pullquote_spans:
+                pullquote = pullquote_span.get_text()
+
+                converted.pullquotes.append(pullquote)
+                converted.blocks.append(
+                    GenericBlock(
+                        block_type="pullquote",
+                        block_content=pullquote,
+                    ),
+                )
+
+            for pullquote_span in pullquote_spans:
+                if pullquote_span is not soup_item:
+                    pullquote_span.unwrap()
+
+            if item_is_pullquote:
+                item_string = soup_item.decode_contents()
+            else:
+                item_string = str(soup_item)
+
+        converted.blocks.extend(image_blocks)
+
+        # the image blocks replace the rest of the item
+        if image_blocks:
+            item_string = ""
+
+        if item_string != "":
+            rich_text_value += item_string
+
+    # store the accumulated rich text value
+    # if it is not empty
+    if rich_text_value != "":
+        converted.blocks.append(
+            GenericBlock(
+                block_type="rich_text",
+                block_content=rich_text_value,
+            ),
+        )
+
+    return converted
+
+
 def create_document_from_file_bytes(
     file_name: str,
     file_bytes: BytesIO,
 ) -> Document:
-    """Create a document from a file name and bytes."""
+    """Create a document from a file name and bytes.
+
+    Reuses an existing document with the same contents.
+    """
+
+    file_hash = hash_filelike(file_bytes)
+    existing_document = Document.objects.filter(file_hash=file_hash).first()
+
+    if existing_document is not None:
+        return existing_document
 
     document_file: File = File(
         file_bytes,
@@ -459,6 +663,7 @@ def create_document_from_file_bytes(
     document: Document = Document(
         title=file_name,
         file=document_file,
+        file_hash=file_hash,
     )
 
     document.save()
@@ -487,7 +692,16 @@ def create_image_from_file_bytes(
     file_name: str,
     file_bytes: BytesIO,
 ) -> Image:
-    """Create an image from a file name and bytes."""
+    """Create an image from a file name and bytes.
+
+    Reuses an existing image with the same contents.
+    """
+
+    file_hash = hash_filelike(file_bytes)
+    existing_image = Image.objects.filter(file_hash=file_hash).first()
+
+    if existing_image is not None:
+        return existing_image
 
     image_file: ImageFile = ImageFile(
         file_bytes,
@@ -497,6 +711,7 @@ def create_image_from_file_bytes(
     image: Image = Image(
         title=file_name,
         file=image_file,
+        file_hash=file_hash,
     )
 
     image.save()
@@ -551,7 +766,21 @@ def create_media_from_file_bytes(
     file_bytes: BytesIO,
     file_type: str,
 ) -> Media:
-    """Create a media item from a file name and bytes."""
+    """Create a media item from a file name and bytes.
+
+    Reuses an existing media item with the same title and contents, since
+    media items don't store a hash of their file.
+    """
+
+    file_hash = hash_filelike(file_bytes)
+
+    for existing_media in Media.objects.filter(title=file_name, type=file_type):
+        try:
+            with existing_media.file.open() as existing_file:
+                if hash_filelike(existing_file) == file_hash:
+                    return existing_media
+        except OSError:
+            continue
 
     media_file: File = File(
         file_bytes,
@@ -627,15 +856,15 @@ def fetch_file_bytes(url: str) -> FileBytesWithMimeType:
     """Fetch a file from a URL and return the file bytes."""
 
     try:
-        response = requests.get(url)
+        cached_file = get_media_fetcher().fetch(url)
     except requests.exceptions.RequestException:
         logger.error(f"Could not GET: '{ url }'")
         raise
 
     return FileBytesWithMimeType(
-        file_bytes=BytesIO(response.content),
-        file_name=html.unescape(url.split("/")[-1]),
-        content_type=response.headers["content-type"],
+        file_bytes=cached_file.read(),
+        file_name=cached_file.file_name,
+        content_type=cached_file.content_type,
     )
 
 
@@ -672,10 +901,61 @@ def ensure_absolute_url(url: str) -> str:
 def extract_image_urls(block_content: str) -> list[str]:
     """Get a list of all image URLs found within the block_content."""
     soup = BeautifulSoup(block_content, "html.parser")
-    image_srcs = [img["src"] for img in soup.findAll("img")]
+    image_srcs = [img["src"] for img in soup.findAll("img", src=True)]
     return image_srcs
 
 
+def collect_media_urls(
+    rows: Iterable[dict],
+    html_fields: tuple[str, ...] = ("body",),
+    media_fields: tuple[str, ...] = ("media",),
+) -> set[str]:
+    """Collect the downloadable media URLs referenced by CSV rows.
+
+    Includes image sources in HTML fields and the URLs in media list fields,
+    leaving out media embeds, which are not downloaded.
+    """
+    media_urls: set[str] = set()
+
+    for row in rows:
+        for html_field in html_fields:
+            if row.get(html_field):
+                media_urls.update(
+                    ensure_absolute_url(image_url)
+                    for image_url in extract_image_urls(row[html_field])
+                )
+
+        for media_field in media_fields:
+            if row.get(media_field):
+                media_urls.update(
+                    ensure_absolute_url(media_url)
+                    for media_url in parse_media_string_to_list(row[media_field])
+                )
+
+    return {
+        media_url
+        for media_url in media_urls
+        if urlparse(media_url).netloc not in MEDIA_EMBED_DOMAINS
+    }
+
+
+def prefetch_csv_media(
+    csv_file_path: str,
+    html_fields: tuple[str, ...] = ("body",),
+    media_fields: tuple[str, ...] = ("media",),
+) -> None:
+    """Download the media referenced by a CSV file into the media cache."""
+    rows = iterate_csv_rows(csv_file_path, columns=html_fields + media_fields)
+
+    get_media_fetcher().prefetch(
+        collect_media_urls(
+            rows,
+            html_fields=html_fields,
+            media_fields=media_fields,
+        ),
+    )
+
+
 def parse_media_blocks(media_urls: list[str]) -> list[tuple]:
     """Given a list of media URLs, return a list of media blocks."""
 
@@ -777,11 +1057,70 @@ def get_existing_magazine_author_from_db(
         return results[0]
 
 
+class AuthorIndex:
+    """In-memory lookup of contacts by Drupal author ID.
+
+    Loads every Person, Meeting and Organization once, so importers can
+    resolve the authors on each row without querying the database.
+    Duplicate author IDs are indexed as aliases of their primary record
+    and are only used when no contact has that primary author ID.
+    """
+
+    def __init__(self) -> None:
+        self.contacts: dict[int, list[Person | Meeting | Organization]] = {}
+        self.aliases: dict[int, list[Person | Meeting | Organization]] = {}
+
+        contacts = chain(
+            Person.objects.all(),
+            Meeting.objects.all(),
+            Organization.objects.all(),
+        )
+
+        for contact in contacts:
+            if contact.drupal_author_id is not None:
+                self.contacts.setdefault(contact.drupal_author_id, []).append(
+                    contact,
+                )
+
+            for duplicate_author_id in set(contact.drupal_duplicate_author_ids):
+                self.aliases.setdefault(duplicate_author_id, []).append(contact)
+
+    def get(self, drupal_author_id: str | int) -> Person | Meeting | Organization:
+        """Find the contact for a Drupal author ID.
+
+        Raises the same errors as `get_existing_magazine_author_from_db`.
+        """
+        try:
+            drupal_author_id = int(drupal_author_id)
+        except ValueError:
+            raise CouldNotParseAuthorIdError()
+
+        results = self.contacts.get(drupal_author_id) or self.aliases.get(
+            drupal_author_id,
+            [],
+        )
+
+        if len(results) == 0:
+            error_message = f"Could not find matching author for magazine author ID: { drupal_author_id }"  # noqa: E501
+            logger.error(error_message)
+
+            raise CouldNotFindMatchingContactError(error_message)
+        elif len(results) > 1:
+            error_message = (
+                f"Duplicate authors found for magazine author ID: { drupal_author_id }"
+            )
+            logger.error(error_message)
+            raise DuplicateContactError(error_message)
+        else:
+            return results[0]
+
+
 def parse_csv_file(csv_file_path: str) -> list[dict]:
-    """Parse a CSV file into a list of dictionaries."""
-    with open(csv_file_path) as csv_file:
-        csv_reader = csv.DictReader(csv_file)
-        return list(csv_reader)
+    """Parse a CSV file into a list of dictionaries.
+
+    Prefer `iterate_csv_rows` for large files.
+    """
+    return list(iterate_csv_rows(csv_file_path))
 
 
 def create_group_by(group_by_key: str, items: list[dict]) -> dict:
@@ -800,30 +1139,32 @@ def create_group_by(group_by_key: str, items: list[dict]) -> dict:
 
 
 def create_archive_issues_from_articles_dicts(
-    articles: list[dict],
-) -> list[ArchiveIssueData]:
-    """Create ArchiveIssue objects from a list of article dictionaries."""
-
-    # Group articles by issue
-    issues = create_group_by("internet_archive_identifier", articles)
+    articles: Iterable[dict],
+) -> Iterator[ArchiveIssueData]:
+    """Create ArchiveIssue objects from article dictionaries.
 
-    archive_issues: list[ArchiveIssueData] = []
+    The articles must be sorted by issue, so only one issue's articles are
+    held in memory at a time.
+    """
 
-    for issue in issues:
-        issue_data = ArchiveIssueData(
+    for issue, issue_articles in iterate_sorted_groups(
+        articles,
+        "internet_archive_identifier",
+    ):
+        yield ArchiveIssueData(
             internet_archive_identifier=issue,
-            archive_articles=issues[issue],
+            archive_articles=issue_articles,
         )
-        archive_issues.append(issue_data)
-
-    return archive_issues
 
 
 def parse_body_blocks(body: str) -> list:
     """Parse the body field into a list of StreamField blocks."""
-    article_body_blocks: list[tuple] = []
+    return create_streamfield_blocks(convert_html_body(body).blocks)
 
-    generic_blocks = adapt_html_to_generic_blocks(body)
+
+def create_streamfield_blocks(generic_blocks: list[GenericBlock]) -> list:
+    """Create StreamField blocks from generic blocks, skipping invalid ones."""
+    article_body_blocks: list[tuple] = []
 
     for generic_block in generic_blocks:
         try:
@@ -852,4 +1193,94 @@ def create_permanent_redirect(
             site=redirect_entity.get_site(),
             redirect_page=redirect_entity,  # the new page
             is_permanent=True,
-        ).save()
+        )
+
+
+def bulk_create_permanent_redirects(
+    redirects: list[tuple[str, Page]],
+) -> None:
+    """Create permanent redirects from old paths to new pages in bulk.
+
+    Expects a list of (redirect_path, redirect_entity) tuples. Paths
+    that already have a redirect are skipped, like in
+    `create_permanent_redirect`.
+    """
+
+    existing_paths = set(
+        Redirect.objects.filter(
+            old_path__in=[redirect_path for redirect_path, _ in redirects],
+        ).values_list("old_path", flat=True),
+    )
+
+    # Resolve each page's site without a query per page
+    site_ids = {}
+
+    for redirect_path, redirect_entity in redirects:
+        url_parts = redirect_entity.get_url_parts()
+        site_ids[redirect_path] = url_parts[0] if url_parts is not None else None
+
+    sites = Site.objects.in_bulk(
+        [site_id for site_id in site_ids.values() if site_id is not None],
+    )
+
+    new_redirects: dict[str, Redirect] = {}
+
+    for redirect_path, redirect_entity in redirects:
+        if redirect_path in existing_paths or redirect_path in new_redirects:
+            continue
+
+        new_redirects[redirect_path] = Redirect(
+            old_path=redirect_path,  # the old path from Drupal
+            site=sites.get(site_ids[redirect_path]),  # type: ignore
+            redirect_page=redirect_entity,  # the new page
+            is_permanent=True,
+        )
+
+    Redirect.objects.bulk_create(new_redirects.values())
+
+    # Bulk creation doesn't send the signals that invalidate the redirect map
+    if new_redirects:
+        invalidate_redirect_map()
+
+
+class PermanentRedirectBatch:
+    """Collect the permanent redirects of imported pages, creating them in bulk.
+
+    Redirects are created once the batch is full, and when the `with` block
+    ends, including when the import stops with an error. Rows iterated with
+    the batch's `checkpoint` are only marked as completed once their
+    redirects are created, so an interrupted import runs them again rather
+    than skipping them without redirects.
+    """
+
+    def __init__(
+        self,
+        checkpoint: RowCheckpoint | None = None,
+        batch_size: int = REDIRECT_BATCH_SIZE,
+    ) -> None:
+        self.batch_size = batch_size
+        self.redirects: list[tuple[str, Page]] = []
+        self.checkpoint = (
+            PendingRowCheckpoint(checkpoint) if checkpoint is not None else None
+        )
+
+    def __enter__(self) -> "PermanentRedirectBatch":
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.flush()
+
+    def add(self, redirect_path: str, redirect_entity: Page) -> None:
+        self.redirects.append((redirect_path, redirect_entity))
+
+        if len(self.redirects) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if self.redirects:
+            bulk_create_permanent_redirects(self.redirects)
+
+        self.redirects = []
+
+        if self.checkpoint is not None:
+            self.checkpoint.commit()
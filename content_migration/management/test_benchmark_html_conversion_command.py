@@ -0,0 +1,14 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+
+
+class CommandSimpleTestCase(SimpleTestCase):
+    def test_reports_throughput_of_each_converter(self) -> None:
+        output = StringIO()
+
+        call_command("benchmark_html_conversion", repeat=1, stdout=output)
+
+        self.assertIn("separate parses: 8 bodies", output.getvalue())
+        self.assertIn("convert_html_body (html.parser): 8 bodies", output.getvalue())
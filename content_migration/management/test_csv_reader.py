@@ -0,0 +1,74 @@
+import csv
+import os
+import tempfile
+
+from django.test import SimpleTestCase
+
+from content_migration.management.csv_reader import (
+    iterate_csv_batches,
+    iterate_csv_rows,
+    iterate_sorted_groups,
+)
+from content_migration.management.errors import UnsortedCsvError
+
+FAKE_ROWS = [
+    {"drupal_node_id": "1", "issue": "a", "body": "<p>First</p>"},
+    {"drupal_node_id": "2", "issue": "a", "body": "<p>Second\nline</p>"},
+    {"drupal_node_id": "3", "issue": "b", "body": "<p>Third</p>"},
+]
+
+
+class CsvReaderSimpleTestCase(SimpleTestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.csv_file_path = os.path.join(self.directory.name, "rows.csv")
+
+        with open(self.csv_file_path, "w", newline="") as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=FAKE_ROWS[0].keys())
+            writer.writeheader()
+            writer.writerows(FAKE_ROWS)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_iterate_csv_rows(self) -> None:
+        self.assertEqual(list(iterate_csv_rows(self.csv_file_path)), FAKE_ROWS)
+
+    def test_iterate_csv_rows_with_columns_and_converters(self) -> None:
+        rows = iterate_csv_rows(
+            self.csv_file_path,
+            columns=["drupal_node_id", "issue"],
+            converters={"drupal_node_id": int},
+        )
+
+        self.assertEqual(
+            list(rows),
+            [
+                {"drupal_node_id": 1, "issue": "a"},
+                {"drupal_node_id": 2, "issue": "a"},
+                {"drupal_node_id": 3, "issue": "b"},
+            ],
+        )
+
+    def test_iterate_csv_rows_with_missing_column_raises_error(self) -> None:
+        with self.assertRaises(ValueError):
+            list(iterate_csv_rows(self.csv_file_path, columns=["missing"]))
+
+    def test_iterate_csv_batches(self) -> None:
+        batches = iterate_csv_batches(self.csv_file_path, batch_size=2)
+
+        self.assertEqual(list(batches), [FAKE_ROWS[:2], FAKE_ROWS[2:]])
+
+    def test_iterate_sorted_groups(self) -> None:
+        groups = iterate_sorted_groups(iterate_csv_rows(self.csv_file_path), "issue")
+
+        self.assertEqual(
+            list(groups),
+            [("a", FAKE_ROWS[:2]), ("b", FAKE_ROWS[2:])],
+        )
+
+    def test_iterate_sorted_groups_with_unsorted_rows_raises_error(self) -> None:
+        rows = [FAKE_ROWS[0], FAKE_ROWS[2], FAKE_ROWS[1]]
+
+        with self.assertRaises(UnsortedCsvError):
+            list(iterate_sorted_groups(rows, "issue"))
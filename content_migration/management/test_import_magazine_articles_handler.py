@@ -1,11 +1,196 @@
 # import django SimpleTestCase
-from django.test import SimpleTestCase
+import csv
+import datetime
+import os
+import tempfile
 
+from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.test.utils import CaptureQueriesContext
+from wagtail.contrib.redirects.models import Redirect
+from wagtail.models import Page, Site
+
+from community.models import CommunityPage
+from contact.models import Person, PersonIndexPage
 from content_migration.management.import_magazine_articles_handler import (
     handle_import_magazine_articles,
+    handle_import_magazine_articles_in_batches,
+)
+from common.page_cache import get_page_generation
+from home.models import HomePage
+from magazine.models import (
+    MagazineArticle,
+    MagazineDepartment,
+    MagazineDepartmentIndexPage,
+    MagazineIndexPage,
+    MagazineIssue,
 )
+from search.models import PageSearchEntry
 
 
 class ImportEventsHandlerSimpleTestCase(SimpleTestCase):
     def test_handle_import_magazine_articles(self) -> None:
         assert callable(handle_import_magazine_articles)
+
+
+class ImportMagazineArticlesInBatchesTestCase(TestCase):
+    csv_columns = [
+        "title",
+        "drupal_node_id",
+        "is_featured",
+        "department",
+        "body",
+        "media",
+        "related_issue_id",
+        "authors",
+        "keywords",
+        "url_path",
+    ]
+
+    def setUp(self) -> None:
+        site_root = Page.objects.get(id=2)
+
+        self.home_page = HomePage(title="Home")
+        site_root.add_child(instance=self.home_page)
+        Site.objects.all().update(root_page=self.home_page)
+
+        community_page = CommunityPage(title="Community")
+        self.home_page.add_child(instance=community_page)
+        person_index_page = PersonIndexPage(title="People")
+        community_page.add_child(instance=person_index_page)
+
+        self.author = Person(
+            given_name="Test",
+            family_name="Author",
+            drupal_author_id=10,
+        )
+        person_index_page.add_child(instance=self.author)
+
+        magazine_index = MagazineIndexPage(title="Magazine")
+        self.home_page.add_child(instance=magazine_index)
+
+        department_index = MagazineDepartmentIndexPage(title="Departments")
+        magazine_index.add_child(instance=department_index)
+        self.department = MagazineDepartment(title="Features")
+        department_index.add_child(instance=self.department)
+
+        self.issue = MagazineIssue(
+            title="Issue 1",
+            publication_date=datetime.date(2020, 1, 1),
+            drupal_node_id=100,
+        )
+        magazine_index.add_child(instance=self.issue)
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.file_name = os.path.join(self.directory.name, "articles.csv")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def write_articles_csv(self, number_of_articles: int) -> None:
+        with open(self.file_name, "w", newline="") as csv_file:
+            writer = csv.DictWriter(csv_file, fieldnames=self.csv_columns)
+            writer.writeheader()
+
+            for number in range(number_of_articles):
+                writer.writerow(
+                    {
+                        "title": f"Article {number}",
+                        "drupal_node_id": str(1000 + number),
+                        "is_featured": "False",
+                        "department": "Features",
+                        "body": f"<p>Teaser {number}</p><p>More text</p>",
+                        "media": "",
+                        "related_issue_id": "100",
+                        "authors": "10",
+                        "keywords": "peace, community",
+                        "url_path": f"/node/{1000 + number}",
+                    },
+                )
+
+    def test_imports_articles_with_related_content(self) -> None:
+        self.write_articles_csv(number_of_articles=3)
+
+        handle_import_magazine_articles_in_batches(self.file_name, batch_size=2)
+
+        articles = MagazineArticle.objects.child_of(self.issue).order_by(
+            "drupal_node_id",
+        )
+
+        self.assertEqual(articles.count(), 3)
+
+        article = articles.first()
+
+        self.assertEqual(article.title, "Article 0")  # type: ignore
+        self.assertEqual(article.teaser, "Teaser 0")  # type: ignore
+        self.assertEqual(article.department, self.department)  # type: ignore
+        self.assertEqual(
+            [author.author.id for author in article.authors.all()],  # type: ignore
+            [self.author.id],
+        )
+        self.assertEqual(
+            set(article.tags.names()),  # type: ignore
+            {"peace", "community"},
+        )
+        self.assertEqual(
+            Redirect.objects.get(old_path="/node/1000").redirect_page.id,
+            article.id,  # type: ignore
+        )
+
+    def test_reimport_updates_without_duplicating_relations(self) -> None:
+        self.write_articles_csv(number_of_articles=2)
+        handle_import_magazine_articles_in_batches(self.file_name)
+        handle_import_magazine_articles_in_batches(self.file_name)
+
+        article = MagazineArticle.objects.get(drupal_node_id=1000)
+
+        self.assertEqual(MagazineArticle.objects.count(), 2)
+        self.assertEqual(article.authors.count(), 1)  # type: ignore
+        self.assertEqual(article.tags.count(), 2)
+        self.assertEqual(Redirect.objects.count(), 2)
+
+    def test_indexes_articles_with_authors_and_tags(self) -> None:
+        self.write_articles_csv(number_of_articles=1)
+        handle_import_magazine_articles_in_batches(self.file_name)
+
+        article = MagazineArticle.objects.get(drupal_node_id=1000)
+        entry = PageSearchEntry.objects.get(page=article)
+
+        self.assertIn("Author", entry.keywords)
+        self.assertIn("peace", entry.keywords)
+
+    def test_reimport_refreshes_search_entries_and_cached_responses(self) -> None:
+        self.write_articles_csv(number_of_articles=1)
+        handle_import_magazine_articles_in_batches(self.file_name)
+
+        article = MagazineArticle.objects.get(drupal_node_id=1000)
+        generation = get_page_generation(article.id)
+
+        with open(self.file_name) as csv_file:
+            contents = csv_file.read()
+
+        with open(self.file_name, "w") as csv_file:
+            csv_file.write(contents.replace("Article 0", "Renamed article"))
+
+        handle_import_magazine_articles_in_batches(self.file_name)
+
+        self.assertEqual(
+            PageSearchEntry.objects.get(page=article).title,
+            "Renamed article",
+        )
+        self.assertNotEqual(get_page_generation(article.id), generation)
+
+    def test_update_query_count_does_not_depend_on_batch_size(self) -> None:
+        self.write_articles_csv(number_of_articles=10)
+        handle_import_magazine_articles_in_batches(self.file_name)
+
+        # Re-import, so that all rows update existing articles
+        with CaptureQueriesContext(connection) as ten_row_queries:
+            handle_import_magazine_articles_in_batches(self.file_name, batch_size=10)
+
+        self.write_articles_csv(number_of_articles=2)
+
+        with CaptureQueriesContext(connection) as two_row_queries:
+            handle_import_magazine_articles_in_batches(self.file_name, batch_size=10)
+
+        self.assertEqual(len(ten_row_queries), len(two_row_queries))
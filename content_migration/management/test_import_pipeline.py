@@ -0,0 +1,282 @@
+import os
+import tempfile
+from graphlib import CycleError
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from content_migration.management.checkpoints import (
+    RowCheckpoint,
+    iterate_checkpointed_batches,
+    iterate_checkpointed_rows,
+)
+from content_migration.management.errors import ImportPipelineError
+from content_migration.management.shared import PermanentRedirectBatch
+from content_migration.management.import_pipeline import (
+    IMPORT_STAGES,
+    ImportStage,
+    StageResult,
+    build_stage_graph,
+    get_stage_checkpoint,
+    run_import_pipeline,
+)
+
+FAKE_ROWS = [{"title": "first"}, {"title": "second"}, {"title": "third"}]
+
+handled_rows: list[str] = []
+
+
+def handle_fake_import(
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
+    for row in iterate_checkpointed_rows(FAKE_ROWS, checkpoint):
+        handled_rows.append(row["title"])
+
+
+def handle_failing_import(
+    checkpoint: RowCheckpoint | None = None,
+) -> None:
+    for row in iterate_checkpointed_rows(FAKE_ROWS, checkpoint):
+        if row["title"] == "second":
+            raise ValueError("Could not import row")
+
+
+class IterateCheckpointedRowsSimpleTestCase(SimpleTestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        self.checkpoint_path = os.path.join(self.directory.name, "stage.txt")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_without_checkpoint_yields_all_rows(self) -> None:
+        self.assertEqual(
+            list(iterate_checkpointed_rows(FAKE_ROWS, None)),
+            FAKE_ROWS,
+        )
+
+    def test_completed_rows_are_skipped_on_next_run(self) -> None:
+        checkpoint = RowCheckpoint(self.checkpoint_path)
+
+        with self.assertRaises(ValueError):
+            handle_failing_import(checkpoint=checkpoint)
+
+        self.assertEqual(checkpoint.rows_completed, 1)
+
+        resumed_checkpoint = RowCheckpoint(self.checkpoint_path)
+        remaining_rows = list(
+            iterate_checkpointed_rows(FAKE_ROWS, resumed_checkpoint),
+        )
+
+        self.assertEqual(remaining_rows, FAKE_ROWS[1:])
+        self.assertEqual(resumed_checkpoint.rows_completed, 2)
+
+    def test_batches_are_completed_together(self) -> None:
+        checkpoint = RowCheckpoint(self.checkpoint_path)
+        batches = iterate_checkpointed_batches(FAKE_ROWS, checkpoint, batch_size=2)
+
+        self.assertEqual(next(batches), FAKE_ROWS[:2])
+        self.assertEqual(checkpoint.completed_keys, set())
+
+        self.assertEqual(next(batches), FAKE_ROWS[2:])
+        self.assertEqual(checkpoint.completed_keys, {"0", "1"})
+
+        self.assertEqual(list(batches), [])
+        self.assertEqual(checkpoint.completed_keys, {"0", "1", "2"})
+
+    def test_rows_are_completed_once_their_redirects_are_created(self) -> None:
+        checkpoint = RowCheckpoint(self.checkpoint_path)
+
+        with patch(
+            "content_migration.management.shared.bulk_create_permanent_redirects",
+        ) as bulk_create_permanent_redirects, self.assertRaises(ValueError):
+            with PermanentRedirectBatch(checkpoint, batch_size=2) as redirect_batch:
+                for row in iterate_checkpointed_rows(
+                    FAKE_ROWS,
+                    redirect_batch.checkpoint,
+                ):
+                    # The first row is done, but its redirect isn't created
+                    if row["title"] == "second":
+                        self.assertEqual(checkpoint.completed_keys, set())
+
+                    if row["title"] == "third":
+                        raise ValueError("Could not import row")
+
+                    redirect_batch.add(f"/{row['title']}", row)  # type: ignore
+
+        # Both redirects were created once the batch was full, and the second
+        # row is marked as completed when the import stops
+        self.assertEqual(bulk_create_permanent_redirects.call_count, 1)
+        self.assertEqual(
+            RowCheckpoint(self.checkpoint_path).completed_keys,
+            {"0", "1"},
+        )
+
+    def test_clear(self) -> None:
+        checkpoint = RowCheckpoint(self.checkpoint_path)
+        checkpoint.mark_completed("0")
+
+        checkpoint.clear()
+
+        self.assertFalse(os.path.exists(self.checkpoint_path))
+        self.assertFalse(RowCheckpoint(self.checkpoint_path).is_completed("0"))
+
+
+class BuildStageGraphSimpleTestCase(SimpleTestCase):
+    def test_default_stages_form_a_graph(self) -> None:
+        graph = build_stage_graph(IMPORT_STAGES)
+        ready = set(graph.get_ready())
+
+        self.assertIn("magazine_authors", ready)
+        self.assertNotIn("magazine_articles", ready)
+        self.assertNotIn("library_items", ready)
+        self.assertNotIn("online_worship", ready)
+
+    def test_unknown_dependency_raises_error(self) -> None:
+        stages = [
+            ImportStage(
+                name="articles",
+                handler=handle_fake_import,
+                depends_on=["authors"],
+            ),
+        ]
+
+        with self.assertRaises(ValueError):
+            build_stage_graph(stages)
+
+    def test_circular_dependency_raises_error(self) -> None:
+        stages = [
+            ImportStage(name="a", handler=handle_fake_import, depends_on=["b"]),
+            ImportStage(name="b", handler=handle_fake_import, depends_on=["a"]),
+        ]
+
+        with self.assertRaises(CycleError):
+            build_stage_graph(stages)
+
+
+class RunImportPipelineSimpleTestCase(SimpleTestCase):
+    def setUp(self) -> None:
+        handled_rows.clear()
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_runs_dependencies_first(self) -> None:
+        stages = [
+            ImportStage(
+                name="articles",
+                handler=handle_fake_import,
+                depends_on=["authors"],
+            ),
+            ImportStage(name="authors", handler=handle_fake_import),
+        ]
+
+        results = run_import_pipeline(
+            stages=stages,
+            checkpoint_directory=self.directory.name,
+        )
+
+        self.assertEqual([result.name for result in results], ["authors", "articles"])
+        self.assertEqual([result.rows for result in results], [3, 3])
+        self.assertEqual(len(handled_rows), 6)
+
+    def test_resumes_after_failure(self) -> None:
+        stages = [ImportStage(name="failing", handler=handle_failing_import)]
+
+        with self.assertRaises(ImportPipelineError):
+            run_import_pipeline(
+                stages=stages,
+                checkpoint_directory=self.directory.name,
+            )
+
+        checkpoint = get_stage_checkpoint("failing", self.directory.name)
+        self.assertTrue(checkpoint.is_completed("0"))
+        self.assertFalse(checkpoint.is_completed("1"))
+
+    def test_clears_checkpoints_after_success(self) -> None:
+        stages = [ImportStage(name="fake", handler=handle_fake_import)]
+
+        run_import_pipeline(
+            stages=stages,
+            checkpoint_directory=self.directory.name,
+        )
+
+        checkpoint = get_stage_checkpoint("fake", self.directory.name)
+        self.assertEqual(checkpoint.completed_keys, set())
+
+    def test_runs_stages_in_worker_processes(self) -> None:
+        stages = [
+            ImportStage(name="first", handler=handle_fake_import),
+            ImportStage(name="second", handler=handle_fake_import),
+            ImportStage(
+                name="third",
+                handler=handle_fake_import,
+                depends_on=["first", "second"],
+            ),
+        ]
+
+        results = run_import_pipeline(
+            stages=stages,
+            max_workers=2,
+            checkpoint_directory=self.directory.name,
+        )
+
+        self.assertEqual(
+            {result.name for result in results},
+            {"first", "second", "third"},
+        )
+        self.assertEqual(results[-1].name, "third")
+
+    def test_failed_stage_skips_dependents_in_current_process(self) -> None:
+        stages = [
+            ImportStage(name="failing", handler=handle_failing_import),
+            ImportStage(
+                name="dependent",
+                handler=handle_fake_import,
+                depends_on=["failing"],
+            ),
+            ImportStage(name="independent", handler=handle_fake_import),
+        ]
+
+        with self.assertRaises(ImportPipelineError) as context:
+            run_import_pipeline(
+                stages=stages,
+                checkpoint_directory=self.directory.name,
+            )
+
+        self.assertIn("failing (Could not import row)", str(context.exception))
+        self.assertEqual(
+            [result.name for result in context.exception.results],
+            ["independent"],
+        )
+        self.assertEqual(handled_rows, ["first", "second", "third"])
+
+    def test_failed_stage_skips_dependents(self) -> None:
+        stages = [
+            ImportStage(name="failing", handler=handle_failing_import),
+            ImportStage(
+                name="dependent",
+                handler=handle_fake_import,
+                depends_on=["failing"],
+            ),
+            ImportStage(name="independent", handler=handle_fake_import),
+        ]
+
+        with self.assertRaises(ImportPipelineError) as context:
+            run_import_pipeline(
+                stages=stages,
+                max_workers=2,
+                checkpoint_directory=self.directory.name,
+            )
+
+        self.assertEqual(
+            [result.name for result in context.exception.results],
+            ["independent"],
+        )
+
+
+class StageResultSimpleTestCase(SimpleTestCase):
+    def test_rows_per_second(self) -> None:
+        self.assertEqual(StageResult(name="a", rows=10, seconds=2).rows_per_second, 5)
+        self.assertEqual(StageResult(name="a", rows=10, seconds=0).rows_per_second, 0)
@@ -0,0 +1,139 @@
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+from django.test import SimpleTestCase
+
+from content_migration.management.media_fetcher import MediaFetcher
+
+FAKE_FILES = {
+    "/images/first.png": b"first image",
+    "/images/same-as-first.png": b"first image",
+    "/images/second.png": b"second image",
+}
+
+
+class FakeMediaRequestHandler(BaseHTTPRequestHandler):
+    """Serve FAKE_FILES and count the requests for each path."""
+
+    request_counts: dict[str, int] = {}
+    lock = threading.Lock()
+
+    def do_GET(self) -> None:  # noqa: N802
+        with self.lock:
+            self.request_counts[self.path] = self.request_counts.get(self.path, 0) + 1
+
+        if self.path not in FAKE_FILES:
+            self.send_error(404)
+            return
+
+        content = FAKE_FILES[self.path]
+
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(content)))
+        self.end_headers()
+        self.wfile.write(content)
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+
+class MediaFetcherSimpleTestCase(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+
+        cls.server = ThreadingHTTPServer(("localhost", 0), FakeMediaRequestHandler)
+        cls.server_thread = threading.Thread(target=cls.server.serve_forever)
+        cls.server_thread.start()
+        cls.base_url = f"http://localhost:{cls.server.server_port}"
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.server_thread.join()
+
+        super().tearDownClass()
+
+    def setUp(self) -> None:
+        FakeMediaRequestHandler.request_counts.clear()
+        self.directory = tempfile.TemporaryDirectory()
+        self.fetcher = MediaFetcher(cache_directory=self.directory.name)
+
+    def tearDown(self) -> None:
+        self.fetcher.session.close()
+        self.directory.cleanup()
+
+    def test_fetch_downloads_once(self) -> None:
+        url = f"{self.base_url}/images/first.png"
+
+        first_fetch = self.fetcher.fetch(url)
+        second_fetch = self.fetcher.fetch(url)
+
+        self.assertEqual(first_fetch.read().getvalue(), b"first image")
+        self.assertEqual(first_fetch.file_name, "first.png")
+        self.assertEqual(first_fetch.content_type, "image/png")
+        self.assertEqual(second_fetch, first_fetch)
+        self.assertEqual(FakeMediaRequestHandler.request_counts["/images/first.png"], 1)
+
+    def test_cache_survives_new_fetcher(self) -> None:
+        url = f"{self.base_url}/images/first.png"
+        self.fetcher.fetch(url)
+
+        new_fetcher = MediaFetcher(cache_directory=self.directory.name)
+        new_fetcher.fetch(url)
+        new_fetcher.session.close()
+
+        self.assertEqual(FakeMediaRequestHandler.request_counts["/images/first.png"], 1)
+
+    def test_identical_files_are_stored_once(self) -> None:
+        first = self.fetcher.fetch(f"{self.base_url}/images/first.png")
+        same_as_first = self.fetcher.fetch(f"{self.base_url}/images/same-as-first.png")
+
+        self.assertEqual(first.path, same_as_first.path)
+        self.assertEqual(same_as_first.file_name, "same-as-first.png")
+        self.assertEqual(
+            len(
+                os.listdir(os.path.join(self.directory.name, "files", first.sha256[:2]))
+            ),
+            1,
+        )
+
+    def test_error_responses_raise_and_are_not_cached(self) -> None:
+        url = f"{self.base_url}/images/missing.png"
+
+        with self.assertRaises(requests.exceptions.HTTPError):
+            self.fetcher.fetch(url)
+
+        self.assertIsNone(self.fetcher.get_cached(url))
+
+    def test_prefetch_downloads_each_url_once(self) -> None:
+        urls = [
+            f"{self.base_url}/images/first.png",
+            f"{self.base_url}/images/second.png",
+            f"{self.base_url}/images/second.png",
+            f"{self.base_url}/images/missing.png",
+            "invalid_url",
+        ]
+
+        downloaded = self.fetcher.prefetch(urls)
+
+        self.assertEqual(downloaded, 2)
+        self.assertEqual(
+            FakeMediaRequestHandler.request_counts,
+            {
+                "/images/first.png": 1,
+                "/images/second.png": 1,
+                "/images/missing.png": 1,
+            },
+        )
+
+        self.assertEqual(self.fetcher.prefetch(urls[:3]), 0)
+        self.assertEqual(
+            FakeMediaRequestHandler.request_counts["/images/second.png"],
+            1,
+        )
@@ -1,8 +1,12 @@
+import importlib.util
+import tempfile
+import unittest
 from decimal import Decimal
 from io import BytesIO
 from unittest import mock
 from unittest.mock import Mock, patch
 from django.test import TestCase, SimpleTestCase
+from PIL import Image as PILImage
 from requests.exceptions import MissingSchema, InvalidSchema, RequestException
 
 from wagtail.models import Page, Site
@@ -26,16 +30,26 @@ from content_migration.management.errors import (
     DuplicateContactError,
 )
 
+from content_migration.management.csv_reader import iterate_csv_rows
+from content_migration.management.import_magazine_articles_handler import (
+    parse_teaser_from_body,
+)
+from content_migration.management.media_fetcher import MediaFetcher
 from content_migration.management.shared import (
+    AuthorIndex,
     BlockFactory,
     GenericBlock,
     adapt_html_to_generic_blocks,
+    collect_media_urls,
+    convert_html_body,
     construct_import_file_path,
     create_archive_issues_from_articles_dicts,
+    create_document_from_file_bytes,
     create_document_link_block,
     create_group_by,
     create_image_block_from_url,
     create_image_block_from_file_bytes,
+    create_image_from_file_bytes,
     create_media_from_file_bytes,
     create_media_block_from_file_bytes,
     ensure_absolute_url,
@@ -325,7 +339,7 @@ class CreateImageBlockFromFileBytesTestCase(TestCase):
         )
 
 
-class GetExistingContactFromDbTestCase(TestCase):
+class ContactPagesTestCase(TestCase):
     def setUp(self) -> None:
         self.site = Site.objects.get(is_default_site=True)
 
@@ -404,6 +418,22 @@ class GetExistingContactFromDbTestCase(TestCase):
             instance=self.meeting,
         )
 
+    def tearDown(self) -> None:
+        self.person.delete()
+        self.organization.delete()
+        self.meeting.delete()
+
+        self.person_index_page.delete()
+        self.organization_index_page.delete()
+        self.meeting_index_page.delete()
+
+        self.community_page.delete()
+        self.home_page.delete()
+
+        self.root_page.delete()
+
+
+class GetExistingContactFromDbTestCase(ContactPagesTestCase):
     def test_get_existing_person_from_db(self) -> None:
         output_person = get_existing_magazine_author_from_db(
             drupal_author_id=self.person_drupal_author_id,
@@ -466,19 +496,68 @@ class GetExistingContactFromDbTestCase(TestCase):
                 drupal_author_id=input_drupal_author_id,
             )
 
-    def tearDown(self) -> None:
-        self.person.delete()
-        self.organization.delete()
-        self.meeting.delete()
 
-        self.person_index_page.delete()
-        self.organization_index_page.delete()
-        self.meeting_index_page.delete()
+class AuthorIndexTestCase(ContactPagesTestCase):
+    def test_get_each_contact_type(self) -> None:
+        author_index = AuthorIndex()
 
-        self.community_page.delete()
-        self.home_page.delete()
+        self.assertEqual(author_index.get(self.person_drupal_author_id), self.person)
+        self.assertEqual(
+            author_index.get(self.organization_drupal_author_id),
+            self.organization,
+        )
+        self.assertEqual(author_index.get(self.meeting_drupal_author_id), self.meeting)
 
-        self.root_page.delete()
+    def test_get_does_not_query_database(self) -> None:
+        with self.assertNumQueries(3):
+            author_index = AuthorIndex()
+
+        with self.assertNumQueries(0):
+            author_index.get(self.person_drupal_author_id)
+            author_index.get(int(self.meeting_drupal_author_id))
+
+    def test_get_by_duplicate_author_id(self) -> None:
+        self.person.drupal_duplicate_author_ids = [10, 11]
+        self.person.save()
+
+        author_index = AuthorIndex()
+
+        self.assertEqual(author_index.get("10"), self.person)
+        self.assertEqual(author_index.get(11), self.person)
+
+    def test_primary_author_id_takes_precedence_over_duplicate(self) -> None:
+        self.organization.drupal_duplicate_author_ids = [
+            int(self.person_drupal_author_id),
+        ]
+        self.organization.save()
+
+        author_index = AuthorIndex()
+
+        self.assertEqual(author_index.get(self.person_drupal_author_id), self.person)
+
+    def test_not_found_raises_exception(self) -> None:
+        author_index = AuthorIndex()
+
+        with self.assertRaises(CouldNotFindMatchingContactError):
+            author_index.get("4")
+
+    def test_duplicate_raises_exception(self) -> None:
+        meeting_with_duplicate_person_id = Meeting(
+            drupal_author_id=self.person_drupal_author_id,
+            title="Test Meeting",
+        )
+        self.meeting_index_page.add_child(instance=meeting_with_duplicate_person_id)
+
+        author_index = AuthorIndex()
+
+        with self.assertRaises(DuplicateContactError):
+            author_index.get(self.person_drupal_author_id)
+
+    def test_invalid_author_id_raises_exception(self) -> None:
+        author_index = AuthorIndex()
+
+        with self.assertRaises(CouldNotParseAuthorIdError):
+            author_index.get("invalid")
 
 
 class ParseMediaBlocksTestCase(TestCase):
@@ -734,6 +813,66 @@ class AdaptHtmlToGenericBlockTest(SimpleTestCase):
         )
 
 
+class ConvertHtmlBodySimpleTestCase(SimpleTestCase):
+    def test_matches_separate_parses_for_fixture_bodies(self) -> None:
+        for row in iterate_csv_rows(
+            "content_migration/management/test_html_bodies.csv",
+        ):
+            with self.subTest(body=row["body"]):
+                converted = convert_html_body(row["body"])
+
+                self.assertEqual(
+                    converted.blocks,
+                    adapt_html_to_generic_blocks(row["body"]),
+                )
+                self.assertEqual(converted.teaser, parse_teaser_from_body(row["body"]))
+                self.assertEqual(converted.pullquotes, extract_pullquotes(row["body"]))
+                self.assertEqual(
+                    converted.image_urls,
+                    [
+                        ensure_absolute_url(url)
+                        for url in extract_image_urls(row["body"])
+                    ],
+                )
+
+    def test_standalone_pullquote(self) -> None:
+        converted = convert_html_body(
+            """<span class="pullquote">A <em>quote</em></span><p>Text</p>""",
+        )
+
+        self.assertEqual(converted.pullquotes, ["A quote"])
+        self.assertEqual(
+            converted.blocks,
+            [
+                GenericBlock(block_type="pullquote", block_content="A quote"),
+                GenericBlock(
+                    block_type="rich_text",
+                    block_content="A <em>quote</em><p>Text</p>",
+                ),
+            ],
+        )
+
+    def test_none_as_input(self) -> None:
+        converted = convert_html_body(None)  # type: ignore
+
+        self.assertEqual(converted.blocks, [])
+        self.assertEqual(converted.teaser, "")
+
+    @unittest.skipUnless(importlib.util.find_spec("lxml"), "lxml is not installed")
+    def test_lxml_parser(self) -> None:
+        html_string = """<p>Some text <span class="pullquote">a pullquote</span></p><p><img src="/image.jpg" /></p>"""  # noqa: E501
+
+        converted = convert_html_body(html_string, parser="lxml")
+
+        self.assertEqual(converted.teaser, "Some text a pullquote")
+        self.assertEqual(converted.pullquotes, ["a pullquote"])
+        self.assertEqual(converted.image_urls, [f"{ SITE_BASE_URL }image.jpg"])
+        self.assertEqual(
+            [block.block_type for block in converted.blocks],
+            ["pullquote", "rich_text", "image"],
+        )
+
+
 class CreateImageBlockTestCase(TestCase):
     def test_create_image_block(self) -> None:
         # use existing WesternFriend logo URL
@@ -828,6 +967,28 @@ class ConvertRelativeImageUrlToAbsoluteSimpleTestCase(SimpleTestCase):
         )
 
 
+class CollectMediaUrlsSimpleTestCase(SimpleTestCase):
+    def test_collect_media_urls(self) -> None:
+        rows = [
+            {
+                "body": '<p><img src="/files/inline.png"></p><p><img></p>',
+                "media": f"{ WESTERN_FRIEND_LOGO_URL }, https://youtu.be/video",
+            },
+            {
+                "body": "",
+                "media": WESTERN_FRIEND_LOGO_URL,
+            },
+        ]
+
+        self.assertEqual(
+            collect_media_urls(rows),
+            {
+                f"{ SITE_BASE_URL }files/inline.png",
+                WESTERN_FRIEND_LOGO_URL,
+            },
+        )
+
+
 class ParseMediaStringToListSimpleTest(SimpleTestCase):
     def test_parse_media_string_to_list(self) -> None:
         # create a media string with several URLs
@@ -894,6 +1055,66 @@ class CreateMediaFromFileBytesTestCase(TestCase):
 
             self.assertEqual(media_block[0], "media")
 
+    def test_create_media_from_file_bytes_reuses_identical_media(self) -> None:
+        with open("test_data/test.mp3", "rb") as f:
+            file_bytes = f.read()
+
+        first_media = create_media_from_file_bytes(
+            file_name="test.mp3",
+            file_bytes=BytesIO(file_bytes),
+            file_type="audio",
+        )
+        second_media = create_media_from_file_bytes(
+            file_name="test.mp3",
+            file_bytes=BytesIO(file_bytes),
+            file_type="audio",
+        )
+
+        self.assertEqual(first_media, second_media)
+
+
+class CreateFromFileBytesDeduplicationTestCase(TestCase):
+    def create_png_bytes(self, color: str) -> BytesIO:
+        file_bytes = BytesIO()
+        PILImage.new("RGB", (2, 2), color).save(file_bytes, format="PNG")
+        file_bytes.seek(0)
+
+        return file_bytes
+
+    def test_identical_images_are_created_once(self) -> None:
+        first_image = create_image_from_file_bytes(
+            file_name="first.png",
+            file_bytes=self.create_png_bytes("red"),
+        )
+        same_image = create_image_from_file_bytes(
+            file_name="copy.png",
+            file_bytes=self.create_png_bytes("red"),
+        )
+        other_image = create_image_from_file_bytes(
+            file_name="other.png",
+            file_bytes=self.create_png_bytes("blue"),
+        )
+
+        self.assertEqual(same_image, first_image)
+        self.assertNotEqual(other_image, first_image)
+
+    def test_identical_documents_are_created_once(self) -> None:
+        first_document = create_document_from_file_bytes(
+            file_name="first.pdf",
+            file_bytes=BytesIO(b"%PDF-1.4 first"),
+        )
+        same_document = create_document_from_file_bytes(
+            file_name="copy.pdf",
+            file_bytes=BytesIO(b"%PDF-1.4 first"),
+        )
+        other_document = create_document_from_file_bytes(
+            file_name="other.pdf",
+            file_bytes=BytesIO(b"%PDF-1.4 other"),
+        )
+
+        self.assertEqual(same_document, first_document)
+        self.assertNotEqual(other_document, first_document)
+
 
 class GetImageAlignFromStyleSimpleTestCase(SimpleTestCase):
     def test_get_image_align_from_style(self) -> None:
@@ -1022,6 +1243,16 @@ class GetOrCreateBookAuthorTest(TestCase):
 
 
 class GetFileBytesFromUrlTest(SimpleTestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        media_fetcher_patcher = patch(
+            "content_migration.management.shared.get_media_fetcher",
+            return_value=MediaFetcher(cache_directory=self.directory.name),
+        )
+        media_fetcher_patcher.start()
+        self.addCleanup(media_fetcher_patcher.stop)
+        self.addCleanup(self.directory.cleanup)
+
     def test_success(self) -> None:
         result = get_file_bytes_from_url(WESTERN_FRIEND_LOGO_URL)
 
@@ -1031,7 +1262,7 @@ class GetFileBytesFromUrlTest(SimpleTestCase):
         self.assertIsInstance(result, BytesIO)
         self.assertEqual(result.getvalue(), expected_result.getvalue())
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_missing_schema(
         self,
         mock_get: Mock,
@@ -1041,7 +1272,7 @@ class GetFileBytesFromUrlTest(SimpleTestCase):
         with self.assertRaises(MissingSchema):
             get_file_bytes_from_url("invalid_url")
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_invalid_schema(
         self,
         mock_get: Mock,
@@ -1051,7 +1282,7 @@ class GetFileBytesFromUrlTest(SimpleTestCase):
         with self.assertRaises(InvalidSchema):
             get_file_bytes_from_url("invalid_url")
 
-    @patch("requests.get")
+    @patch("requests.Session.get")
     def test_request_exception(
         self,
         mock_get: Mock,
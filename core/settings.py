@@ -111,6 +111,7 @@ STATIC_ROOT = os.path.join(BASE_DIR, "static_root")
 AUTH_USER_MODEL = "accounts.User"
 
 CART_SESSION_ID = "cart"
+CART_COUNTS_SESSION_ID = "cart_counts"
 
 # Braintree settings
 BRAINTREE_MERCHANT_ID = os.getenv("BRAINTREE_MERCHANT_ID")
@@ -124,6 +125,15 @@ BraintreeConfiguration.configure(
     BRAINTREE_PRIVATE_KEY,
 )
 
+# Management commands run by the `run_scheduled_commands` process,
+# with the seconds between their runs
+SCHEDULED_COMMANDS = [
+    # Magazine issues become public as they age past the archive threshold
+    ("update_magazine_access_tiers", 60 * 60),
+    # Processed Braintree webhook notifications are kept for a while
+    ("prune_webhook_notifications", 60 * 60 * 24),
+]
+
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/2.1/howto/deployment/checklist/
 
@@ -204,10 +214,12 @@ MIDDLEWARE = [
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "subscription.middleware.SubscriberMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
+    "common.middleware.PageResponseCacheMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django.middleware.security.SecurityMiddleware",
-    "wagtail.contrib.redirects.middleware.RedirectMiddleware",
+    "common.middleware.RedirectMapMiddleware",
 ]
 
 if DEBUG:
@@ -229,6 +241,7 @@ TEMPLATES = [
                 "django.contrib.auth.context_processors.auth",
                 "django.contrib.messages.context_processors.messages",
                 "wagtail.contrib.settings.context_processors.settings",
+                "cart.context_processors.cart_counts",
             ],
         },
     },
@@ -262,6 +275,41 @@ else:
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
+# Cache in Redis, so every web process shares the cached pages and their
+# invalidations, and cache hits don't query the database.
+REDIS_URL = os.getenv("REDIS_URL")
+
+# Without Redis, cache in the database, in a table created by a migration
+# of the common app. Each cache read or write then queries the table, and
+# writes count its rows, culling some once there are more than MAX_ENTRIES,
+# so it is large enough to hold the cached pages and their generations.
+DATABASE_CACHE_MAX_ENTRIES = 100_000
+
+# Tests use a local memory cache.
+if len(sys.argv) > 1 and sys.argv[1] == "test":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+elif REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.db.DatabaseCache",
+            "LOCATION": "django_cache",
+            "OPTIONS": {
+                "MAX_ENTRIES": DATABASE_CACHE_MAX_ENTRIES,
+            },
+        },
+    }
+
 WAGTAILSEARCH_BACKENDS = {
     "default": {
         "BACKEND": "wagtail.search.backends.database",
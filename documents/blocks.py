@@ -1,6 +1,11 @@
 from wagtail.documents.blocks import DocumentChooserBlock
 
+from common.body_cache import CachedRenderMixin
 
-class DocumentEmbedBlock(DocumentChooserBlock):
+
+class DocumentEmbedBlock(CachedRenderMixin, DocumentChooserBlock):
     class Meta:
         template = "documents/blocks/document.html"
+
+    def get_render_dependencies(self, value):
+        return [value]
@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class LibraryConfig(AppConfig):
     name = "library"
+
+    def ready(self) -> None:
+        from .signals import connect_library_facet_signals
+
+        connect_library_facet_signals()
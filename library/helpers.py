@@ -1,29 +1,43 @@
-QUERYSTRING_FACETS = [
-    "item_audience",
-    "item_genre",
-    "item_medium",
-    "item_time_period",
-    "topics",
-    "authors",
-]
+from urllib.parse import urlencode
+
+from django.db import models
+from django.http import QueryDict
+
+
+class LibraryFacetChoices(models.TextChoices):
+    AUDIENCE = "audience", "Audience"
+    GENRE = "genre", "Genre"
+    MEDIUM = "medium", "Medium"
+    TIME_PERIOD = "time_period", "Time period"
+    TOPIC = "topic", "Topic"
+    AUTHOR = "author", "Author"
+
+
+QUERYSTRING_FACETS = LibraryFacetChoices.values
 
 
 def filter_querystring_facets(
-    query: dict,
-) -> dict:
-    """Filter querystring facets to only include those that are valid."""
+    query: QueryDict,
+) -> dict[str, list[int]]:
+    """Get the selected facet page IDs from the querystring.
+
+    Each facet can be selected several times, e.g. `?genre=1&genre=2`.
+    Unknown keys and values that aren't IDs are ignored.
+    """
     facets = {}
-    for key, value in query.items():
-        if key in QUERYSTRING_FACETS:
-            facets[key] = value
+
+    for key in QUERYSTRING_FACETS:
+        facet_ids = [int(value) for value in query.getlist(key) if value.isdigit()]
+
+        if facet_ids:
+            facets[key] = facet_ids
+
     return facets
 
 
 def create_querystring_from_facets(
     facets: dict,
 ) -> str:
-    """Create a querystring from facets."""
+    """Create a querystring from facets, repeating keys with several values."""
 
-    # Join facets into a querystring
-    # placing an ampersand between each key/value pair
-    return "&".join(f"{key}={value}" for key, value in facets.items())
+    return urlencode(facets, doseq=True)
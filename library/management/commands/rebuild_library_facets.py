@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from library.models import LibraryItem, LibraryItemFacet, update_library_item_facets
+
+
+class Command(BaseCommand):
+    help = "Rebuild the facet table used by the library faceted search"
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        library_items = LibraryItem.objects.live().prefetch_related(
+            "topics",
+            "authors",
+        )
+
+        with transaction.atomic():
+            # Remove rows of items that are no longer live
+            LibraryItemFacet.objects.exclude(
+                library_item__in=library_items,
+            ).delete()
+
+            for library_item in library_items:
+                update_library_item_facets(library_item)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt facets for {library_items.count()} library items",
+            ),
+        )
@@ -0,0 +1,73 @@
+# Generated by Django 4.2.4 on 2026-10-18 07:14
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("wagtailcore", "0089_log_entry_data_json_null_to_object"),
+        ("library", "0020_alter_libraryitem_body"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="LibraryItemFacet",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "facet_type",
+                    models.CharField(
+                        choices=[
+                            ("audience", "Audience"),
+                            ("genre", "Genre"),
+                            ("medium", "Medium"),
+                            ("time_period", "Time period"),
+                            ("topic", "Topic"),
+                            ("author", "Author"),
+                        ],
+                        max_length=32,
+                    ),
+                ),
+                (
+                    "facet",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="wagtailcore.page",
+                    ),
+                ),
+                (
+                    "library_item",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="facet_values",
+                        to="library.libraryitem",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["facet_type", "facet"],
+                        name="library_lib_facet_t_fd981e_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="libraryitemfacet",
+            constraint=models.UniqueConstraint(
+                fields=("library_item", "facet_type", "facet"),
+                name="unique_library_item_facet",
+            ),
+        ),
+    ]
@@ -1,4 +1,13 @@
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import (
+    Count,
+    Exists,
+    OuterRef,
+    Q,
+    QuerySet,
+    prefetch_related_objects,
+)
 from django.http import HttpRequest
 from django_flatpickr.widgets import DatePickerInput
 from modelcluster.contrib.taggit import ClusterTaggableManager  # type: ignore
@@ -26,11 +35,20 @@ from blocks.blocks import (
 )
 from common.models import DrupalFields
 from documents.blocks import DocumentEmbedBlock
-from facets.models import Audience, Genre, Medium, TimePeriod, Topic
-from library.helpers import create_querystring_from_facets, filter_querystring_facets
+from library.helpers import (
+    LibraryFacetChoices,
+    create_querystring_from_facets,
+    filter_querystring_facets,
+)
 from pagination.helpers import get_paginated_items
 
 
+# Facet option lists change when items are published or unpublished,
+# which invalidates them, so the timeout only bounds staleness from renames
+LIBRARY_FACET_OPTIONS_CACHE_KEY = "library_facet_options"
+LIBRARY_FACET_OPTIONS_CACHE_TIMEOUT = 60 * 60
+
+
 class LibraryItemTag(TaggedItemBase):
     content_object = ParentalKey(
         to="LibraryItem",
@@ -172,6 +190,220 @@ class LibraryItem(DrupalFields, Page):  # type: ignore
     parent_page_types = ["LibraryIndexPage"]
     subpage_types: list[str] = []
 
+    search_template = "search/library_item.html"
+
+    @classmethod
+    def prefetch_search_results(cls, library_items: list["LibraryItem"]) -> None:
+        """Load the authors and facets of items shown in search results."""
+        prefetch_related_objects(
+            library_items,
+            "authors__author",
+            "item_genre",
+            "item_medium",
+            "topics__topic",
+        )
+
+    def get_listing_page_ids(self) -> set[int]:
+        """Get the IDs of the facet and author pages that list this item,
+        whose cached responses change with it."""
+        return {facet_id for _, facet_id in self.get_facet_values()}
+
+    def get_facet_values(self) -> set[tuple[str, int]]:
+        """Get the (facet type, facet page ID) pairs of this item."""
+        facet_values = {
+            (facet_type, facet_id)
+            for facet_type, facet_id in [
+                (LibraryFacetChoices.AUDIENCE, self.item_audience_id),  # type: ignore
+                (LibraryFacetChoices.GENRE, self.item_genre_id),  # type: ignore
+                (LibraryFacetChoices.MEDIUM, self.item_medium_id),  # type: ignore
+                (
+                    LibraryFacetChoices.TIME_PERIOD,
+                    self.item_time_period_id,  # type: ignore
+                ),
+            ]
+            if facet_id is not None
+        }
+
+        facet_values.update(
+            (LibraryFacetChoices.TOPIC, item_topic.topic_id)
+            for item_topic in self.topics.all()
+            if item_topic.topic_id is not None
+        )
+        facet_values.update(
+            (LibraryFacetChoices.AUTHOR, item_author.author_id)
+            for item_author in self.authors.all()
+            if item_author.author_id is not None
+        )
+
+        return facet_values
+
+
+class LibraryItemFacet(models.Model):
+    """A facet value of a live library item.
+
+    Denormalizes the facet fields, topics and authors of live library items
+    into one indexed table, so faceted search can filter and count items
+    without joining each facet relation.
+    """
+
+    library_item = models.ForeignKey(
+        "library.LibraryItem",
+        on_delete=models.CASCADE,
+        related_name="facet_values",
+    )
+    facet_type = models.CharField(
+        max_length=32,
+        choices=LibraryFacetChoices.choices,
+    )
+    facet = models.ForeignKey(
+        "wagtailcore.Page",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["library_item", "facet_type", "facet"],
+                name="unique_library_item_facet",
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["facet_type", "facet"]),
+        ]
+
+
+def update_library_item_facets(library_item: LibraryItem) -> None:
+    """Replace the facet values of a library item.
+
+    Only live items have facet values, so unpublished items drop out of
+    faceted search.
+    """
+    with transaction.atomic():
+        LibraryItemFacet.objects.filter(library_item=library_item).delete()
+
+        if library_item.live:
+            LibraryItemFacet.objects.bulk_create(
+                [
+                    LibraryItemFacet(
+                        library_item=library_item,
+                        facet_type=facet_type,
+                        facet_id=facet_id,
+                    )
+                    for facet_type, facet_id in library_item.get_facet_values()
+                ],
+            )
+
+    invalidate_library_facet_options()
+
+
+def invalidate_library_facet_options() -> None:
+    cache.delete(LIBRARY_FACET_OPTIONS_CACHE_KEY)
+    transaction.on_commit(lambda: cache.delete(LIBRARY_FACET_OPTIONS_CACHE_KEY))
+
+
+def get_library_facet_options() -> dict[str, list[dict]]:
+    """Get the facet values that have live items, by facet type.
+
+    The option lists are cached, since they only change when library items
+    are published or unpublished.
+    """
+    facet_options = cache.get(LIBRARY_FACET_OPTIONS_CACHE_KEY)
+
+    if facet_options is None:
+        facet_options = {facet_type: [] for facet_type in LibraryFacetChoices.values}
+
+        for facet_value in (
+            LibraryItemFacet.objects.values("facet_type", "facet_id", "facet__title")
+            .distinct()
+            .order_by("facet_type", "facet__title", "facet_id")
+        ):
+            facet_options[facet_value["facet_type"]].append(
+                {
+                    "id": facet_value["facet_id"],
+                    "title": facet_value["facet__title"],
+                },
+            )
+
+        cache.set(
+            LIBRARY_FACET_OPTIONS_CACHE_KEY,
+            facet_options,
+            LIBRARY_FACET_OPTIONS_CACHE_TIMEOUT,
+        )
+
+    return facet_options
+
+
+def get_library_items_with_facets(
+    facets: dict[str, list[int]],
+    title_query: str = "",
+) -> QuerySet[LibraryItem]:
+    """Filter live library items by the selected facet values.
+
+    Items match any of the selected values of a facet type,
+    and all of the facet types with selections.
+    """
+    library_items = LibraryItem.objects.live()
+
+    if title_query:
+        library_items = library_items.filter(title__icontains=title_query)
+
+    for facet_type, facet_ids in facets.items():
+        library_items = library_items.filter(
+            id__in=LibraryItemFacet.objects.filter(
+                facet_type=facet_type,
+                facet_id__in=facet_ids,
+            ).values("library_item_id"),
+        )
+
+    return library_items
+
+
+def get_library_facet_counts(
+    facets: dict[str, list[int]],
+    title_query: str = "",
+) -> dict[str, dict[int, int]]:
+    """Count the live items of each facet value in a single query.
+
+    The counts of a facet type apply the selections of the other facet types,
+    but not its own, so each count is the number of items that selecting
+    that value would add.
+    """
+    facet_values = LibraryItemFacet.objects.all()
+
+    if title_query:
+        facet_values = facet_values.filter(
+            library_item__title__icontains=title_query,
+        )
+
+    for facet_type, facet_ids in facets.items():
+        item_has_selected_value = Exists(
+            LibraryItemFacet.objects.filter(
+                library_item_id=OuterRef("library_item_id"),
+                facet_type=facet_type,
+                facet_id__in=facet_ids,
+            ),
+        )
+
+        facet_values = facet_values.filter(
+            Q(facet_type=facet_type) | item_has_selected_value,
+        )
+
+    facet_counts: dict[str, dict[int, int]] = {
+        facet_type: {} for facet_type in LibraryFacetChoices.values
+    }
+
+    for facet_value in (
+        facet_values.values("facet_type", "facet_id")
+        .annotate(count=Count("id"))
+        .order_by()
+    ):
+        facet_counts[facet_value["facet_type"]][facet_value["facet_id"]] = facet_value[
+            "count"
+        ]
+
+    return facet_counts
+
 
 class LibraryItemAuthor(Orderable):
     library_item = ParentalKey(
@@ -241,42 +473,49 @@ class LibraryIndexPage(Page):
     ) -> dict:
         context = super().get_context(request)
 
-        # Prepare a list of authors
-        library_item_authors = LibraryItemAuthor.objects.all()
-        authors = Page.objects.filter(
-            library_items_authored__in=library_item_authors,
-        ).distinct()
+        facets = filter_querystring_facets(
+            query=request.GET,
+        )
+        title_query = request.GET.get("title", "")
 
-        # Populate faceted search fields
-        context["audiences"] = Audience.objects.all()
-        context["genres"] = Genre.objects.all()
-        context["mediums"] = Medium.objects.all()
-        context["time_periods"] = TimePeriod.objects.all()
-        context["topics"] = Topic.objects.all()
-        context["authors"] = authors
+        facet_options = get_library_facet_options()
+        facet_counts = get_library_facet_counts(facets, title_query)
 
-        query = request.GET.dict()
+        # Combine the cached options with the counts for the current selection
+        context["facets"] = [
+            {
+                "name": facet_type,
+                "label": facet_label,
+                "options": [
+                    {
+                        **facet_option,
+                        "count": facet_counts[facet_type].get(facet_option["id"], 0),
+                        "selected": facet_option["id"] in facets.get(facet_type, []),
+                    }
+                    for facet_option in facet_options[facet_type]
+                ],
+            }
+            for facet_type, facet_label in LibraryFacetChoices.choices
+        ]
 
-        facets = filter_querystring_facets(
-            query=query,
-        )
+        library_items = get_library_items_with_facets(facets, title_query)
 
-        # Filter live (not draft) library items using facets from request
-        library_items = LibraryItem.objects.live().filter(
-            **facets,
-        )
         page_number = request.GET.get("page", "1")
         items_per_page = 10
 
-        # Provide filtered, paginated library items
+        # Provide filtered, paginated library items,
+        # seeking by tree path so deep pages don't scan skipped items
         context["paginated_items"] = get_paginated_items(
             items=library_items,
             items_per_page=items_per_page,
             page_number=page_number,
+            ordering=["path"],
+            cursor=request.GET.get("cursor"),
         )
 
+        context["title_query"] = title_query
         context["current_querystring"] = create_querystring_from_facets(
-            facets=facets,
+            facets={**facets, "title": title_query} if title_query else facets,
         )
 
         return context
@@ -0,0 +1,44 @@
+"""Keep the library facet table in step with published library items."""
+from typing import Any
+
+from django.db.models.signals import post_delete
+from wagtail.models import Page
+from wagtail.signals import page_published, page_unpublished
+
+from facets.models import Audience, Genre, Medium, TimePeriod, Topic
+
+from .models import (
+    LibraryItem,
+    invalidate_library_facet_options,
+    update_library_item_facets,
+)
+
+FACET_PAGE_MODELS: list[type[Page]] = [Audience, Genre, Medium, TimePeriod, Topic]
+
+
+def update_facets_of_library_item(
+    sender: type[LibraryItem],
+    instance: LibraryItem,
+    **kwargs: Any,
+) -> None:
+    update_library_item_facets(instance)
+
+
+def invalidate_facet_options(
+    sender: type[Page],
+    instance: Page,
+    **kwargs: Any,
+) -> None:
+    invalidate_library_facet_options()
+
+
+def connect_library_facet_signals() -> None:
+    page_published.connect(update_facets_of_library_item, sender=LibraryItem)
+    page_unpublished.connect(update_facets_of_library_item, sender=LibraryItem)
+
+    # Facet rows are removed with the item, but the options may lose a value
+    post_delete.connect(invalidate_facet_options, sender=LibraryItem)
+
+    # Renamed facet values change the option titles
+    for facet_page_model in FACET_PAGE_MODELS:
+        page_published.connect(invalidate_facet_options, sender=facet_page_model)
@@ -1,5 +1,9 @@
 import random
+from io import StringIO
 from unittest.mock import Mock, patch
+from django.core.cache import cache
+from django.core.management import call_command
+from django.http import QueryDict
 from django.test import RequestFactory, SimpleTestCase, TestCase
 from facets.factories import (
     AudienceFactory,
@@ -10,7 +14,18 @@ from facets.factories import (
 )
 from home.models import HomePage
 
-from library.models import LibraryIndexPage
+from contact.factories import PersonFactory
+from library.models import (
+    LibraryIndexPage,
+    LibraryItem,
+    LibraryItemAuthor,
+    LibraryItemFacet,
+    LibraryItemTopic,
+    get_library_facet_counts,
+    get_library_facet_options,
+    get_library_items_with_facets,
+    update_library_item_facets,
+)
 
 from .factories import (
     LibraryIndexPageFactory,
@@ -48,18 +63,24 @@ class TestCreateQuerystringFromFacets(SimpleTestCase):
         result_dict = dict(item.split("=") for item in result.split("&"))
         self.assertDictEqual(result_dict, facets)
 
+    def test_multiple_values(self) -> None:
+        """Test that a facet with several values repeats its key."""
+        facets = {"genre": [1, 2], "title": "Faith & practice"}
+        result = create_querystring_from_facets(facets)
+        self.assertEqual(result, "genre=1&genre=2&title=Faith+%26+practice")
+
 
 class TestFilterQuerystringFacets(SimpleTestCase):
     def test_empty_query(self) -> None:
         """Test that an empty query returns an empty dictionary."""
-        query: dict = {}
+        query = QueryDict()
         result = filter_querystring_facets(query)
         self.assertEqual(result, {})
 
     def test_query_with_no_valid_facets(self) -> None:
         """Test that a query with no valid facets returns an empty
         dictionary."""
-        query = {"invalid1": "value1", "invalid2": "value2"}
+        query = QueryDict("invalid1=1&invalid2=2")
         result = filter_querystring_facets(query)
         self.assertEqual(result, {})
 
@@ -67,17 +88,23 @@ class TestFilterQuerystringFacets(SimpleTestCase):
         """Test that a query with some valid facets returns a dictionary with
         only the valid facets."""
         valid_key = random.choice(QUERYSTRING_FACETS)
-        query = {valid_key: "value1", "invalid": "value2"}
+        query = QueryDict(f"{valid_key}=1&invalid=2")
         result = filter_querystring_facets(query)
-        expected_result = {valid_key: "value1"}
+        expected_result = {valid_key: [1]}
         self.assertDictEqual(result, expected_result)
 
     def test_query_with_all_valid_facets(self) -> None:
-        """Test that a query with all valid facets returns the same
-        dictionary."""
-        query = {key: "value" for key in QUERYSTRING_FACETS}
+        """Test that a query with all valid facets returns all of them."""
+        query = QueryDict("&".join(f"{key}=1" for key in QUERYSTRING_FACETS))
         result = filter_querystring_facets(query)
-        self.assertDictEqual(result, query)
+        self.assertDictEqual(result, {key: [1] for key in QUERYSTRING_FACETS})
+
+    def test_query_with_multiple_values(self) -> None:
+        """Test that every value of a facet is returned and values that aren't
+        IDs are ignored."""
+        query = QueryDict("genre=1&genre=2&genre=invalid&topic=")
+        result = filter_querystring_facets(query)
+        self.assertDictEqual(result, {"genre": [1, 2]})
 
 
 class TestLibraryIndexPageFactory(TestCase):
@@ -119,18 +146,183 @@ class TestLibraryIndexPage(TestCase):
         TimePeriodFactory.create_batch(5)
         TopicFactory.create_batch(5)
 
+        mock_filter_querystring.return_value = {}
+
         request = self.factory.get("/")
         context = self.library_index_page.get_context(request)
 
-        self.assertIn("audiences", context)
-        self.assertIn("genres", context)
-        self.assertIn("mediums", context)
-        self.assertIn("time_periods", context)
-        self.assertIn("topics", context)
-        self.assertIn("authors", context)
+        self.assertIn("facets", context)
         self.assertIn("paginated_items", context)
         self.assertIn("current_querystring", context)
 
-        mock_filter_querystring.assert_called_once_with(query=request.GET.dict())
+        mock_filter_querystring.assert_called_once_with(query=request.GET)
         mock_get_paginated_items.assert_called_once()
         mock_create_querystring.assert_called_once()
+
+
+class LibraryFacetedSearchTestCase(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+        self.library_index_page = LibraryIndexPageFactory.create()
+        self.factory = RequestFactory()
+
+        self.genre_one, self.genre_two = GenreFactory.create_batch(2)
+        self.audience = AudienceFactory.create()
+        self.topic = TopicFactory.create()
+        self.author = PersonFactory.create()
+
+        self.item_one = self.create_library_item(
+            "Item one",
+            item_genre=self.genre_one,
+            item_audience=self.audience,
+        )
+        self.item_two = self.create_library_item(
+            "Item two",
+            item_genre=self.genre_two,
+            item_audience=self.audience,
+        )
+        self.item_three = self.create_library_item(
+            "Item three",
+            item_genre=self.genre_two,
+        )
+
+        LibraryItemTopic.objects.create(
+            library_item=self.item_one,
+            topic=self.topic,
+        )
+        LibraryItemAuthor.objects.create(
+            library_item=self.item_three,
+            author=self.author,
+        )
+
+        for library_item in [self.item_one, self.item_two, self.item_three]:
+            library_item.save_revision().publish()
+
+    def create_library_item(self, title: str, **kwargs: object) -> LibraryItem:
+        return LibraryItemFactory.create(title=title, **kwargs)
+
+    def test_publish_updates_facet_values(self) -> None:
+        self.assertEqual(
+            set(
+                LibraryItemFacet.objects.filter(
+                    library_item=self.item_one,
+                ).values_list("facet_type", "facet_id"),
+            ),
+            {
+                ("genre", self.genre_one.id),
+                ("audience", self.audience.id),
+                ("topic", self.topic.id),
+            },
+        )
+        self.assertEqual(
+            set(
+                LibraryItemFacet.objects.filter(
+                    library_item=self.item_three,
+                ).values_list("facet_type", "facet_id"),
+            ),
+            {
+                ("genre", self.genre_two.id),
+                ("author", self.author.id),
+            },
+        )
+
+    def test_unpublish_removes_facet_values(self) -> None:
+        self.item_one.unpublish()
+
+        self.assertFalse(
+            LibraryItemFacet.objects.filter(library_item=self.item_one).exists(),
+        )
+        self.assertNotIn(
+            self.topic.id,
+            [option["id"] for option in get_library_facet_options()["topic"]],
+        )
+
+    def test_get_library_items_with_facets(self) -> None:
+        # Values of the same facet match any, facets match all
+        self.assertQuerySetEqual(
+            get_library_items_with_facets(
+                {"genre": [self.genre_one.id, self.genre_two.id]},
+            ).order_by("title"),
+            [self.item_one, self.item_three, self.item_two],
+        )
+        self.assertQuerySetEqual(
+            get_library_items_with_facets(
+                {
+                    "genre": [self.genre_one.id, self.genre_two.id],
+                    "audience": [self.audience.id],
+                },
+            ).order_by("title"),
+            [self.item_one, self.item_two],
+        )
+        self.assertQuerySetEqual(
+            get_library_items_with_facets({}, title_query="three"),
+            [self.item_three],
+        )
+
+    def test_get_library_facet_counts(self) -> None:
+        with self.assertNumQueries(1):
+            facet_counts = get_library_facet_counts(
+                {"genre": [self.genre_one.id], "audience": [self.audience.id]},
+            )
+
+        # Genre counts ignore the genre selection but apply the audience
+        self.assertEqual(
+            facet_counts["genre"],
+            {self.genre_one.id: 1, self.genre_two.id: 1},
+        )
+        # Audience counts apply the genre selection
+        self.assertEqual(facet_counts["audience"], {self.audience.id: 1})
+        self.assertEqual(facet_counts["topic"], {self.topic.id: 1})
+        self.assertEqual(facet_counts["author"], {})
+
+    def test_get_library_facet_options_is_cached(self) -> None:
+        facet_options = get_library_facet_options()
+
+        self.assertEqual(
+            facet_options["genre"],
+            [
+                {"id": self.genre_one.id, "title": self.genre_one.title},
+                {"id": self.genre_two.id, "title": self.genre_two.title},
+            ],
+        )
+
+        with self.assertNumQueries(0):
+            get_library_facet_options()
+
+    def test_get_context(self) -> None:
+        request = self.factory.get(
+            "/",
+            {"genre": [self.genre_one.id, self.genre_two.id], "title": "Item"},
+        )
+
+        context = self.library_index_page.get_context(request)
+
+        genre_facet = next(
+            facet for facet in context["facets"] if facet["name"] == "genre"
+        )
+        self.assertEqual(
+            [option["selected"] for option in genre_facet["options"]],
+            [True, True],
+        )
+        self.assertEqual(context["paginated_items"].page.paginator.count, 3)
+        self.assertEqual(
+            context["current_querystring"],
+            f"genre={self.genre_one.id}&genre={self.genre_two.id}&title=Item",
+        )
+
+    def test_rebuild_library_facets_command(self) -> None:
+        LibraryItemFacet.objects.all().delete()
+
+        call_command("rebuild_library_facets", stdout=StringIO())
+
+        self.assertEqual(LibraryItemFacet.objects.count(), 7)
+
+    def test_update_library_item_facets_without_live_item(self) -> None:
+        self.item_two.live = False
+
+        update_library_item_facets(self.item_two)
+
+        self.assertFalse(
+            LibraryItemFacet.objects.filter(library_item=self.item_two).exists(),
+        )
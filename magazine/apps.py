@@ -3,3 +3,8 @@ from django.apps import AppConfig
 
 class MagazineConfig(AppConfig):
     name = "magazine"
+
+    def ready(self) -> None:
+        from .signals import connect_archive_issue_signals
+
+        connect_archive_issue_signals()
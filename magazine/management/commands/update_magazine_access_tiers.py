@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from common.page_cache import invalidate_page_responses
+from magazine.models import MagazineIndexPage, update_access_tiers
+
+
+class Command(BaseCommand):
+    help = (
+        "Make magazine issues and articles public as they age past the "
+        "archive threshold. Run hourly by run_scheduled_commands"
+    )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        updated_page_ids = update_access_tiers()
+
+        if updated_page_ids:
+            # The magazine index lists recent and archive issues separately
+            invalidate_page_responses(
+                updated_page_ids.union(
+                    MagazineIndexPage.objects.values_list("id", flat=True),
+                ),
+            )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Updated the access tier of {len(updated_page_ids)} pages",
+            ),
+        )
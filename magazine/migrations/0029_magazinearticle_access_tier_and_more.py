@@ -0,0 +1,71 @@
+# Generated by Django 4.2.4 on 2026-10-18 07:57
+
+import datetime
+
+from django.db import migrations, models
+from django.db.models.functions import Length, Substr
+
+# The archive threshold when this migration was written
+ARCHIVE_THRESHOLD_DAYS = 180
+
+
+def set_access_tiers(apps, schema_editor):  # type: ignore
+    MagazineIssue = apps.get_model("magazine", "MagazineIssue")
+    MagazineArticle = apps.get_model("magazine", "MagazineArticle")
+
+    MagazineIssue.objects.filter(
+        publication_date__lt=datetime.date.today()
+        - datetime.timedelta(days=ARCHIVE_THRESHOLD_DAYS),
+    ).update(access_tier="public")
+
+    # Articles take the tier of the issue at their parent path,
+    # which is their path without its last four character step
+    MagazineArticle.objects.annotate(
+        issue_path=Substr("path", 1, Length("path") - 4),
+    ).filter(
+        issue_path__in=MagazineIssue.objects.filter(
+            access_tier="public",
+        ).values("path"),
+    ).update(
+        access_tier="public"
+    )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("magazine", "0028_alter_magazineissue_publication_date"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="magazinearticle",
+            name="access_tier",
+            field=models.CharField(
+                choices=[
+                    ("subscribers", "Subscribers only"),
+                    ("public", "Public access"),
+                ],
+                db_index=True,
+                default="subscribers",
+                editable=False,
+                help_text="Copied from the parent issue, so public articles can be filtered without joining their issues",
+                max_length=255,
+            ),
+        ),
+        migrations.AddField(
+            model_name="magazineissue",
+            name="access_tier",
+            field=models.CharField(
+                choices=[
+                    ("subscribers", "Subscribers only"),
+                    ("public", "Public access"),
+                ],
+                db_index=True,
+                default="subscribers",
+                editable=False,
+                help_text="Set from the publication date when saved, and updated by the update_magazine_access_tiers command as issues age past the archive threshold",
+                max_length=255,
+            ),
+        ),
+        migrations.RunPython(set_access_tiers, migrations.RunPython.noop),
+    ]
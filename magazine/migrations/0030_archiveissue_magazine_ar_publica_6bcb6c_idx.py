@@ -0,0 +1,18 @@
+# Generated by Django 4.2.4 on 2026-10-18 08:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("magazine", "0029_magazinearticle_access_tier_and_more"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="archiveissue",
+            index=models.Index(
+                fields=["publication_date"], name="magazine_ar_publica_6bcb6c_idx"
+            ),
+        ),
+    ]
@@ -1,10 +1,24 @@
 import datetime
 from datetime import timedelta
+from itertools import groupby
+from operator import attrgetter, itemgetter
+from typing import Any
 
+from django.core.cache import cache
 from django.core.paginator import Paginator
-from django.db import models
-from django.db.models import QuerySet
+from django.db import models, transaction
+from django.db.models import (
+    Count,
+    F,
+    OuterRef,
+    Prefetch,
+    QuerySet,
+    Subquery,
+    prefetch_related_objects,
+)
+from django.db.models.functions import ExtractYear, Length, Substr
 from django.http import HttpRequest
+from django.utils.functional import cached_property
 from django_flatpickr.widgets import DatePickerInput
 from modelcluster.contrib.taggit import ClusterTaggableManager  # type: ignore
 from modelcluster.fields import ParentalKey  # type: ignore
@@ -36,9 +50,54 @@ from pagination.helpers import get_paginated_items
 from .panels import NestedInlinePanel
 
 MAGAZINE_ARCHIVE_THRESHOLD_DAYS = 180
-ARCHIVE_THRESHOLD_DATE = datetime.date.today() - timedelta(
-    days=MAGAZINE_ARCHIVE_THRESHOLD_DAYS,
-)
+
+# Renditions of issue covers shown on the issue, its cards, the home page
+# and as admin thumbnails
+MAGAZINE_ISSUE_COVER_IMAGE_FILTER_SPECS = [
+    "width-480",
+    "max-286x300",
+    "max-800x600",
+    "height-333",
+]
+
+# Archive issue changes invalidate the cached counts,
+# so the timeout only bounds staleness from bulk updates
+ARCHIVE_ISSUE_YEAR_COUNTS_CACHE_KEY = "deep_archive_issue_year_counts"
+ARCHIVE_ISSUE_YEAR_COUNTS_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Article changes invalidate the cached table of contents,
+# so the timeout only bounds staleness from author page changes
+TABLE_OF_CONTENTS_CACHE_TIMEOUT = 60 * 60
+
+
+def get_table_of_contents_cache_key(issue_path: str) -> str:
+    return f"magazine_issue_table_of_contents:{issue_path}"
+
+
+def get_archive_threshold_date() -> datetime.date:
+    """Get the date before which issues are public access.
+
+    The date is computed on every call, so long running processes don't
+    keep using the date they were started on.
+    """
+    return datetime.date.today() - timedelta(days=MAGAZINE_ARCHIVE_THRESHOLD_DAYS)
+
+
+class MagazineAccessTierChoices(models.TextChoices):
+    SUBSCRIBERS = "subscribers", "Subscribers only"
+    PUBLIC = "public", "Public access"
+
+
+def get_access_tier(publication_date: datetime.date | None) -> str:
+    """Get the access tier of an issue published on a date."""
+    # Imported issues may have a publication datetime
+    if isinstance(publication_date, datetime.datetime):
+        publication_date = publication_date.date()
+
+    if publication_date is not None and publication_date < get_archive_threshold_date():
+        return MagazineAccessTierChoices.PUBLIC
+
+    return MagazineAccessTierChoices.SUBSCRIBERS
 
 
 class MagazineIndexPage(Page):
@@ -93,11 +152,11 @@ class MagazineIndexPage(Page):
 
         # recent issues are published after the archive threshold
         context["recent_issues"] = published_issues.filter(
-            publication_date__gte=ARCHIVE_THRESHOLD_DATE,
+            access_tier=MagazineAccessTierChoices.SUBSCRIBERS,
         )
 
         archive_issues = published_issues.filter(
-            publication_date__lt=ARCHIVE_THRESHOLD_DATE,
+            access_tier=MagazineAccessTierChoices.PUBLIC,
         )
 
         # Show three archive issues per page
@@ -137,6 +196,14 @@ class MagazineIssue(DrupalFields, Page):  # type: ignore
     )
     issue_number = models.PositiveIntegerField(null=True, blank=True)
     drupal_node_id = models.PositiveIntegerField(null=True, blank=True, db_index=True)
+    access_tier = models.CharField(
+        max_length=255,
+        choices=MagazineAccessTierChoices.choices,
+        default=MagazineAccessTierChoices.SUBSCRIBERS,
+        editable=False,
+        db_index=True,
+        help_text="Set from the publication date when saved, and updated by the update_magazine_access_tiers command as issues age past the archive threshold",  # noqa: E501
+    )
 
     @property
     def featured_articles(self) -> QuerySet["MagazineArticle"]:
@@ -169,10 +236,113 @@ class MagazineIssue(DrupalFields, Page):  # type: ignore
     @property
     def is_public_access(self) -> bool:
         """Check whether issue should be accessible to all readers or only
-        subscribers based on publication date and archive threshold."""
+        subscribers based on its access tier."""
+        return self.access_tier == MagazineAccessTierChoices.PUBLIC
+
+    def get_image_filter_specs(self) -> list[tuple[int | None, list[str]]]:
+        """Get the renditions of the cover image, generated in the
+        background."""
+        return [(self.cover_image_id, MAGAZINE_ISSUE_COVER_IMAGE_FILTER_SPECS)]
+
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        update_fields = kwargs.get("update_fields")
+
+        # Saving a draft revision only saves the revision fields, while the
+        # instance holds the draft content, so the access tier only changes
+        # when the publication date is saved, e.g. when the issue is published
+        saves_publication_date = (
+            update_fields is None or "publication_date" in update_fields
+        )
+
+        if saves_publication_date:
+            self.access_tier = get_access_tier(self.publication_date)
+
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "access_tier"}
+
+        super().save(*args, **kwargs)
+
+        if saves_publication_date:
+            # Articles share the access tier of their issue
+            MagazineArticle.objects.child_of(self).exclude(
+                access_tier=self.access_tier,
+            ).update(access_tier=self.access_tier)
 
-        # check whether publication date is before public access date
-        return self.publication_date < ARCHIVE_THRESHOLD_DATE
+    def get_table_of_contents(self) -> dict:
+        """Load the live articles of this issue, grouped by department.
+
+        Articles, their departments and their authors are loaded together,
+        so this runs two queries however many articles the issue has.
+        """
+        articles = list(
+            MagazineArticle.objects.child_of(self)
+            .live()
+            .defer("body", "body_migrated")
+            .select_related("department")
+            .prefetch_related(
+                Prefetch(
+                    "authors",
+                    queryset=MagazineArticleAuthor.objects.select_related("author"),
+                ),
+            )
+            .order_by("department__title", "department_id", "path"),
+        )
+
+        return {
+            "featured_articles": sorted(
+                [article for article in articles if article.is_featured],
+                key=attrgetter("path"),
+            ),
+            "departments": [
+                {
+                    "department": department,
+                    "articles": list(department_articles),
+                }
+                for department, department_articles in groupby(
+                    articles,
+                    key=attrgetter("department"),
+                )
+            ],
+        }
+
+    def get_cached_table_of_contents(self) -> dict:
+        """Get the table of contents, cached per issue revision.
+
+        Saving or deleting an article also clears the cached table of contents
+        of its issue, since that doesn't create a new issue revision.
+        """
+        cache_key = get_table_of_contents_cache_key(self.path)
+        version = (self.pk, self.latest_revision_id)
+
+        cached = cache.get(cache_key)
+
+        if cached is not None and cached["version"] == version:
+            return cached["table_of_contents"]
+
+        table_of_contents = self.get_table_of_contents()
+
+        cache.set(
+            cache_key,
+            {
+                "version": version,
+                "table_of_contents": table_of_contents,
+            },
+            TABLE_OF_CONTENTS_CACHE_TIMEOUT,
+        )
+
+        return table_of_contents
+
+    def get_context(
+        self,
+        request: HttpRequest,
+        *args: tuple,
+        **kwargs: dict,
+    ) -> dict:
+        context = super().get_context(request)
+
+        context["table_of_contents"] = self.get_cached_table_of_contents()
+
+        return context
 
     search_template = "search/magazine_issue.html"
 
@@ -330,6 +500,15 @@ class MagazineArticle(DrupalFields, Page):  # type: ignore
 
     drupal_node_id = models.PositiveIntegerField(null=True, blank=True, db_index=True)
 
+    access_tier = models.CharField(
+        max_length=255,
+        choices=MagazineAccessTierChoices.choices,
+        default=MagazineAccessTierChoices.SUBSCRIBERS,
+        editable=False,
+        db_index=True,
+        help_text="Copied from the parent issue, so public articles can be filtered without joining their issues",  # noqa: E501
+    )
+
     search_template = "search/magazine_article.html"
 
     search_fields = Page.search_fields + [
@@ -371,13 +550,81 @@ class MagazineArticle(DrupalFields, Page):  # type: ignore
             },
         ]
 
+    def save(self, *args: Any, **kwargs: Any) -> None:
+        if self.path:
+            issue_access_tier = (
+                MagazineIssue.objects.filter(path=self.path[: -self.steplen])
+                .values_list("access_tier", flat=True)
+                .first()
+            )
+
+            if issue_access_tier is not None:
+                self.access_tier = issue_access_tier
+
+        super().save(*args, **kwargs)
+
+        self.invalidate_issue_table_of_contents()
+
+    def delete(self, *args: Any, **kwargs: Any) -> tuple[int, dict[str, int]]:
+        deleted = super().delete(*args, **kwargs)
+
+        self.invalidate_issue_table_of_contents()
+
+        return deleted
+
+    def invalidate_issue_table_of_contents(self) -> None:
+        """Clear the cached table of contents of the parent issue."""
+        if self.path:
+            issue_path = self.path[: -self.steplen]
+
+            cache.delete(get_table_of_contents_cache_key(issue_path))
+
+    @cached_property
+    def issue(self) -> MagazineIssue:
+        """Get the issue that contains this article."""
+        return self.get_parent().specific  # type: ignore
+
+    def get_listing_page_ids(self) -> set[int]:
+        """Get the IDs of the author, department and tag pages that list this
+        article, whose cached responses change with it."""
+        listing_page_ids = {
+            author_id
+            for author_id in self.authors.values_list("author_id", flat=True)
+            if author_id is not None
+        }
+        listing_page_ids.update(
+            MagazineTagIndexPage.objects.values_list("id", flat=True),
+        )
+
+        if self.department_id is not None:  # type: ignore
+            listing_page_ids.add(self.department_id)  # type: ignore
+
+        return listing_page_ids
+
+    @classmethod
+    def prefetch_search_results(cls, articles: list["MagazineArticle"]) -> None:
+        """Load the authors and issues of articles shown in search results."""
+        prefetch_related_objects(articles, "authors__author")
+
+        issues_by_path = {
+            issue.path: issue
+            for issue in MagazineIssue.objects.filter(
+                path__in={article.path[: -article.steplen] for article in articles},
+            ).defer_streamfields()
+        }
+
+        for article in articles:
+            article.issue = issues_by_path[article.path[: -article.steplen]]
+
     @property
     def is_public_access(self) -> bool:
         """Check whether article should be accessible to all readers or only
-        subscribers based on whether the issue is public access."""
-        parent_issue = self.get_parent()
+        subscribers based on whether the issue is public access.
 
-        return parent_issue.specific.is_public_access  # type: ignore
+        The access tier is copied from the issue, so the check doesn't
+        query the parent issue.
+        """
+        return self.access_tier == MagazineAccessTierChoices.PUBLIC
 
     def get_context(
         self,
@@ -400,7 +647,11 @@ class MagazineArticle(DrupalFields, Page):  # type: ignore
             # Only check for subscriber and superuser status if user is authenticated,
             # preventing attribute errors on unauthenticated users
             if user_is_authenticated:
-                user_is_subscriber = request.user.is_subscriber  # type: ignore
+                # Prefer the flag memoized by SubscriberMiddleware
+                if hasattr(request, "user_is_subscriber"):
+                    user_is_subscriber = bool(request.user_is_subscriber)
+                else:
+                    user_is_subscriber = request.user.is_subscriber  # type: ignore
                 user_is_superuser = request.user.is_superuser  # type: ignore
 
         # A user can view full article if
@@ -416,6 +667,75 @@ class MagazineArticle(DrupalFields, Page):  # type: ignore
         return context
 
 
+def update_access_tiers() -> set[int]:
+    """Update the access tiers of issues that aged past the archive threshold,
+    and of their articles, returning the IDs of the updated pages.
+
+    Each tier is updated with one statement for issues and one for articles,
+    however many pages change.
+    """
+    archive_threshold_date = get_archive_threshold_date()
+    updated_page_ids: set[int] = set()
+
+    with transaction.atomic():
+        for access_tier, issues in (
+            (
+                MagazineAccessTierChoices.PUBLIC,
+                MagazineIssue.objects.filter(
+                    publication_date__lt=archive_threshold_date,
+                ),
+            ),
+            (
+                MagazineAccessTierChoices.SUBSCRIBERS,
+                MagazineIssue.objects.filter(
+                    publication_date__gte=archive_threshold_date,
+                ),
+            ),
+        ):
+            issue_ids = list(
+                issues.exclude(access_tier=access_tier).values_list("id", flat=True),
+            )
+            MagazineIssue.objects.filter(id__in=issue_ids).update(
+                access_tier=access_tier,
+            )
+            updated_page_ids.update(issue_ids)
+
+        # Articles take the tier of the issue at their parent path
+        articles = (
+            MagazineArticle.objects.annotate(
+                issue_access_tier=Subquery(
+                    MagazineIssue.objects.filter(
+                        path=Substr(
+                            OuterRef("path"),
+                            1,
+                            Length(OuterRef("path")) - MagazineArticle.steplen,
+                        ),
+                    ).values("access_tier")[:1],
+                ),
+            )
+            .filter(
+                issue_access_tier__isnull=False,
+            )
+            .exclude(access_tier=F("issue_access_tier"))
+        )
+
+        for access_tier, article_ids in groupby(
+            articles.order_by("issue_access_tier").values_list(
+                "issue_access_tier",
+                "id",
+            ),
+            key=itemgetter(0),
+        ):
+            article_ids = [article_id for _, article_id in article_ids]
+
+            MagazineArticle.objects.filter(id__in=article_ids).update(
+                access_tier=access_tier,
+            )
+            updated_page_ids.update(article_ids)
+
+    return updated_page_ids
+
+
 class MagazineArticleAuthor(Orderable):
     article = ParentalKey(
         "magazine.MagazineArticle",
@@ -544,9 +864,67 @@ class ArchiveIssue(DrupalFields, Page):  # type: ignore
     class Meta:
         indexes = [
             models.Index(fields=["internet_archive_identifier"]),
+            models.Index(fields=["publication_date"]),
         ]
 
 
+def invalidate_archive_issue_year_counts() -> None:
+    cache.delete(ARCHIVE_ISSUE_YEAR_COUNTS_CACHE_KEY)
+    transaction.on_commit(lambda: cache.delete(ARCHIVE_ISSUE_YEAR_COUNTS_CACHE_KEY))
+
+
+def get_archive_issue_year_counts() -> dict[int, int]:
+    """Get the number of archive issues published in each year, by year.
+
+    The counts are computed with a single aggregate query and cached, since
+    they only change when archive issues are saved or deleted.
+    """
+    year_counts = cache.get(ARCHIVE_ISSUE_YEAR_COUNTS_CACHE_KEY)
+
+    if year_counts is None:
+        year_counts = dict(
+            ArchiveIssue.objects.filter(publication_date__isnull=False)
+            .annotate(year=ExtractYear("publication_date"))
+            .values("year")
+            .annotate(issue_count=Count("id"))
+            .order_by("year")
+            .values_list("year", "issue_count"),
+        )
+
+        cache.set(
+            ARCHIVE_ISSUE_YEAR_COUNTS_CACHE_KEY,
+            year_counts,
+            ARCHIVE_ISSUE_YEAR_COUNTS_CACHE_TIMEOUT,
+        )
+
+    return year_counts
+
+
+def get_archive_issue_decade_counts() -> dict[int, int]:
+    """Get the number of archive issues published in each decade, by the
+    first year of the decade."""
+    decade_counts: dict[int, int] = {}
+
+    for year, issue_count in get_archive_issue_year_counts().items():
+        decade = year - year % 10
+        decade_counts[decade] = decade_counts.get(decade, 0) + issue_count
+
+    return decade_counts
+
+
+def parse_year(value: str | None) -> int | None:
+    """Parse a year from a querystring value, ignoring invalid years."""
+    if value is None or not value.isdigit():
+        return None
+
+    year = int(value)
+
+    if not datetime.MINYEAR <= year < datetime.MAXYEAR - 10:
+        return None
+
+    return year
+
+
 class DeepArchiveIndexPage(Page):
     intro = RichTextField(blank=True)
 
@@ -558,24 +936,39 @@ class DeepArchiveIndexPage(Page):
     subpage_types: list[str] = ["ArchiveIssue"]
 
     def get_publication_years(self) -> list[int]:
-        publication_dates = ArchiveIssue.objects.dates("publication_date", "year")
-
-        return [publication_date.year for publication_date in publication_dates]
+        return list(get_archive_issue_year_counts())
 
     def get_filtered_archive_issues(
         self,
         query: dict[str, str],
     ) -> QuerySet[ArchiveIssue]:
-        # Filter out any facet that isn't a model field
-        allowed_keys = [
-            "publication_date__year",
-        ]
+        """Filter archive issues by publication year or decade.
 
-        facets = {
-            f"{key}__icontains": query[key] for key in query if key in allowed_keys
-        }
+        Years and decades are compared as date ranges, rather than by
+        extracting the year of every issue, so the filters use the
+        publication date index.
+        """
+        archive_issues = ArchiveIssue.objects.all()
 
-        return ArchiveIssue.objects.all().filter(**facets)
+        year = parse_year(query.get("publication_date__year"))
+
+        if year is not None:
+            archive_issues = archive_issues.filter(
+                publication_date__gte=datetime.date(year, 1, 1),
+                publication_date__lt=datetime.date(year + 1, 1, 1),
+            )
+
+        decade = parse_year(query.get("decade"))
+
+        if decade is not None:
+            decade -= decade % 10
+
+            archive_issues = archive_issues.filter(
+                publication_date__gte=datetime.date(max(decade, 1), 1, 1),
+                publication_date__lt=datetime.date(decade + 10, 1, 1),
+            )
+
+        return archive_issues
 
     def get_context(
         self,
@@ -597,11 +990,22 @@ class DeepArchiveIndexPage(Page):
             items=archive_issues,
             items_per_page=12,
             page_number=page,
+            ordering=["path"],
+            cursor=request.GET.get("cursor"),
         )
 
         context["archive_issues"] = paginated_archive_issues.page
 
-        # Add publication years to context, for select menu
-        context["publication_years"] = self.get_publication_years()
+        # Keep the filters in the page links
+        context["archive_filter_querystring"] = "".join(
+            f"{key}={query[key]}&"
+            for key in ["publication_date__year", "decade"]
+            if parse_year(query.get(key)) is not None
+        )
+
+        # Add publication years and decades to context, for select menus
+        context["publication_year_counts"] = get_archive_issue_year_counts()
+        context["publication_years"] = list(context["publication_year_counts"])
+        context["publication_decade_counts"] = get_archive_issue_decade_counts()
 
         return context
@@ -0,0 +1,19 @@
+"""Keep the cached deep archive year counts in step with archive issues."""
+from typing import Any
+
+from django.db.models.signals import post_delete, post_save
+
+from .models import ArchiveIssue, invalidate_archive_issue_year_counts
+
+
+def invalidate_year_counts(
+    sender: type[ArchiveIssue],
+    instance: ArchiveIssue,
+    **kwargs: Any,
+) -> None:
+    invalidate_archive_issue_year_counts()
+
+
+def connect_archive_issue_signals() -> None:
+    post_save.connect(invalidate_year_counts, sender=ArchiveIssue)
+    post_delete.connect(invalidate_year_counts, sender=ArchiveIssue)
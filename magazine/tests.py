@@ -1,7 +1,13 @@
 import datetime
+from io import StringIO
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import RequestFactory, TestCase
+from django.test.utils import CaptureQueriesContext
 from wagtail.models import Page, Site
 from accounts.models import User
+from contact.factories import PersonFactory
 from home.models import HomePage
 from magazine.factories import MagazineIndexPageFactory, MagazineIssueFactory
 from subscription.models import (
@@ -12,12 +18,15 @@ from subscription.models import (
 from .models import (
     ArchiveIssue,
     DeepArchiveIndexPage,
+    MagazineAccessTierChoices,
     MagazineDepartmentIndexPage,
     MagazineDepartment,
     MagazineIssue,
     MagazineIndexPage,
     MagazineArticle,
+    MagazineArticleAuthor,
     MagazineTagIndexPage,
+    get_archive_issue_year_counts,
 )
 
 
@@ -273,6 +282,120 @@ class MagazineIssueTest(TestCase):
         self.assertFalse(self.recent_magazine_issue.is_public_access)
         self.assertTrue(self.archive_magazine_issue.is_public_access)
 
+    def add_articles_with_authors(self, number_of_articles: int) -> None:
+        for article_number in range(number_of_articles):
+            article = self.recent_magazine_issue.add_child(
+                instance=MagazineArticle(
+                    title=f"Article with authors {article_number}",
+                    department=self.magazine_department_one,
+                    is_featured=article_number % 2 == 0,
+                ),
+            )
+
+            for _ in range(2):
+                MagazineArticleAuthor.objects.create(
+                    article=article,
+                    author=PersonFactory.create(),
+                )
+
+    def read_table_of_contents(self, table_of_contents: dict) -> list[str]:
+        """Touch everything the issue template uses."""
+        articles = table_of_contents["featured_articles"] + [
+            article
+            for department in table_of_contents["departments"]
+            for article in department["articles"]
+        ]
+
+        return [
+            f"{article.department} {article} {author.author} {author.author.live}"
+            for article in articles
+            for author in article.authors.all()
+        ]
+
+    def test_get_table_of_contents(self) -> None:
+        """Test that the table of contents groups live articles by
+        department."""
+        table_of_contents = self.recent_magazine_issue.get_table_of_contents()
+
+        self.assertEqual(
+            table_of_contents["featured_articles"],
+            [self.magazine_article_one],
+        )
+        self.assertEqual(
+            table_of_contents["departments"],
+            [
+                {
+                    "department": self.magazine_department_one,
+                    "articles": [self.magazine_article_two],
+                },
+                {
+                    "department": self.magazine_department_two,
+                    "articles": [self.magazine_article_one],
+                },
+            ],
+        )
+
+    def test_get_table_of_contents_query_count_is_constant(self) -> None:
+        """Test that the table of contents runs the same queries however
+        many articles and authors the issue has."""
+        for number_of_articles in [1, 10]:
+            self.add_articles_with_authors(number_of_articles)
+
+            with self.assertNumQueries(2):
+                self.read_table_of_contents(
+                    self.recent_magazine_issue.get_table_of_contents(),
+                )
+
+    def test_get_cached_table_of_contents(self) -> None:
+        """Test that the table of contents is cached until an article
+        changes."""
+        cache.clear()
+        self.recent_magazine_issue.get_cached_table_of_contents()
+
+        with self.assertNumQueries(0):
+            self.recent_magazine_issue.get_cached_table_of_contents()
+
+        self.magazine_article_two.is_featured = True
+        self.magazine_article_two.save()
+
+        self.assertEqual(
+            self.recent_magazine_issue.get_cached_table_of_contents()[
+                "featured_articles"
+            ],
+            [self.magazine_article_one, self.magazine_article_two],
+        )
+
+    def test_get_cached_table_of_contents_per_revision(self) -> None:
+        """Test that a new issue revision doesn't use the cached table of
+        contents."""
+        cache.clear()
+        self.recent_magazine_issue.get_cached_table_of_contents()
+
+        self.recent_magazine_issue.save_revision()
+
+        with self.assertNumQueries(2):
+            self.recent_magazine_issue.get_cached_table_of_contents()
+
+    def test_issue_page_query_count_is_constant(self) -> None:
+        """Test that rendering an issue runs the same number of queries
+        however many articles the issue has."""
+        query_counts = []
+
+        # Warm up process-wide caches, e.g. content types
+        self.client.get(self.recent_magazine_issue.url)
+
+        for number_of_articles in [1, 10]:
+            self.add_articles_with_authors(number_of_articles)
+            cache.clear()
+
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get(self.recent_magazine_issue.url)
+
+            self.assertEqual(response.status_code, 200)
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
 
 class MagazineTagIndexPageTest(TestCase):
     def setUp(self) -> None:
@@ -401,6 +524,8 @@ class MagazineDepartmentTest(TestCase):
 
 class MagazineArticleTest(TestCase):
     def setUp(self) -> None:
+        cache.clear()
+
         self.admin_user = User.objects.create_superuser(
             email="admin@email.com",
             password="password",  # nosec - Banned password
@@ -493,6 +618,106 @@ class MagazineArticleTest(TestCase):
         self.assertFalse(self.recent_magazine_article.is_public_access)
         self.assertTrue(self.archive_magazine_article.is_public_access)
 
+    def test_is_public_access_does_not_load_parent_issue(self) -> None:
+        """Test that is_public_access uses the access tier of the article."""
+        article = MagazineArticle.objects.get(id=self.archive_magazine_article.id)
+
+        with self.assertNumQueries(0):
+            self.assertTrue(article.is_public_access)
+
+    def test_access_tier_follows_issue(self) -> None:
+        """Test that articles take the access tier of their issue, including
+        when the issue date changes."""
+        self.assertEqual(
+            self.archive_magazine_article.access_tier,
+            MagazineAccessTierChoices.PUBLIC,
+        )
+
+        self.recent_magazine_issue.publication_date = datetime.date(2000, 1, 1)
+        self.recent_magazine_issue.save()
+
+        self.recent_magazine_article.refresh_from_db()
+
+        self.assertEqual(
+            self.recent_magazine_article.access_tier,
+            MagazineAccessTierChoices.PUBLIC,
+        )
+
+    def test_access_tier_changes_when_issue_is_published(self) -> None:
+        """Test that a draft publication date doesn't change the access tier
+        of the issue and its articles until the draft is published."""
+        self.recent_magazine_issue.publication_date = datetime.date(2000, 1, 1)
+        revision = self.recent_magazine_issue.save_revision()
+
+        self.recent_magazine_article.refresh_from_db()
+
+        self.assertEqual(
+            self.recent_magazine_article.access_tier,
+            MagazineAccessTierChoices.SUBSCRIBERS,
+        )
+        self.assertFalse(
+            MagazineIssue.objects.get(
+                id=self.recent_magazine_issue.id
+            ).is_public_access,
+        )
+
+        revision.publish()
+
+        self.recent_magazine_article.refresh_from_db()
+
+        self.assertEqual(
+            self.recent_magazine_article.access_tier,
+            MagazineAccessTierChoices.PUBLIC,
+        )
+        self.assertTrue(
+            MagazineIssue.objects.get(
+                id=self.recent_magazine_issue.id
+            ).is_public_access,
+        )
+
+    def test_update_magazine_access_tiers(self) -> None:
+        """Test that the command updates issues that aged past the archive
+        threshold since they were saved, and their articles."""
+        # Saved before the issue aged past the archive threshold
+        MagazineIssue.objects.filter(id=self.archive_magazine_issue.id).update(
+            access_tier=MagazineAccessTierChoices.SUBSCRIBERS,
+        )
+        MagazineArticle.objects.filter(id=self.archive_magazine_article.id).update(
+            access_tier=MagazineAccessTierChoices.SUBSCRIBERS,
+        )
+
+        output = StringIO()
+        call_command("update_magazine_access_tiers", stdout=output)
+
+        self.assertIn("Updated the access tier of 2 pages", output.getvalue())
+        self.assertEqual(
+            set(
+                MagazineArticle.objects.filter(
+                    access_tier=MagazineAccessTierChoices.PUBLIC,
+                ).values_list("id", flat=True),
+            ),
+            {self.archive_magazine_article.id},
+        )
+        self.assertTrue(
+            MagazineIssue.objects.get(
+                id=self.archive_magazine_issue.id
+            ).is_public_access,
+        )
+
+    def test_get_context_uses_memoized_subscriber_flag(self) -> None:
+        """Test that get_context uses the flag set by SubscriberMiddleware
+        instead of checking the user's subscriptions."""
+        mock_request = RequestFactory().get("/magazine/issue-1/article-1/")
+        mock_request.user = self.regular_user
+        mock_request.user_is_subscriber = True  # type: ignore
+
+        context = self.recent_magazine_article.get_context(mock_request)
+
+        self.assertEqual(
+            context["user_can_view_full_article"],
+            True,
+        )
+
     def test_recent_get_context_anonymous(self) -> None:
         """Test that the get_context method returns the correct context."""
         mock_request = RequestFactory().get("/magazine/issue-1/article-1/")
@@ -584,6 +809,8 @@ class MagazineArticleTest(TestCase):
 
 class DeepArchiveIndexPageTest(TestCase):
     def setUp(self) -> None:
+        cache.clear()
+
         self.factory = RequestFactory()
         self.root = Site.objects.get(is_default_site=True).root_page
 
@@ -660,6 +887,57 @@ class DeepArchiveIndexPageTest(TestCase):
             ordered=False,  # The order of the results is not important
         )
 
+    def test_get_context_with_publication_year(self) -> None:
+        request = self.factory.get("/?publication_date__year=1925")
+
+        context = self.deep_archive_index.get_context(request)
+
+        self.assertEqual(
+            [issue.title for issue in context["archive_issues"]],
+            ["Archive Issue 1925"],
+        )
+        self.assertEqual(
+            context["archive_filter_querystring"],
+            "publication_date__year=1925&",
+        )
+
+    def test_get_context_with_decade(self) -> None:
+        request = self.factory.get("/?decade=1935")
+
+        context = self.deep_archive_index.get_context(request)
+
+        self.assertEqual(
+            [issue.title for issue in context["archive_issues"]],
+            [f"Archive Issue {year}" for year in range(1930, 1940)],
+        )
+        self.assertEqual(
+            context["publication_decade_counts"],
+            {decade: 10 for decade in range(1920, 1970, 10)},
+        )
+
+    def test_get_filtered_archive_issues_ignores_invalid_years(self) -> None:
+        archive_issues = self.deep_archive_index.get_filtered_archive_issues(
+            {"publication_date__year": "19%", "decade": "99999"},
+        )
+
+        self.assertEqual(archive_issues.count(), len(self.archive_issues))
+
+    def test_publication_year_counts_are_cached_until_issues_change(self) -> None:
+        self.assertEqual(get_archive_issue_year_counts()[1925], 1)
+
+        with self.assertNumQueries(0):
+            get_archive_issue_year_counts()
+
+        self.deep_archive_index.add_child(
+            instance=ArchiveIssue(
+                title="Second Archive Issue 1925",
+                internet_archive_identifier="second-archive-issue-1925",
+                publication_date=datetime.date(1925, 6, 1),
+            ),
+        )
+
+        self.assertEqual(get_archive_issue_year_counts()[1925], 2)
+
 
 class TestMagazineIndexPageFactory(TestCase):
     def test_magazine_index_page_factory(self) -> None:
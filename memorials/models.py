@@ -1,5 +1,6 @@
 from django.db import models
 from django.http import HttpRequest
+from django.utils.http import urlencode
 from django_flatpickr.widgets import DatePickerInput
 from wagtail.admin.panels import FieldPanel, PageChooserPanel
 from wagtail.fields import RichTextField
@@ -9,6 +10,12 @@ from contact.models import Meeting
 from common.models import DrupalFields
 from pagination.helpers import get_paginated_items
 
+# Memorial fields the index can be filtered by
+MEMORIAL_FACETS = [
+    "title",
+    "memorial_meeting__title",
+]
+
 
 class Memorial(DrupalFields, Page):  # type: ignore
     memorial_person = models.ForeignKey(
@@ -75,12 +82,8 @@ class MemorialIndexPage(Page):
         query: dict,
     ) -> models.QuerySet[Memorial]:
         # Filter out any facet that isn't a model field
-        allowed_keys = [
-            "title",
-            "memorial_meeting__title",
-        ]
         facets = {
-            f"{key}__icontains": query[key] for key in query if key in allowed_keys
+            f"{key}__icontains": query[key] for key in query if key in MEMORIAL_FACETS
         }
 
         return Memorial.objects.all().filter(**facets)
@@ -112,6 +115,12 @@ class MemorialIndexPage(Page):
         # to render the pagination links
         context["memorials"] = paginated_memorials.page
 
+        # Pagination links keep the facets, but no other parameters, since
+        # the cached page is shared by requests with other parameters
+        context["current_querystring"] = urlencode(
+            {key: request.GET[key] for key in MEMORIAL_FACETS if request.GET.get(key)},
+        )
+
         # Populate faceted search fields
         context["meetings"] = Meeting.objects.all()
 
@@ -126,3 +126,17 @@ class MemorialIndexPageGetContextTest(TestCase):
             len(context["meetings"]),
             2,
         )
+
+    def test_pagination_querystring_only_keeps_facets(self) -> None:
+        request = self.factory.get(
+            "/",
+            {
+                "title": "Friend",
+                "page": "2",
+                "utm_source": "newsletter",
+            },
+        )
+
+        context = self.memorial_index_page.get_context(request)
+
+        self.assertEqual(context["current_querystring"], "title=Friend")
@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class NavigationConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "navigation"
+
+    def ready(self) -> None:
+        from .signals import connect_navigation_menu_signals
+
+        connect_navigation_menu_signals()
@@ -0,0 +1,124 @@
+"""Compile the navigation menu of each site into a cached tree of links.
+
+Rendering the menu StreamField loads the setting and resolves the URL of
+every linked page, on every request. Instead, the menu is compiled into a
+tree of titles and hrefs, which is cached per site until the setting is
+saved or a linked page is published, unpublished, moved, renamed or
+deleted.
+"""
+from typing import Any
+
+from django.core.cache import cache
+from django.db import transaction
+from wagtail.models import Page, Site
+
+from .blocks import NavigationPageChooserStructValue
+from .models import NavigationMenuSetting
+
+NAVIGATION_MENU_CACHE_KEY_PREFIX = "navigation_menu"
+
+
+def get_navigation_menu_cache_key(site_id: int) -> str:
+    return f"{NAVIGATION_MENU_CACHE_KEY_PREFIX}:{site_id}"
+
+
+def compile_menu_link(
+    value: Any,
+    site: Site,
+    page_ids: set[int],
+) -> dict[str, Any] | None:
+    """Compile a link, or nothing for links to missing or unpublished pages."""
+    if isinstance(value, NavigationPageChooserStructValue):
+        page: Page | None = value.get("page")
+
+        if page is None:
+            return None
+
+        page_ids.add(page.pk)
+
+        if not page.live:
+            return None
+
+        url = page.get_url(current_site=site)
+
+        if url is None:
+            return None
+
+        anchor = value.get("anchor")
+
+        return {
+            "title": value.get("title"),
+            "href": f"{url}#{anchor}" if anchor else url,
+        }
+
+    return {
+        "title": value.get("title"),
+        "href": value.href(),
+    }
+
+
+def compile_navigation_menu(site: Site) -> dict[str, Any]:
+    """Compile the menu of a site into its items and the IDs of linked pages.
+
+    Dropdown menus have `children` rather than an `href`.
+    """
+    # Unlike `for_site`, don't create the setting while rendering a request
+    setting = NavigationMenuSetting.objects.filter(site=site).first()
+    menu_items = setting.menu_items if setting is not None else []
+
+    items: list[dict[str, Any]] = []
+    page_ids: set[int] = set()
+
+    for menu_item in menu_items:
+        if menu_item.block_type == "drop_down":
+            children = [
+                link
+                for child in menu_item.value["menu_items"]
+                if (link := compile_menu_link(child.value, site, page_ids))
+            ]
+
+            items.append({"title": menu_item.value["title"], "children": children})
+        elif link := compile_menu_link(menu_item.value, site, page_ids):
+            items.append(link)
+
+    return {"items": items, "page_ids": sorted(page_ids)}
+
+
+def get_navigation_menu(site: Site) -> dict[str, Any]:
+    cache_key = get_navigation_menu_cache_key(site.pk)
+
+    navigation_menu = cache.get(cache_key)
+
+    if navigation_menu is None:
+        navigation_menu = compile_navigation_menu(site)
+        cache.set(cache_key, navigation_menu, timeout=None)
+
+    return navigation_menu
+
+
+def invalidate_navigation_menus(page_id: int | None = None) -> None:
+    """Invalidate the menus of all sites, or of those linking to a page.
+
+    The menus are invalidated again after the transaction commits, so a
+    request can't cache the menu from before the commit.
+    """
+    cache_keys = [
+        get_navigation_menu_cache_key(site_id)
+        for site_id in Site.objects.values_list("id", flat=True)
+    ]
+
+    def delete_menus() -> None:
+        if page_id is None:
+            cache.delete_many(cache_keys)
+            return
+
+        cache.delete_many(
+            [
+                cache_key
+                for cache_key, navigation_menu in cache.get_many(cache_keys).items()
+                if page_id in navigation_menu["page_ids"]
+            ],
+        )
+
+    delete_menus()
+    transaction.on_commit(delete_menus)
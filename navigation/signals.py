@@ -0,0 +1,48 @@
+"""Invalidate the cached navigation menus when the menu setting or the
+pages it links to change."""
+from typing import Any
+
+from django.db.models import Model
+from django.db.models.signals import post_delete, post_save
+from wagtail.models import Page
+from wagtail.signals import (
+    page_published,
+    page_slug_changed,
+    page_unpublished,
+    post_page_move,
+)
+
+from .menu import invalidate_navigation_menus
+from .models import NavigationMenuSetting
+
+
+def invalidate_all_navigation_menus(sender: type[Model], **kwargs: Any) -> None:
+    invalidate_navigation_menus()
+
+
+def invalidate_navigation_menus_of_page(
+    sender: type[Model],
+    instance: Model,
+    **kwargs: Any,
+) -> None:
+    if not isinstance(instance, Page):
+        return
+
+    invalidate_navigation_menus(page_id=instance.pk)
+
+
+def connect_navigation_menu_signals() -> None:
+    post_save.connect(invalidate_all_navigation_menus, sender=NavigationMenuSetting)
+    post_delete.connect(
+        invalidate_all_navigation_menus,
+        sender=NavigationMenuSetting,
+    )
+
+    # Slugs and moves also change the URLs of descendant pages
+    page_slug_changed.connect(invalidate_all_navigation_menus)
+    post_page_move.connect(invalidate_all_navigation_menus)
+
+    # Page models are subclasses, so listen to every sender
+    page_published.connect(invalidate_navigation_menus_of_page)
+    page_unpublished.connect(invalidate_navigation_menus_of_page)
+    post_delete.connect(invalidate_navigation_menus_of_page)
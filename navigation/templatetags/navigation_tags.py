@@ -0,0 +1,25 @@
+from typing import Any
+
+from django import template
+from django.template import Context
+from wagtail.models import Site
+
+from navigation.menu import get_navigation_menu
+
+register = template.Library()
+
+
+@register.simple_tag(takes_context=True)
+def get_navigation_menu_items(context: Context) -> list[dict[str, Any]]:
+    """Get the cached navigation menu items of the request site."""
+    request = context.get("request")
+    site = (
+        Site.find_for_request(request)
+        if request is not None
+        else Site.objects.filter(is_default_site=True).first()
+    )
+
+    if site is None:
+        return []
+
+    return get_navigation_menu(site)["items"]
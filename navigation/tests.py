@@ -1,4 +1,8 @@
-from django.test import TestCase
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.template.loader import render_to_string
+from django.test import RequestFactory, TestCase
+from wagtail.models import Page, Site
 from wagtail_factories import PageFactory
 
 from .blocks import (
@@ -6,6 +10,8 @@ from .blocks import (
     NavigationExternalLinkBlock,
     NavigationExternalLinkStructValue,
 )
+from .menu import get_navigation_menu
+from .models import NavigationMenuSetting
 
 
 class TestNavigationExternalLinkStructValue(TestCase):
@@ -91,3 +97,113 @@ class TestNavigationPageChooserStructValue(TestCase):
             block_value.href(),
             self.test_page.url,
         )
+
+
+class NavigationMenuCacheTestCase(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+        self.site = Site.objects.get(is_default_site=True)
+        site_root = Page.objects.get(id=self.site.root_page_id)
+
+        self.about_page = site_root.add_child(
+            instance=Page(title="About", slug="about"),
+        )
+        self.contact_page = site_root.add_child(
+            instance=Page(title="Contact", slug="contact"),
+        )
+
+        self.setting = NavigationMenuSetting.for_site(self.site)
+        self.setting.menu_items = [
+            {
+                "type": "internal_page",
+                "value": {
+                    "title": "About us",
+                    "page": self.about_page.id,
+                    "anchor": "team",
+                },
+            },
+            {
+                "type": "drop_down",
+                "value": {
+                    "title": "More",
+                    "menu_items": [
+                        {
+                            "type": "page",
+                            "value": {
+                                "title": "Contact us",
+                                "page": self.contact_page.id,
+                                "anchor": "",
+                            },
+                        },
+                        {
+                            "type": "external_link",
+                            "value": {
+                                "title": "Elsewhere",
+                                "url": "https://example.com",
+                                "anchor": "",
+                            },
+                        },
+                    ],
+                },
+            },
+        ]
+        self.setting.save()
+
+    def render_navbar(self) -> str:
+        request = RequestFactory().get("/")
+        request.user = AnonymousUser()
+        request._wagtail_site = self.site  # type: ignore[attr-defined]
+
+        return render_to_string("navbar.html", request=request)
+
+    def test_menu_is_compiled_into_links(self) -> None:
+        self.assertEqual(
+            get_navigation_menu(self.site)["items"],
+            [
+                {"title": "About us", "href": f"{self.about_page.url}#team"},
+                {
+                    "title": "More",
+                    "children": [
+                        {"title": "Contact us", "href": self.contact_page.url},
+                        {"title": "Elsewhere", "href": "https://example.com"},
+                    ],
+                },
+            ],
+        )
+
+    def test_rendering_cached_menu_runs_no_queries(self) -> None:
+        self.render_navbar()
+
+        with self.assertNumQueries(0):
+            navbar = self.render_navbar()
+
+        self.assertIn(self.contact_page.url, navbar)
+
+    def test_saving_setting_invalidates_menu(self) -> None:
+        self.render_navbar()
+
+        self.setting.menu_items = [
+            {
+                "type": "external_link",
+                "value": {"title": "Elsewhere", "url": "https://example.com"},
+            },
+        ]
+        self.setting.save()
+
+        self.assertNotIn(self.about_page.url, self.render_navbar())
+
+    def test_unpublishing_linked_page_removes_link(self) -> None:
+        self.render_navbar()
+
+        self.contact_page.unpublish()
+
+        self.assertNotIn("Contact us", self.render_navbar())
+
+    def test_changing_linked_page_slug_updates_link(self) -> None:
+        self.render_navbar()
+
+        self.about_page.slug = "about-us"
+        self.about_page.save_revision().publish()
+
+        self.assertIn('href="/about-us/#team"', self.render_navbar())
@@ -238,3 +238,17 @@ class NewsItem(DrupalFields, Page):
         "NewsIndexPage",
     ]
     subpage_types: list[str] = []
+
+    def get_listing_page_ids(self) -> set[int]:
+        """Get the IDs of the topic and type pages that list this news item,
+        whose cached responses change with it."""
+        listing_page_ids = [
+            self.news_topic_id,  # type: ignore
+            self.news_type_id,  # type: ignore
+        ]
+
+        return {
+            listing_page_id
+            for listing_page_id in listing_page_ids
+            if listing_page_id is not None
+        }
@@ -1,3 +1,4 @@
+import uuid
 from typing import Any
 from django import forms
 
@@ -5,6 +6,12 @@ from .models import Order
 
 
 class OrderCreateForm(forms.ModelForm):
+    # Identifies the form, so submitting it twice creates one order
+    idempotency_key = forms.UUIDField(
+        initial=uuid.uuid4,
+        widget=forms.HiddenInput(),
+    )
+
     def __init__(
         self,
         *args: Any,
@@ -0,0 +1,23 @@
+# Generated by Django 4.2.4 on 2026-10-18 09:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("orders", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="idempotency_key",
+            field=models.UUIDField(
+                blank=True,
+                editable=False,
+                help_text="Identifies the order form submission that created this order.",
+                null=True,
+                unique=True,
+            ),
+        ),
+    ]
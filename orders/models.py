@@ -74,6 +74,13 @@ class Order(ClusterableModel):
         null=True,
         blank=True,
     )
+    idempotency_key = models.UUIDField(
+        null=True,
+        blank=True,
+        unique=True,
+        editable=False,
+        help_text="Identifies the order form submission that created this order.",
+    )
 
     panels = [
         FieldPanel("purchaser_given_name"),
@@ -1,11 +1,18 @@
+import uuid
 from unittest.mock import MagicMock, Mock, patch
+from django.conf import settings
 from django.contrib.sessions.middleware import SessionMiddleware
 from django.test import Client, RequestFactory, TestCase
 from django.urls import reverse
 from cart.cart import Cart
 from cart.tests import scaffold_product_index_page
 
-from orders.views import create_cart_order_items
+from orders.forms import OrderCreateForm
+from orders.views import (
+    UnavailableProductsError,
+    create_cart_order_items,
+    create_order_from_cart,
+)
 from store.factories import ProductFactory
 
 
@@ -129,6 +136,7 @@ class OrderCreateViewTest(TestCase):
 
             # Set is_valid to return True
             mock_form.is_valid.return_value = True
+            mock_form.cleaned_data = {"idempotency_key": uuid.uuid4()}
 
             # Set save to return a mock order with an id
             mock_order = MagicMock()
@@ -258,3 +266,96 @@ class CreateCartOrderItemsTest(TestCase):
             item2.quantity,
             self.product2_quantity,
         )
+
+
+class CreateOrderFromCartTest(TestCase):
+    def setUp(self) -> None:
+        self.request = RequestFactory().get("/")
+
+        middleware = SessionMiddleware(Mock())
+        middleware.process_request(self.request)
+        self.request.session.save()
+
+        product_index_page = scaffold_product_index_page()
+
+        self.product = ProductFactory.build(available=True)
+        product_index_page.add_child(instance=self.product)
+
+        self.cart = Cart(self.request)
+        self.cart.add(self.product, quantity=2)
+
+        self.idempotency_key = uuid.uuid4()
+
+    def get_form(self) -> OrderCreateForm:
+        form = OrderCreateForm(
+            {
+                "idempotency_key": str(self.idempotency_key),
+                "purchaser_email": "purchaser@example.com",
+                "recipient_name": "Recipient",
+                "recipient_postal_code": "12345",
+                "recipient_address_locality": "City",
+                "recipient_address_country": "United States",
+                "shipping_cost": "0",
+            },
+        )
+        self.assertTrue(form.is_valid(), form.errors)
+
+        return form
+
+    def test_order_and_items_are_created_with_cart_prices(self) -> None:
+        order_id = create_order_from_cart(self.get_form(), self.cart)
+
+        order = Order.objects.get(id=order_id)
+
+        self.assertEqual(order.idempotency_key, self.idempotency_key)
+        self.assertEqual(order.shipping_cost, self.cart.get_shipping_cost())
+        self.assertEqual(
+            list(order.items.values_list("product_id", "price", "quantity")),
+            [(self.product.id, self.product.price, 2)],
+        )
+
+    def test_submitting_form_twice_creates_one_order(self) -> None:
+        first_order_id = create_order_from_cart(self.get_form(), self.cart)
+        second_order_id = create_order_from_cart(self.get_form(), self.cart)
+
+        self.assertEqual(first_order_id, second_order_id)
+        self.assertEqual(Order.objects.count(), 1)
+        self.assertEqual(OrderItem.objects.count(), 1)
+
+    def test_unavailable_products_are_not_ordered(self) -> None:
+        self.product.available = False
+        self.product.save()
+
+        with self.assertRaises(UnavailableProductsError) as context:
+            create_order_from_cart(self.get_form(), self.cart)
+
+        self.assertEqual(context.exception.product_titles, [self.product.title])
+        self.assertFalse(Order.objects.exists())
+
+    def test_order_form_shows_unavailable_products(self) -> None:
+        self.product.available = False
+        self.product.save()
+
+        client = Client()
+        session = client.session
+        session[settings.CART_SESSION_ID] = self.cart.cart
+        session.save()
+
+        response = client.post(
+            reverse("orders:order_create"),
+            self.get_form().data,
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "no longer available")
+        self.assertFalse(Order.objects.exists())
+
+    def test_failed_item_creation_leaves_no_order(self) -> None:
+        with patch(
+            "orders.views.OrderItem.objects.bulk_create",
+            side_effect=RuntimeError,
+        ):
+            with self.assertRaises(RuntimeError):
+                create_order_from_cart(self.get_form(), self.cart)
+
+        self.assertFalse(Order.objects.exists())
@@ -1,3 +1,6 @@
+from typing import TYPE_CHECKING
+
+from django.db import IntegrityError, transaction
 from django.http import HttpRequest, HttpResponse, QueryDict
 from django.shortcuts import redirect, render
 from django.urls import reverse
@@ -6,19 +9,82 @@ from cart.cart import Cart
 
 from .models import Order, OrderItem
 
+if TYPE_CHECKING:
+    from .forms import OrderCreateForm
+
+
+class UnavailableProductsError(Exception):
+    def __init__(self, product_titles: list[str]) -> None:
+        super().__init__(f"Products are not available: {', '.join(product_titles)}")
+        self.product_titles = product_titles
+
 
 def create_cart_order_items(
     order: Order,
     cart: Cart,
 ) -> None:
-    for item in cart:
-        OrderItem.objects.create(
-            order=order,
-            product_title=item["product_title"],
-            product_id=item["product_id"],
-            price=item["price"],
-            quantity=item["quantity"],
-        )
+    """Create the items of an order from the cart, at current prices."""
+    OrderItem.objects.bulk_create(
+        [
+            OrderItem(
+                order=order,
+                sort_order=sort_order,
+                product_title=item.product_title,
+                product_id=item.product_id,
+                price=item.price,
+                quantity=item.quantity,
+            )
+            for sort_order, item in enumerate(cart)
+        ],
+    )
+
+
+def create_order_from_cart(
+    form: "OrderCreateForm",
+    cart: Cart,
+) -> int:
+    """Create an order and its items from a valid form and the cart, in one
+    transaction, and return the order ID.
+
+    The cart products and their current prices are loaded with one query.
+    Submitting the same form again, e.g. by double-clicking or going back,
+    returns the order it created. Raises an UnavailableProductsError if the
+    cart has products that are no longer available.
+    """
+    idempotency_key = form.cleaned_data["idempotency_key"]
+
+    existing_order_id = (
+        Order.objects.filter(idempotency_key=idempotency_key)
+        .values_list("id", flat=True)
+        .first()
+    )
+
+    if existing_order_id is not None:
+        return existing_order_id
+
+    # Load the cart snapshot before writing, to keep the transaction short
+    shipping_cost = cart.get_shipping_cost()
+
+    try:
+        with transaction.atomic():
+            unavailable_product_titles = [
+                item.product_title for item in cart if not item.available
+            ]
+
+            if unavailable_product_titles:
+                raise UnavailableProductsError(unavailable_product_titles)
+
+            order = form.save(commit=False)
+            order.idempotency_key = idempotency_key
+            order.shipping_cost = shipping_cost
+            order.save()
+
+            create_cart_order_items(order, cart)
+    except IntegrityError:
+        # A concurrent submission of the same form created the order
+        return Order.objects.get(idempotency_key=idempotency_key).id
+
+    return order.id
 
 
 def order_create(request: HttpRequest) -> HttpResponse:
@@ -39,33 +105,38 @@ def order_create(request: HttpRequest) -> HttpResponse:
         form = OrderCreateForm(cart_order)
 
         if form.is_valid():
-            order = form.save()
+            try:
+                order_id = create_order_from_cart(form, cart)
+            except UnavailableProductsError as error:
+                form.add_error(
+                    None,
+                    "These products are no longer available, so please remove "
+                    f"them from your cart: {', '.join(error.product_titles)}",
+                )
+            else:
+                # TODO: consider moving this to the payment app
+                # so it can be cleared after successful payment.
+                # That way, the user can retry checkout if payment fails.
+                cart.clear()
+
+                # redirect for payment
+                return redirect(
+                    reverse(
+                        "payment:process_bookstore_order_payment",
+                        kwargs={
+                            "order_id": order_id,
+                        },
+                    ),
+                )
 
-            create_cart_order_items(order, cart)
-
-            # TODO: consider moving this to the payment app
-            # so it can be cleared after successful payment.
-            # That way, the user can retry checkout if payment fails.
-            cart.clear()
-
-            # redirect for payment
-            return redirect(
-                reverse(
-                    "payment:process_bookstore_order_payment",
-                    kwargs={
-                        "order_id": order.id,
-                    },
-                ),
-            )
-        else:
-            return render(
-                request,
-                template_name="orders/create.html",
-                context={
-                    "cart": cart,
-                    "form": form,
-                },
-            )
+        return render(
+            request,
+            template_name="orders/create.html",
+            context={
+                "cart": cart,
+                "form": form,
+            },
+        )
 
     else:
         form = OrderCreateForm()
@@ -1,7 +1,22 @@
+import datetime
+import hashlib
+from collections.abc import Iterator, Sequence
 from dataclasses import dataclass
-from collections.abc import Iterator
-from django.core.paginator import Paginator, Page
-from django.db.models import QuerySet
+from typing import Any
+
+from django.core import signing
+from django.core.cache import cache
+from django.core.exceptions import EmptyResultSet
+from django.core.paginator import Page, Paginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Model, Q, QuerySet
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.functional import cached_property
+
+# Counts only size the page range, so they may lag behind new items
+PAGINATION_COUNT_CACHE_TIMEOUT = 60 * 5
+
+CURSOR_SALT = "pagination.cursor"
 
 
 @dataclass
@@ -12,12 +27,257 @@ class PaginatorPageWithElidedPageRange:
     elided_page_range: Iterator[int | str]
 
 
+def get_cached_count(items: QuerySet) -> int:
+    """Count items, caching the count of each distinct query."""
+    try:
+        sql = str(items.query)
+    except EmptyResultSet:
+        return 0
+
+    cache_key = f"pagination_count:{hashlib.md5(sql.encode()).hexdigest()}"
+
+    count = cache.get(cache_key)
+
+    if count is None:
+        count = items.count()
+        cache.set(cache_key, count, PAGINATION_COUNT_CACHE_TIMEOUT)
+
+    return count
+
+
+def encode_cursor_value(value: Any) -> Any:
+    """Convert a sort key value to JSON, keeping the precision of times."""
+    if isinstance(value, (str, int, float, bool, type(None))):
+        return value
+
+    # The JSON encoder rounds times to milliseconds, so seeking past a
+    # rounded time would return the items of the same millisecond again
+    if isinstance(value, (datetime.datetime, datetime.time)):
+        return value.isoformat()
+
+    return DjangoJSONEncoder().default(value)
+
+
+class KeysetPage(Page):
+    """A page of items found by seeking past the cursor of a neighbor page.
+
+    Besides the page number, which is kept for the page links, the page
+    has opaque cursors that load the next and previous pages without an
+    offset.
+    """
+
+    def __init__(
+        self,
+        object_list: list,
+        number: int,
+        paginator: "KeysetPaginator",
+        has_next: bool,
+        has_previous: bool,
+    ) -> None:
+        super().__init__(object_list, number, paginator)
+        self._has_next = has_next
+        self._has_previous = has_previous
+
+    def has_next(self) -> bool:
+        return self._has_next
+
+    def has_previous(self) -> bool:
+        return self._has_previous
+
+    def next_page_number(self) -> int:
+        return self.number + 1
+
+    def previous_page_number(self) -> int:
+        return self.number - 1
+
+    @property
+    def next_cursor(self) -> str | None:
+        if not self.object_list:
+            return None
+
+        return self.paginator.create_cursor(self.object_list[-1], "next")
+
+    @property
+    def previous_cursor(self) -> str | None:
+        if not self.object_list:
+            return None
+
+        return self.paginator.create_cursor(self.object_list[0], "previous")
+
+
+class KeysetPaginator(Paginator):
+    """Paginate items by seeking past a sort key, rather than by offset.
+
+    The ordering must end with a unique, non-null field, such as `id` or
+    `path`, so every item has a distinct position. Other fields may be
+    null. The count, which only sizes the page range, is cached.
+    """
+
+    def __init__(
+        self,
+        object_list: QuerySet,
+        per_page: int,
+        ordering: Sequence[str],
+    ) -> None:
+        super().__init__(object_list.order_by(*ordering), per_page)
+        self.ordering = list(ordering)
+
+    @cached_property
+    def count(self) -> int:
+        return get_cached_count(self.object_list)
+
+    def get_key_values(self, item: Model) -> list[Any]:
+        key_values = []
+
+        for field_name in self.ordering:
+            value: Any = item
+
+            for attribute in field_name.lstrip("-").split(LOOKUP_SEP):
+                value = getattr(value, attribute)
+
+            key_values.append(value)
+
+        return key_values
+
+    def create_cursor(self, item: Model, direction: str) -> str:
+        key_values = [encode_cursor_value(value) for value in self.get_key_values(item)]
+
+        return signing.dumps([direction, key_values], salt=CURSOR_SALT)
+
+    def parse_cursor(self, cursor: str) -> tuple[str, list[Any]] | None:
+        """Get the direction and sort key of a cursor, if it is valid."""
+        try:
+            direction, key_values = signing.loads(cursor, salt=CURSOR_SALT)
+        except (signing.BadSignature, TypeError, ValueError):
+            return None
+
+        if direction not in ("next", "previous") or len(key_values) != len(
+            self.ordering,
+        ):
+            return None
+
+        return direction, key_values
+
+    def get_seek_filter(self, key_values: list[Any], backward: bool) -> Q:
+        """Get the items after a sort key, or before it when seeking backward.
+
+        Compares the sort key field by field, so mixed sort directions work:
+        (a > x) OR (a = x AND b > y) OR ...
+
+        Nulls can't be compared, so they are placed as Postgres sorts them,
+        after other values in ascending order and before them in descending.
+        """
+        seek_filter = Q()
+        equal_filter = Q()
+
+        for field_name, value in zip(self.ordering, key_values):
+            is_descending = field_name.startswith("-")
+            field_name = field_name.lstrip("-")
+            lookup = "lt" if is_descending != backward else "gt"
+            nulls_are_past = is_descending == backward
+
+            if value is None:
+                # Non-null values are past a null, unless nulls are sorted last
+                if not nulls_are_past:
+                    seek_filter |= equal_filter & Q(
+                        **{f"{field_name}__isnull": False},
+                    )
+            else:
+                past_filter = Q(**{f"{field_name}__{lookup}": value})
+
+                if nulls_are_past:
+                    past_filter |= Q(**{f"{field_name}__isnull": True})
+
+                seek_filter |= equal_filter & past_filter
+
+            # Filtering on None matches nulls
+            equal_filter &= Q(**{field_name: value})
+
+        # Nothing is past a sort key that is null in every field
+        return seek_filter or Q(pk__in=[])
+
+    def keyset_page(self, number: int, cursor: str | None = None) -> KeysetPage:
+        """Get a page of items, seeking past the cursor if there is one.
+
+        Pages without a valid cursor, e.g. from the numbered page links,
+        are found by offset.
+        """
+        parsed_cursor = self.parse_cursor(cursor) if cursor else None
+
+        if parsed_cursor is None:
+            offset = (number - 1) * self.per_page
+            items = list(self.object_list[offset : offset + self.per_page + 1])
+
+            return KeysetPage(
+                items[: self.per_page],
+                number,
+                self,
+                has_next=len(items) > self.per_page,
+                has_previous=number > 1,
+            )
+
+        direction, key_values = parsed_cursor
+
+        if direction == "next":
+            items = list(
+                self.object_list.filter(
+                    self.get_seek_filter(key_values, backward=False),
+                )[: self.per_page + 1],
+            )
+
+            return KeysetPage(
+                items[: self.per_page],
+                number,
+                self,
+                has_next=len(items) > self.per_page,
+                has_previous=True,
+            )
+
+        items = list(
+            self.object_list.filter(
+                self.get_seek_filter(key_values, backward=True),
+            ).reverse()[: self.per_page + 1],
+        )
+
+        return KeysetPage(
+            list(reversed(items[: self.per_page])),
+            number,
+            self,
+            has_next=True,
+            has_previous=len(items) > self.per_page,
+        )
+
+
 def get_paginated_items(
     items: QuerySet,
     items_per_page: int,
     page_number: str = "1",
+    ordering: Sequence[str] | None = None,
+    cursor: str | None = None,
 ) -> PaginatorPageWithElidedPageRange:
-    """Paginate items and return a page of items."""
+    """Paginate items and return a page of items.
+
+    When an `ordering` is given, e.g. `["-publication_date", "id"]`, pages
+    are found by seeking past the `cursor` of the page they were linked
+    from, rather than counting and skipping the preceding items.
+    """
+
+    if ordering is not None:
+        keyset_paginator = KeysetPaginator(items, items_per_page, ordering)
+
+        keyset_page_number = max(int(page_number), 1) if page_number.isdigit() else 1
+
+        # Without a cursor, pages past the (cached) count start over
+        if cursor is None and keyset_page_number > keyset_paginator.num_pages:
+            keyset_page_number = 1
+
+        return PaginatorPageWithElidedPageRange(
+            page=keyset_paginator.keyset_page(keyset_page_number, cursor),
+            # The cached count may lag behind the pages reached by cursor
+            elided_page_range=keyset_paginator.get_elided_page_range(
+                min(keyset_page_number, keyset_paginator.num_pages),
+            ),
+        )
 
     paginator: Paginator = Paginator(items, items_per_page)
 
@@ -1,11 +1,19 @@
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.paginator import Paginator
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django_stubs_ext import QuerySetAny
 
 from accounts.factories import UserFactory
 
-from .helpers import get_paginated_items, PaginatorPageWithElidedPageRange
+from .helpers import (
+    get_paginated_items,
+    KeysetPage,
+    PaginatorPageWithElidedPageRange,
+)
 
 User = get_user_model()
 
@@ -139,3 +147,167 @@ class GetPaginatedItemsTests(TestCase):
                 23,
             ],
         )
+
+
+class KeysetPaginationTests(TestCase):
+    users: QuerySetAny
+
+    @classmethod
+    def setUpTestData(cls) -> None:
+        UserFactory.create_batch(50)
+        cls.users = User.objects.all()
+
+    def setUp(self) -> None:
+        cache.clear()
+
+    def follow_next_cursors(self, ordering: list[str]) -> list[int]:
+        """Get the user IDs of every page, following the next page cursors."""
+        result = get_paginated_items(self.users, items_per_page=9, ordering=ordering)
+        user_ids = [user.id for user in result.page]
+
+        while result.page.has_next():
+            result = get_paginated_items(
+                self.users,
+                items_per_page=9,
+                page_number=str(result.page.next_page_number()),
+                ordering=ordering,
+                cursor=result.page.next_cursor,
+            )
+            user_ids += [user.id for user in result.page]
+
+        return user_ids
+
+    def test_next_cursors_visit_every_item_in_order(self) -> None:
+        self.assertEqual(
+            self.follow_next_cursors(["email", "id"]),
+            list(self.users.order_by("email", "id").values_list("id", flat=True)),
+        )
+
+    def test_next_cursors_with_mixed_sort_directions(self) -> None:
+        self.assertEqual(
+            self.follow_next_cursors(["is_staff", "-email", "id"]),
+            list(
+                self.users.order_by("is_staff", "-email", "id").values_list(
+                    "id",
+                    flat=True,
+                ),
+            ),
+        )
+
+    def test_next_cursors_with_null_sort_keys(self) -> None:
+        self.users.filter(id__in=self.users.order_by("id")[:20]).update(
+            last_login=timezone.now(),
+        )
+
+        for ordering in (["last_login", "id"], ["-last_login", "id"]):
+            self.assertEqual(
+                self.follow_next_cursors(ordering),
+                list(self.users.order_by(*ordering).values_list("id", flat=True)),
+            )
+
+    def test_previous_cursor_with_null_sort_keys(self) -> None:
+        self.users.filter(id__in=self.users.order_by("id")[:5]).update(
+            last_login=timezone.now(),
+        )
+        ordering = ["last_login", "id"]
+
+        first_result = get_paginated_items(
+            self.users,
+            items_per_page=9,
+            ordering=ordering,
+        )
+        second_result = get_paginated_items(
+            self.users,
+            items_per_page=9,
+            page_number="2",
+            ordering=ordering,
+            cursor=first_result.page.next_cursor,
+        )
+        previous_result = get_paginated_items(
+            self.users,
+            items_per_page=9,
+            page_number="1",
+            ordering=ordering,
+            cursor=second_result.page.previous_cursor,
+        )
+
+        self.assertEqual(list(previous_result.page), list(first_result.page))
+        self.assertFalse(previous_result.page.has_previous())
+
+    def test_previous_cursor_returns_previous_page(self) -> None:
+        first_result = get_paginated_items(
+            self.users,
+            items_per_page=9,
+            ordering=["id"],
+        )
+        second_result = get_paginated_items(
+            self.users,
+            items_per_page=9,
+            page_number="2",
+            ordering=["id"],
+            cursor=first_result.page.next_cursor,
+        )
+        previous_result = get_paginated_items(
+            self.users,
+            items_per_page=9,
+            page_number="1",
+            ordering=["id"],
+            cursor=second_result.page.previous_cursor,
+        )
+
+        self.assertEqual(list(previous_result.page), list(first_result.page))
+        self.assertEqual(previous_result.page.number, 1)
+        self.assertFalse(previous_result.page.has_previous())
+        self.assertTrue(previous_result.page.has_next())
+
+    def test_page_number_without_cursor_matches_paginator(self) -> None:
+        result = get_paginated_items(
+            self.users,
+            items_per_page=9,
+            page_number="3",
+            ordering=["id"],
+        )
+
+        self.assertIsInstance(result.page, KeysetPage)
+        self.assertEqual(
+            list(result.page),
+            list(Paginator(self.users.order_by("id"), 9).page(3)),
+        )
+        self.assertEqual(result.page.paginator.num_pages, 6)
+        self.assertEqual(list(result.elided_page_range), [1, 2, 3, 4, 5, 6])
+
+    def test_invalid_cursor_falls_back_to_page_number(self) -> None:
+        result = get_paginated_items(
+            self.users,
+            items_per_page=9,
+            page_number="2",
+            ordering=["id"],
+            cursor="not-a-cursor",
+        )
+
+        self.assertEqual(
+            list(result.page),
+            list(Paginator(self.users.order_by("id"), 9).page(2)),
+        )
+
+    def test_cursor_pages_seek_without_count_or_offset(self) -> None:
+        first_result = get_paginated_items(
+            self.users,
+            items_per_page=9,
+            ordering=["id"],
+        )
+        next_cursor = first_result.page.next_cursor
+
+        with CaptureQueriesContext(connection) as queries:
+            result = get_paginated_items(
+                self.users,
+                items_per_page=9,
+                page_number="2",
+                ordering=["id"],
+                cursor=next_cursor,
+            )
+            list(result.elided_page_range)
+
+        # The count is cached, so only the page itself is queried
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn("OFFSET", queries[0]["sql"])
@@ -0,0 +1,209 @@
+"""Index the text of archive issue scans, page by page, for full-text search.
+
+Issue files are named by the Internet Archive identifier of their issue,
+e.g. `westernfriend1975jan.pdf`. Text files hold OCR text with pages
+separated by form feeds, as written by `pdftotext`, and PDFs are converted
+with `pdftotext` from Poppler, which must be installed to index them.
+
+Extracting text is the slow part, so it runs in worker processes, while
+the main process writes the pages to the database.
+"""
+import hashlib
+import subprocess  # nosec - runs pdftotext with a file path, without a shell
+from collections.abc import Iterable, Iterator
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+
+from django.contrib.postgres.search import SearchVector
+from django.db import transaction
+
+from magazine.models import ArchiveIssue
+
+from .models import SEARCH_CONFIG, ArchiveIssuePageEntry, ArchiveIssueTextSource
+
+ARCHIVE_TEXT_FILE_SUFFIXES = {".pdf", ".txt"}
+
+# Internet Archive names OCR text files after the item, with this suffix
+INTERNET_ARCHIVE_OCR_SUFFIX = "_djvu"
+
+PAGE_SEPARATOR = "\f"
+
+
+@dataclass
+class ArchiveIssueText:
+    """The page texts extracted from an issue file, if the file changed."""
+
+    path: Path
+    file_hash: str
+    page_texts: list[str] | None
+
+
+def get_internet_archive_identifier(path: Path) -> str:
+    return path.stem.removesuffix(INTERNET_ARCHIVE_OCR_SUFFIX)
+
+
+def get_file_hash(path: Path) -> str:
+    file_hash = hashlib.sha256()
+
+    with path.open("rb") as file:
+        while chunk := file.read(1024 * 1024):
+            file_hash.update(chunk)
+
+    return file_hash.hexdigest()
+
+
+def extract_page_texts(path: Path) -> list[str]:
+    """Get the text of each page of an issue file, with whitespace collapsed."""
+    if path.suffix.lower() == ".pdf":
+        text = subprocess.run(  # nosec
+            ["pdftotext", "-enc", "UTF-8", str(path), "-"],
+            check=True,
+            capture_output=True,
+        ).stdout.decode()
+    else:
+        text = path.read_text(errors="replace")
+
+    page_texts = [
+        " ".join(page_text.split()) for page_text in text.split(PAGE_SEPARATOR)
+    ]
+
+    # pdftotext ends the last page with a separator too
+    if len(page_texts) > 1 and not page_texts[-1]:
+        page_texts.pop()
+
+    return page_texts
+
+
+def read_archive_issue_text(
+    path: Path,
+    indexed_file_hash: str | None,
+) -> ArchiveIssueText:
+    """Extract the page texts of a file, unless it was indexed with the hash."""
+    file_hash = get_file_hash(path)
+
+    if file_hash == indexed_file_hash:
+        return ArchiveIssueText(path=path, file_hash=file_hash, page_texts=None)
+
+    return ArchiveIssueText(
+        path=path,
+        file_hash=file_hash,
+        page_texts=extract_page_texts(path),
+    )
+
+
+def read_archive_issue_texts(
+    paths_and_hashes: list[tuple[Path, str | None]],
+    workers: int,
+) -> Iterator[ArchiveIssueText]:
+    """Read issue files in worker processes, or in this one for one worker."""
+    paths = [path for path, _ in paths_and_hashes]
+    indexed_file_hashes = [file_hash for _, file_hash in paths_and_hashes]
+
+    if workers <= 1:
+        yield from map(read_archive_issue_text, paths, indexed_file_hashes)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(
+            read_archive_issue_text,
+            paths,
+            indexed_file_hashes,
+        )
+
+
+def update_archive_issue_page_entries(
+    issue: ArchiveIssue,
+    file_hash: str,
+    page_texts: list[str],
+) -> None:
+    """Replace the page entries of an issue, computing their search vectors
+    with one query."""
+    with transaction.atomic():
+        ArchiveIssuePageEntry.objects.filter(issue=issue).delete()
+        ArchiveIssuePageEntry.objects.bulk_create(
+            [
+                ArchiveIssuePageEntry(
+                    issue=issue,
+                    page_number=page_number,
+                    text=page_text,
+                )
+                for page_number, page_text in enumerate(page_texts, start=1)
+                if page_text
+            ],
+        )
+        ArchiveIssuePageEntry.objects.filter(issue=issue).update(
+            search_vector=SearchVector("text", config=SEARCH_CONFIG),
+        )
+        ArchiveIssueTextSource.objects.update_or_create(
+            issue=issue,
+            defaults={"file_hash": file_hash, "page_count": len(page_texts)},
+        )
+
+
+@dataclass
+class ArchiveTextIndexResult:
+    indexed: int = 0
+    unchanged: int = 0
+    unmatched: int = 0
+    duplicates: int = 0
+
+
+def index_archive_issue_files(
+    paths: Iterable[Path],
+    workers: int = 1,
+    force: bool = False,
+) -> ArchiveTextIndexResult:
+    """Index the page texts of issue files, skipping unchanged files.
+
+    Files that don't match the identifier of an archive issue are counted
+    as unmatched, and files indexed with the same hash as unchanged, unless
+    indexing is forced. Only the first file of each issue is indexed, e.g.
+    of a PDF and its OCR text.
+    """
+    paths = list(paths)
+    result = ArchiveTextIndexResult()
+
+    issues_by_identifier = ArchiveIssue.objects.in_bulk(
+        [get_internet_archive_identifier(path) for path in paths],
+        field_name="internet_archive_identifier",
+    )
+    indexed_file_hashes = (
+        {}
+        if force
+        else dict(
+            ArchiveIssueTextSource.objects.filter(
+                issue__in=issues_by_identifier.values(),
+            ).values_list("issue_id", "file_hash"),
+        )
+    )
+
+    paths_and_hashes = []
+    issue_ids_with_files = set()
+
+    for path in paths:
+        issue = issues_by_identifier.get(get_internet_archive_identifier(path))
+
+        if issue is None:
+            result.unmatched += 1
+        elif issue.pk in issue_ids_with_files:
+            result.duplicates += 1
+        else:
+            paths_and_hashes.append((path, indexed_file_hashes.get(issue.pk)))
+            issue_ids_with_files.add(issue.pk)
+
+    for archive_issue_text in read_archive_issue_texts(paths_and_hashes, workers):
+        if archive_issue_text.page_texts is None:
+            result.unchanged += 1
+            continue
+
+        update_archive_issue_page_entries(
+            issues_by_identifier[
+                get_internet_archive_identifier(archive_issue_text.path)
+            ],
+            archive_issue_text.file_hash,
+            archive_issue_text.page_texts,
+        )
+        result.indexed += 1
+
+    return result
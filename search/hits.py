@@ -0,0 +1,182 @@
+"""Record search query hits in a buffer, flushing them to the database in bulk.
+
+Recording each hit as it happens runs an upsert and an update on the same
+popular query rows for every search, which serialize on row locks under
+load. Instead, hits are counted in process and written by a background
+thread at every flush interval, so popular query reports lag by at most
+the flush interval. Hits counted since the last flush are lost if the
+process is killed without exiting, and hits that can't be written after a
+few flushes are dropped, so they don't block the hits recorded after them.
+"""
+import atexit
+import logging
+import os
+import threading
+from collections import Counter
+from collections.abc import Mapping
+from datetime import date
+
+from django.db import connection, transaction
+from django.utils import timezone
+from wagtail.search.models import Query, QueryDailyHits
+from wagtail.search.utils import MAX_QUERY_STRING_LENGTH, normalise_query_string
+
+logger = logging.getLogger(__name__)
+
+SEARCH_HITS_FLUSH_INTERVAL = 60  # seconds
+SEARCH_HITS_MAX_BUFFERED = 1000
+SEARCH_HITS_MAX_FLUSH_ATTEMPTS = 3
+
+
+def write_search_hits(hits: Mapping[tuple[str, date], int]) -> None:
+    """Add hit counts, by normalized query string and date, to the database.
+
+    Missing queries are created in one statement, and the daily hits are
+    incremented with a single upsert, rather than one of each per hit.
+    """
+    if not hits:
+        return
+
+    query_strings = {query_string for query_string, _ in hits}
+
+    with transaction.atomic():
+        Query.objects.bulk_create(
+            [Query(query_string=query_string) for query_string in query_strings],
+            ignore_conflicts=True,
+        )
+        query_ids = dict(
+            Query.objects.filter(
+                query_string__in=query_strings,
+            ).values_list("query_string", "id"),
+        )
+
+        # Sort rows, so concurrent flushes lock them in the same order
+        rows = sorted(
+            (query_ids[query_string], hit_date, hit_count)
+            for (query_string, hit_date), hit_count in hits.items()
+        )
+
+        # The ORM can't add to the existing count on conflict
+        table = QueryDailyHits._meta.db_table
+        values = ", ".join(["(%s, %s, %s)"] * len(rows))
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {table} (query_id, date, hits) VALUES {values} "
+                "ON CONFLICT (query_id, date) "
+                f"DO UPDATE SET hits = {table}.hits + EXCLUDED.hits",
+                [value for row in rows for value in row],
+            )
+
+
+class SearchHitBuffer:
+    """Count search hits in memory until the next flush.
+
+    A flusher thread flushes the buffer at every flush interval, and as soon
+    as it holds `max_buffered` distinct queries, so searches don't wait for
+    the flush. The buffer is also flushed when the process exits.
+    """
+
+    def __init__(
+        self,
+        flush_interval: float = SEARCH_HITS_FLUSH_INTERVAL,
+        max_buffered: int = SEARCH_HITS_MAX_BUFFERED,
+        max_flush_attempts: int = SEARCH_HITS_MAX_FLUSH_ATTEMPTS,
+    ) -> None:
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self.max_flush_attempts = max_flush_attempts
+        self.failed_flushes = 0
+        self.hits: Counter[tuple[str, date]] = Counter()
+        self.lock = threading.Lock()
+        self.flush_requested = threading.Event()
+        # The process the flusher thread runs in, since forked processes,
+        # e.g. gunicorn workers, don't inherit the thread
+        self.flusher_pid: int | None = None
+
+    def add_hit(self, query_string: str, hit_date: date | None = None) -> None:
+        # Postgres can't store NUL characters, and lowercasing can lengthen
+        # the query string after it is truncated
+        query_string = normalise_query_string(query_string.replace("\x00", ""))
+        query_string = query_string[:MAX_QUERY_STRING_LENGTH]
+
+        if not query_string:
+            return
+
+        if hit_date is None:
+            hit_date = timezone.now().date()
+
+        with self.lock:
+            self.hits[(query_string, hit_date)] += 1
+
+            if len(self.hits) >= self.max_buffered:
+                self.flush_requested.set()
+
+    def start_flusher(self) -> None:
+        """Start the flusher thread of this process, unless it is running."""
+        with self.lock:
+            if self.flusher_pid == os.getpid():
+                return
+
+            self.flusher_pid = os.getpid()
+
+        threading.Thread(
+            target=self.run_flusher,
+            name="search-hits-flusher",
+            daemon=True,
+        ).start()
+
+    def run_flusher(self) -> None:
+        while True:
+            try:
+                self.wait_and_flush()
+            finally:
+                # The thread's connection isn't closed by the request cycle
+                connection.close()
+
+    def wait_and_flush(self) -> None:
+        """Wait for the flush interval, or until the buffer is full, then
+        flush it."""
+        self.flush_requested.wait(self.flush_interval)
+        self.flush_requested.clear()
+        self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered hits, keeping them for the next flush on errors.
+
+        Hits are dropped after `max_flush_attempts` failed flushes in a row.
+        """
+        with self.lock:
+            hits = self.hits
+            self.hits = Counter()
+
+        try:
+            write_search_hits(hits)
+        except Exception:
+            self.failed_flushes += 1
+
+            if self.failed_flushes >= self.max_flush_attempts:
+                logger.exception(
+                    "Dropping %s search hits after %s failed flushes",
+                    len(hits),
+                    self.failed_flushes,
+                )
+                self.failed_flushes = 0
+                return
+
+            logger.exception("Could not flush search hits")
+
+            with self.lock:
+                self.hits.update(hits)
+        else:
+            self.failed_flushes = 0
+
+
+search_hit_buffer = SearchHitBuffer()
+
+atexit.register(search_hit_buffer.flush)
+
+
+def record_search_hit(query_string: str) -> None:
+    search_hit_buffer.start_flusher()
+    search_hit_buffer.add_hit(query_string)
@@ -0,0 +1,142 @@
+"""Django management command to benchmark full-text search latency."""
+import random
+import statistics
+import time
+from itertools import islice
+
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import connection, transaction
+from wagtail.models import Locale, Page
+
+from pagination.helpers import get_paginated_items
+from search.models import (
+    WEIGHTED_SEARCH_VECTOR,
+    PageSearchEntry,
+    get_search_result_pages,
+    search_pages,
+)
+
+BATCH_SIZE = 5000
+
+VOCABULARY = (
+    "friends meeting worship silence testimony peace simplicity integrity "
+    "community equality stewardship service witness spirit light truth "
+    "quaker journal minute clerk yearly quarterly monthly epistle query "
+    "discernment leading concern clearness committee membership attender "
+    "ministry prayer faith practice history archive magazine article "
+    "library book review poem letter editor issue season garden water "
+    "justice climate prison school family children elders youth gathering "
+    "retreat travel mission relief education health labor land harvest"
+).split()
+
+
+def generate_text(word_count: int) -> str:
+    return " ".join(random.choices(VOCABULARY, k=word_count))
+
+
+class Command(BaseCommand):
+    """Django management command to benchmark full-text search latency."""
+
+    help = (
+        "Measure p50/p95 search latency over a synthetic corpus, "
+        "which is rolled back afterwards"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--pages",
+            type=int,
+            default=100_000,
+            help="Number of synthetic pages to index",
+        )
+        parser.add_argument(
+            "--queries",
+            type=int,
+            default=200,
+            help="Number of search queries to time",
+        )
+        parser.add_argument(
+            "--seed",
+            type=int,
+            default=0,
+            help="Seed for the synthetic corpus and queries",
+        )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        random.seed(options["seed"])  # type: ignore
+
+        with transaction.atomic():
+            self.create_corpus(options["pages"])  # type: ignore
+
+            latencies = [
+                self.time_search(generate_text(random.randint(1, 2)))
+                for _ in range(options["queries"])  # type: ignore
+            ]
+
+            # Leave the database as it was
+            transaction.set_rollback(True)
+
+        quantiles = statistics.quantiles(latencies, n=100)
+
+        self.stdout.write(
+            f"{len(latencies)} queries over {options['pages']} pages: "
+            f"p50 {quantiles[49]:.1f}ms, p95 {quantiles[94]:.1f}ms",
+        )
+
+    def create_corpus(self, page_count: int) -> None:
+        """Create synthetic pages under the root page, with search entries."""
+        root_page = Page.get_first_root_node()
+        last_child = root_page.get_last_child()
+        first_step = (
+            1
+            if last_child is None
+            else Page._str2int(last_child.path[-Page.steplen :]) + 1
+        )
+        content_type = ContentType.objects.get_for_model(Page)
+        locale = Locale.get_default()
+
+        pages = (
+            Page(
+                title=(title := generate_text(5)),
+                draft_title=title,
+                slug=f"search-benchmark-{step}",
+                path=Page._get_path(root_page.path, 2, step),
+                depth=2,
+                url_path=f"{root_page.url_path}search-benchmark-{step}/",
+                content_type=content_type,
+                locale=locale,
+                live=True,
+            )
+            for step in range(first_step, first_step + page_count)
+        )
+
+        while batch := list(islice(pages, BATCH_SIZE)):
+            created_pages = Page.objects.bulk_create(batch)
+
+            PageSearchEntry.objects.bulk_create(
+                [
+                    PageSearchEntry(
+                        page=page,
+                        title=page.title,
+                        keywords=generate_text(3),
+                        teaser=generate_text(25),
+                        body=generate_text(200),
+                    )
+                    for page in created_pages
+                ],
+            )
+
+        PageSearchEntry.objects.update(search_vector=WEIGHTED_SEARCH_VECTOR)
+
+        with connection.cursor() as cursor:
+            cursor.execute(f"ANALYZE {PageSearchEntry._meta.db_table}")
+
+    def time_search(self, query: str) -> float:
+        """Time a search the way the search view runs it, in milliseconds."""
+        start_time = time.perf_counter()
+
+        paginated_search_results = get_paginated_items(search_pages(query), 10)
+        get_search_result_pages(paginated_search_results.page, query)
+
+        return (time.perf_counter() - start_time) * 1000
@@ -0,0 +1,57 @@
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from search.archive_text import ARCHIVE_TEXT_FILE_SUFFIXES, index_archive_issue_files
+
+
+class Command(BaseCommand):
+    help = (
+        "Index the page texts of archive issue PDFs or OCR text files, "
+        "named by Internet Archive identifier, for full-text search"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "directory",
+            type=Path,
+            help="Directory of issue files, searched recursively",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=4,
+            help="Number of processes extracting text",
+        )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Index files that are unchanged since they were last indexed",
+        )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        directory: Path = options["directory"]  # type: ignore
+
+        if not directory.is_dir():
+            raise CommandError(f"{directory} is not a directory")
+
+        paths = sorted(
+            path
+            for path in directory.rglob("*")
+            if path.suffix.lower() in ARCHIVE_TEXT_FILE_SUFFIXES
+        )
+
+        result = index_archive_issue_files(
+            paths,
+            workers=options["workers"],  # type: ignore
+            force=options["force"],  # type: ignore
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {result.indexed} archive issues, "
+                f"skipped {result.unchanged} unchanged files, "
+                f"{result.duplicates} further files of the same issues "
+                f"and {result.unmatched} files without an archive issue",
+            ),
+        )
@@ -0,0 +1,41 @@
+from itertools import islice
+
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import transaction
+from wagtail.models import Page
+
+from search.models import PageSearchEntry, update_page_search_entries
+
+
+class Command(BaseCommand):
+    help = "Rebuild the full-text search entries of live pages"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of pages to index per query",
+        )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        batch_size: int = options["batch_size"]  # type: ignore
+        pages = (
+            Page.objects.live()
+            .filter(depth__gt=1)
+            .specific()
+            .iterator(chunk_size=batch_size)
+        )
+        indexed = 0
+
+        with transaction.atomic():
+            # Remove entries of pages that are no longer live
+            PageSearchEntry.objects.filter(page__live=False).delete()
+
+            while batch := list(islice(pages, batch_size)):
+                update_page_search_entries(batch)
+                indexed += len(batch)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt search entries for {indexed} pages"),
+        )
@@ -0,0 +1,48 @@
+# Generated by Django 4.2.4 on 2026-10-18 07:21
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    initial = True
+
+    dependencies = [
+        ("wagtailcore", "0089_log_entry_data_json_null_to_object"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PageSearchEntry",
+            fields=[
+                (
+                    "page",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="wagtailcore.page",
+                    ),
+                ),
+                ("title", models.TextField()),
+                ("keywords", models.TextField(blank=True)),
+                ("teaser", models.TextField(blank=True)),
+                ("body", models.TextField(blank=True)),
+                (
+                    "search_vector",
+                    django.contrib.postgres.search.SearchVectorField(null=True),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "page search entries",
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["search_vector"], name="search_page_search__d3d12e_gin"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,76 @@
+# Generated by Django 4.2.4 on 2026-10-18 08:15
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("magazine", "0030_archiveissue_magazine_ar_publica_6bcb6c_idx"),
+        ("search", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchiveIssueTextSource",
+            fields=[
+                (
+                    "issue",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="magazine.archiveissue",
+                    ),
+                ),
+                ("file_hash", models.CharField(max_length=64)),
+                ("page_count", models.PositiveIntegerField()),
+                ("indexed_at", models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="ArchiveIssuePageEntry",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("page_number", models.PositiveIntegerField()),
+                ("text", models.TextField()),
+                (
+                    "search_vector",
+                    django.contrib.postgres.search.SearchVectorField(null=True),
+                ),
+                (
+                    "issue",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="magazine.archiveissue",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name_plural": "archive issue page entries",
+                "indexes": [
+                    django.contrib.postgres.indexes.GinIndex(
+                        fields=["search_vector"], name="search_arch_search__fa01be_gin"
+                    )
+                ],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="archiveissuepageentry",
+            constraint=models.UniqueConstraint(
+                fields=("issue", "page_number"), name="unique_archive_issue_page_entry"
+            ),
+        ),
+    ]
@@ -0,0 +1,444 @@
+from collections import defaultdict
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from django.contrib.contenttypes.models import ContentType
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import (
+    SearchHeadline,
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    SearchVectorField,
+)
+from django.db import models
+from django.db.models import Case, F, Manager, Q, QuerySet, Value, When
+from django.db.models.functions import Concat
+from django.utils.html import escape, strip_tags
+from django.utils.safestring import SafeString, mark_safe
+from wagtail.models import Page
+from wagtail.search import index
+
+from magazine.models import ArchiveArticle, MagazineAccessTierChoices
+
+SEARCH_CONFIG = "english"
+
+# Fields with their own weight, which are left out of the body text
+WEIGHTED_FIELD_NAMES = {"title", "teaser", "authors", "tags"}
+
+SEARCH_DOCUMENT_FIELDS = ["title", "keywords", "teaser", "body"]
+
+# Postgres supports four weights, from A (highest) to D (lowest)
+WEIGHTED_SEARCH_VECTOR = (
+    SearchVector("title", weight="A", config=SEARCH_CONFIG)
+    + SearchVector("keywords", weight="B", config=SEARCH_CONFIG)
+    + SearchVector("teaser", weight="C", config=SEARCH_CONFIG)
+    + SearchVector("body", weight="D", config=SEARCH_CONFIG)
+)
+
+# Featured articles are free to read, whatever the access tier of their issue
+SUBSCRIBER_ONLY_ARTICLE = Q(
+    page__magazinearticle__access_tier=MagazineAccessTierChoices.SUBSCRIBERS,
+    page__magazinearticle__is_featured=False,
+)
+
+SEARCH_SNIPPET_START = "<mark>"
+SEARCH_SNIPPET_STOP = "</mark>"
+
+
+class PageSearchEntry(models.Model):
+    """The full-text search document of a live page.
+
+    The text of each page is split by weight into title, keywords (author
+    names and tags), teaser and body, and combined into a stored, GIN
+    indexed search vector, so search results can be ranked and paginated
+    in SQL. The text is kept to build highlighted snippets.
+    """
+
+    page = models.OneToOneField(
+        "wagtailcore.Page",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="+",
+    )
+    title = models.TextField()
+    keywords = models.TextField(blank=True)
+    teaser = models.TextField(blank=True)
+    body = models.TextField(blank=True)
+    search_vector = SearchVectorField(null=True)
+
+    class Meta:
+        indexes = [
+            GinIndex(fields=["search_vector"]),
+        ]
+        verbose_name_plural = "page search entries"
+
+
+class ArchiveIssueTextSource(models.Model):
+    """The scan or OCR text file indexed for an archive issue.
+
+    The file is identified by a hash of its content, so re-indexing skips
+    the files that haven't changed.
+    """
+
+    issue = models.OneToOneField(
+        "magazine.ArchiveIssue",
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="+",
+    )
+    file_hash = models.CharField(max_length=64)
+    page_count = models.PositiveIntegerField()
+    indexed_at = models.DateTimeField(auto_now=True)
+
+
+class ArchiveIssuePageEntry(models.Model):
+    """The full-text search document of one page of an archive issue scan.
+
+    Pages are numbered as in the PDF, from one, so hits can be linked to
+    the archive articles that span them, and to the page in the viewer.
+    Blank pages have no entry.
+    """
+
+    issue = models.ForeignKey(
+        "magazine.ArchiveIssue",
+        on_delete=models.CASCADE,
+        related_name="+",
+    )
+    page_number = models.PositiveIntegerField()
+    text = models.TextField()
+    search_vector = SearchVectorField(null=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["issue", "page_number"],
+                name="unique_archive_issue_page_entry",
+            ),
+        ]
+        indexes = [
+            GinIndex(fields=["search_vector"]),
+        ]
+        verbose_name_plural = "archive issue page entries"
+
+
+def get_search_text(value: Any) -> str:
+    """Join the searchable content of a field value into plain text."""
+    if value is None:
+        return ""
+
+    if isinstance(value, str):
+        return strip_tags(value)
+
+    if isinstance(value, dict):
+        value = value.values()
+
+    if isinstance(value, Iterable):
+        return " ".join(get_search_text(item) for item in value)
+
+    return str(value)
+
+
+def iterate_search_field_texts(
+    obj: models.Model,
+    search_fields: Iterable[index.BaseField],
+    excluded_field_names: set[str] | None = None,
+) -> Iterator[str]:
+    """Yield the text of the search fields of an object and its relations."""
+    excluded_field_names = excluded_field_names or set()
+
+    for search_field in search_fields:
+        if search_field.field_name in excluded_field_names:
+            continue
+
+        if isinstance(search_field, index.SearchField):
+            yield get_search_text(search_field.get_value(obj))
+
+        elif isinstance(search_field, index.RelatedFields):
+            related_value = search_field.get_value(obj)
+
+            if related_value is None:
+                continue
+
+            if isinstance(related_value, Manager):
+                related_objects = related_value.all()
+            elif callable(related_value):
+                related_objects = [related_value()]
+            else:
+                related_objects = [related_value]
+
+            for related_object in related_objects:
+                yield from iterate_search_field_texts(
+                    related_object,
+                    search_field.fields,
+                )
+
+
+def get_search_document(page: Page) -> dict[str, str]:
+    """Get the text of a specific page, split by search weight."""
+    keywords = []
+
+    # Magazine articles, library items and books have authors
+    if hasattr(page, "authors"):
+        keywords += [
+            page_author.author.title
+            for page_author in page.authors.all()
+            if page_author.author is not None
+        ]
+
+    if hasattr(page, "tags"):
+        keywords += [tag.name for tag in page.tags.all()]
+
+    body_texts = iterate_search_field_texts(
+        page,
+        page.get_search_fields(),
+        excluded_field_names=WEIGHTED_FIELD_NAMES,
+    )
+
+    return {
+        "title": page.title,
+        "keywords": " ".join(keywords),
+        "teaser": get_search_text(getattr(page, "teaser", None)),
+        "body": " ".join(text for text in body_texts if text),
+    }
+
+
+def update_page_search_entries(pages: Iterable[Page]) -> None:
+    """Add or update the search entries of specific pages.
+
+    Entries are upserted in one query and their search vectors are computed
+    in another, rather than once per page. Pages that are not live, and the
+    root page, have their entries removed.
+    """
+    pages = list(pages)
+
+    PageSearchEntry.objects.filter(
+        page_id__in=[page.pk for page in pages if not page.live or page.is_root()],
+    ).delete()
+
+    entries = [
+        PageSearchEntry(page_id=page.pk, **get_search_document(page))
+        for page in pages
+        if page.live and not page.is_root()
+    ]
+
+    if not entries:
+        return
+
+    PageSearchEntry.objects.bulk_create(
+        entries,
+        update_conflicts=True,
+        unique_fields=["page"],
+        update_fields=SEARCH_DOCUMENT_FIELDS,
+    )
+    PageSearchEntry.objects.filter(
+        page_id__in=[entry.page_id for entry in entries],
+    ).update(search_vector=WEIGHTED_SEARCH_VECTOR)
+
+
+def get_search_query(query_string: str) -> SearchQuery:
+    return SearchQuery(query_string, search_type="websearch", config=SEARCH_CONFIG)
+
+
+def exclude_subscriber_only_entries(
+    entries: QuerySet[PageSearchEntry],
+) -> QuerySet[PageSearchEntry]:
+    """Leave out the magazine issues and articles only subscribers can read.
+
+    Articles store the access tier of their issue, so this doesn't join
+    articles to their issues.
+    """
+    return entries.exclude(
+        page__magazineissue__access_tier=MagazineAccessTierChoices.SUBSCRIBERS,
+    ).exclude(SUBSCRIBER_ONLY_ARTICLE)
+
+
+def search_pages(
+    query_string: str,
+    public_access_only: bool = False,
+) -> QuerySet[PageSearchEntry]:
+    """Get the search entries matching a query, best matches first.
+
+    Ranks are normalized by document length, so long bodies that mention a
+    word in passing don't outrank pages about it.
+    """
+    search_query = get_search_query(query_string)
+
+    entries = PageSearchEntry.objects.filter(search_vector=search_query)
+
+    if public_access_only:
+        entries = exclude_subscriber_only_entries(entries)
+
+    return (
+        entries.annotate(
+            rank=SearchRank(F("search_vector"), search_query, normalization=Value(1)),
+        )
+        .order_by("-rank", "page_id")
+        .select_related("page")
+        .defer(*SEARCH_DOCUMENT_FIELDS, "search_vector")
+    )
+
+
+def format_search_snippet(snippet: str) -> SafeString:
+    """Escape a snippet, keeping only the highlight markers as HTML."""
+    return mark_safe(  # noqa: S308
+        escape(snippet)
+        .replace(escape(SEARCH_SNIPPET_START), SEARCH_SNIPPET_START)
+        .replace(escape(SEARCH_SNIPPET_STOP), SEARCH_SNIPPET_STOP),
+    )
+
+
+def get_specific_pages(pages: list[Page]) -> list[Page]:
+    """Get the specific instances of pages, keeping their order.
+
+    Pages are loaded with one query per content type, and page models can
+    load what their search template shows in bulk, by defining a
+    `prefetch_search_results` class method that takes a list of pages.
+    """
+    page_ids_by_content_type: dict[int, list[int]] = defaultdict(list)
+
+    for page in pages:
+        page_ids_by_content_type[page.content_type_id].append(page.pk)
+
+    specific_pages_by_id: dict[int, Page] = {}
+
+    for content_type_id, page_ids in page_ids_by_content_type.items():
+        content_type = ContentType.objects.get_for_id(content_type_id)
+        page_model = content_type.model_class()
+
+        # Pages of removed models keep their generic instance
+        if page_model is None:
+            continue
+
+        specific_pages = list(
+            page_model.objects.filter(pk__in=page_ids).defer_streamfields(),
+        )
+
+        if hasattr(page_model, "prefetch_search_results"):
+            page_model.prefetch_search_results(specific_pages)
+
+        for specific_page in specific_pages:
+            # Content types are cached, so set them rather than query each
+            specific_page.content_type = content_type
+            specific_pages_by_id[specific_page.pk] = specific_page
+
+    return [specific_pages_by_id.get(page.pk, page) for page in pages]
+
+
+def get_search_result_pages(
+    entries: Iterable[PageSearchEntry],
+    query_string: str,
+) -> list[Page]:
+    """Get the specific pages of search entries with highlighted snippets.
+
+    Snippets are only built for the given entries, e.g. a page of results,
+    since highlighting is much slower than matching. Snippets of articles
+    only subscribers can read are built from their teasers, so results
+    don't show their bodies.
+    """
+    pages = get_specific_pages([entry.page for entry in entries])
+
+    snippets = dict(
+        PageSearchEntry.objects.filter(page_id__in=[page.pk for page in pages])
+        .annotate(
+            snippet=SearchHeadline(
+                Case(
+                    When(SUBSCRIBER_ONLY_ARTICLE, then=F("teaser")),
+                    default=Concat("teaser", Value(" "), "body"),
+                    output_field=models.TextField(),
+                ),
+                get_search_query(query_string),
+                config=SEARCH_CONFIG,
+                start_sel=SEARCH_SNIPPET_START,
+                stop_sel=SEARCH_SNIPPET_STOP,
+                max_fragments=2,
+            ),
+        )
+        .values_list("page_id", "snippet"),
+    )
+
+    for page in pages:
+        page.search_snippet = format_search_snippet(snippets.get(page.pk) or "")
+
+    return pages
+
+
+def search_archive_issue_pages(
+    query_string: str,
+) -> QuerySet[ArchiveIssuePageEntry]:
+    """Get the archive issue pages matching a query, best matches first."""
+    search_query = get_search_query(query_string)
+
+    return (
+        ArchiveIssuePageEntry.objects.filter(search_vector=search_query)
+        .annotate(
+            rank=SearchRank(F("search_vector"), search_query, normalization=Value(1)),
+        )
+        .order_by("-rank", "issue_id", "page_number")
+        .select_related("issue")
+        .defer("text", "search_vector")
+    )
+
+
+def get_archive_article_on_page(
+    archive_articles: Iterable[ArchiveArticle],
+    page_number: int,
+) -> ArchiveArticle | None:
+    """Get the archive article that spans a PDF page of its issue.
+
+    Articles span from their first page to the first page of the next
+    article, so this is the last article that starts on or before the page.
+    """
+    article_on_page = None
+    article_on_page_start = 0
+
+    for archive_article in archive_articles:
+        start = archive_article.pdf_page_number or archive_article.toc_page_number
+
+        if start is not None and article_on_page_start < start <= page_number:
+            article_on_page = archive_article
+            article_on_page_start = start
+
+    return article_on_page
+
+
+def get_archive_page_hits(
+    entries: Iterable[ArchiveIssuePageEntry],
+    query_string: str,
+) -> list[ArchiveIssuePageEntry]:
+    """Add highlighted snippets and archive articles to archive page hits.
+
+    Snippets are built for the given entries only, and the articles of
+    their issues are loaded with one query.
+    """
+    entries = list(entries)
+    issue_ids = {entry.issue_id for entry in entries}
+
+    snippets = dict(
+        ArchiveIssuePageEntry.objects.filter(id__in=[entry.pk for entry in entries])
+        .annotate(
+            snippet=SearchHeadline(
+                "text",
+                get_search_query(query_string),
+                config=SEARCH_CONFIG,
+                start_sel=SEARCH_SNIPPET_START,
+                stop_sel=SEARCH_SNIPPET_STOP,
+                max_fragments=2,
+            ),
+        )
+        .values_list("id", "snippet"),
+    )
+
+    archive_articles_by_issue: dict[int, list[ArchiveArticle]] = defaultdict(list)
+
+    for archive_article in ArchiveArticle.objects.filter(issue_id__in=issue_ids):
+        archive_articles_by_issue[archive_article.issue_id].append(archive_article)
+
+    for entry in entries:
+        entry.search_snippet = format_search_snippet(snippets.get(entry.pk) or "")
+        entry.archive_article = get_archive_article_on_page(
+            archive_articles_by_issue[entry.issue_id],
+            entry.page_number,
+        )
+
+    return entries
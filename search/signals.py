@@ -0,0 +1,37 @@
+"""Keep the page search entries in step with saved pages."""
+from typing import Any
+
+from django.db.models import Model
+from django.db.models.signals import post_save
+from wagtail.models import Page
+
+from .models import update_page_search_entries
+
+
+def update_page_search_entry(
+    sender: type[Model],
+    instance: Model,
+    raw: bool = False,
+    update_fields: frozenset[str] | None = None,
+    **kwargs: Any,
+) -> None:
+    """Index a page whenever it is saved.
+
+    Pages are indexed on save rather than on publish, since the importers
+    create live pages without publishing them. Unpublishing saves the page,
+    which removes its entry. Entries of deleted pages cascade.
+    """
+    if raw or not isinstance(instance, Page):
+        return
+
+    if update_fields is not None:
+        # Saving a draft only updates some fields of the live page, while the
+        # instance holds the draft content, so index the page as stored
+        instance = Page.objects.get(pk=instance.pk)
+
+    update_page_search_entries([instance.specific])
+
+
+def connect_page_search_signals() -> None:
+    # Page models are subclasses, so listen to every sender
+    post_save.connect(update_page_search_entry)
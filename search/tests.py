@@ -1,12 +1,50 @@
+import datetime
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase, Client
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
-from wagtail.models import Page
-from wagtail.search.models import Query
+from wagtail.models import Page, Site
+from wagtail.rich_text import RichText
+from wagtail.search.models import Query, QueryDailyHits
 from unittest.mock import Mock, patch
 
+from contact.factories import PersonFactory
+from home.models import HomePage
+from library.models import LibraryIndexPage, LibraryItem, LibraryItemAuthor
+from magazine.models import (
+    ArchiveArticle,
+    ArchiveIssue,
+    DeepArchiveIndexPage,
+    MagazineArticle,
+    MagazineArticleAuthor,
+    MagazineDepartment,
+    MagazineDepartmentIndexPage,
+    MagazineIndexPage,
+    MagazineIssue,
+)
+from search.hits import SearchHitBuffer, write_search_hits
+from search.archive_text import index_archive_issue_files
+from search.models import (
+    ArchiveIssuePageEntry,
+    PageSearchEntry,
+    format_search_snippet,
+)
+from wf_pages.models import WfPage
+
 
 class SearchViewTestCase(TestCase):
     def setUp(self) -> None:
+        # Hits are flushed by a thread, outside of the test transaction
+        patcher = patch("search.views.record_search_hit")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
         self.client = Client()
 
         # get the root page
@@ -50,10 +88,10 @@ class SearchViewTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.context["paginated_search_results"].page), 3)
 
-    @patch.object(Query, "add_hit")
-    def test_search_query_hit(self, mock_add_hit: Mock) -> None:
+    @patch("search.views.record_search_hit")
+    def test_search_query_hit(self, mock_record_search_hit: Mock) -> None:
         self.client.get("/search/?query=Test")
-        mock_add_hit.assert_called_once()
+        mock_record_search_hit.assert_called_once_with("Test")
 
     def test_search_pagination_invalid_page(self) -> None:
         response = self.client.get("/search/?query=Test&page=abc")
@@ -64,3 +102,524 @@ class SearchViewTestCase(TestCase):
         response = self.client.get("/search/?query=Test&page=100")
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.context["paginated_search_results"].page.number, 1)
+
+
+class PageSearchEntryTestCase(TestCase):
+    def setUp(self) -> None:
+        # Hits are flushed by a thread, outside of the test transaction
+        patcher = patch("search.views.record_search_hit")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.client = Client()
+
+        root_page = Page.objects.first()
+
+        self.title_match = WfPage(
+            title="Silence",
+            body=[("rich_text", RichText("<p>On stillness</p>"))],
+        )
+        root_page.add_child(instance=self.title_match)
+
+        self.body_match = WfPage(
+            title="Gathering",
+            body=[
+                (
+                    "rich_text",
+                    RichText("<p>Worship began in expectant silence.</p>"),
+                ),
+            ],
+        )
+        root_page.add_child(instance=self.body_match)
+
+    def search(self, query: str) -> list[Page]:
+        response = self.client.get(reverse("search"), {"query": query})
+
+        return list(response.context["paginated_search_results"].page)
+
+    def test_saved_pages_are_indexed_by_weight(self) -> None:
+        self.body_match.tags.add("Quakerism")
+        self.body_match.save()
+
+        entry = PageSearchEntry.objects.get(page=self.body_match)
+
+        self.assertEqual(entry.title, "Gathering")
+        self.assertEqual(entry.keywords, "Quakerism")
+        self.assertIn("expectant silence", entry.body)
+        self.assertIsNotNone(entry.search_vector)
+
+    def test_title_match_ranks_above_body_match(self) -> None:
+        self.assertEqual(
+            [page.pk for page in self.search("silence")],
+            [self.title_match.pk, self.body_match.pk],
+        )
+
+    def test_search_results_have_highlighted_snippets(self) -> None:
+        results = self.search("silence")
+
+        self.assertIn("<mark>silence</mark>", results[1].search_snippet)
+
+    def test_format_search_snippet_escapes_html(self) -> None:
+        self.assertEqual(
+            format_search_snippet("<script>x</script> <mark>silence</mark>"),
+            "&lt;script&gt;x&lt;/script&gt; <mark>silence</mark>",
+        )
+
+    def test_unpublished_pages_are_removed(self) -> None:
+        self.body_match.unpublish()
+
+        self.assertFalse(
+            PageSearchEntry.objects.filter(page=self.body_match).exists(),
+        )
+        self.assertEqual(
+            [page.pk for page in self.search("silence")],
+            [self.title_match.pk],
+        )
+
+    def test_draft_changes_are_not_indexed(self) -> None:
+        self.title_match.title = "Draft title"
+        self.title_match.save_revision()
+
+        self.assertEqual(
+            PageSearchEntry.objects.get(page=self.title_match).title,
+            "Silence",
+        )
+
+    def test_rebuild_search_index(self) -> None:
+        PageSearchEntry.objects.all().delete()
+
+        call_command("rebuild_search_index", stdout=StringIO())
+
+        self.assertEqual(
+            [page.pk for page in self.search("silence")],
+            [self.title_match.pk, self.body_match.pk],
+        )
+
+    def test_benchmark_search(self) -> None:
+        entry_count = PageSearchEntry.objects.count()
+        out = StringIO()
+
+        call_command("benchmark_search", pages=50, queries=5, stdout=out)
+
+        self.assertIn("5 queries over 50 pages: p50", out.getvalue())
+        self.assertEqual(PageSearchEntry.objects.count(), entry_count)
+
+
+class SearchHitBufferTestCase(TestCase):
+    def setUp(self) -> None:
+        self.today = datetime.date(2023, 5, 1)
+
+    def get_hits(self) -> dict[tuple[str, datetime.date], int]:
+        return {
+            (daily_hits.query.query_string, daily_hits.date): daily_hits.hits
+            for daily_hits in QueryDailyHits.objects.select_related("query")
+        }
+
+    def test_hits_are_buffered_until_flush(self) -> None:
+        buffer = SearchHitBuffer(flush_interval=60)
+
+        buffer.add_hit("Silence", self.today)
+        buffer.add_hit("  silence ", self.today)
+        buffer.add_hit("Worship", self.today)
+
+        self.assertFalse(QueryDailyHits.objects.exists())
+
+        buffer.flush()
+
+        self.assertEqual(
+            self.get_hits(),
+            {("silence", self.today): 2, ("worship", self.today): 1},
+        )
+        self.assertEqual(buffer.hits, {})
+
+    def test_hits_are_flushed_after_interval(self) -> None:
+        buffer = SearchHitBuffer(flush_interval=0)
+
+        buffer.add_hit("Silence", self.today)
+
+        # The hit is written by the flusher, not the search
+        self.assertFalse(QueryDailyHits.objects.exists())
+
+        buffer.wait_and_flush()
+
+        self.assertEqual(self.get_hits(), {("silence", self.today): 1})
+
+    def test_hits_are_flushed_when_buffer_is_full(self) -> None:
+        buffer = SearchHitBuffer(flush_interval=60, max_buffered=2)
+
+        buffer.add_hit("Silence", self.today)
+        self.assertFalse(buffer.flush_requested.is_set())
+
+        buffer.add_hit("Worship", self.today)
+        self.assertTrue(buffer.flush_requested.is_set())
+
+        # The flusher doesn't wait for the interval
+        buffer.wait_and_flush()
+
+        self.assertEqual(len(self.get_hits()), 2)
+        self.assertFalse(buffer.flush_requested.is_set())
+
+    def test_flusher_is_started_once_per_process(self) -> None:
+        buffer = SearchHitBuffer()
+
+        with patch("search.hits.threading.Thread") as thread:
+            buffer.start_flusher()
+            buffer.start_flusher()
+
+            thread.assert_called_once()
+
+            # Forked processes start their own flusher
+            with patch("search.hits.os.getpid", return_value=-1):
+                buffer.start_flusher()
+
+        self.assertEqual(thread.call_count, 2)
+
+    def test_write_search_hits_adds_to_existing_hits(self) -> None:
+        QueryDailyHits.objects.create(
+            query=Query.objects.create(query_string="silence"),
+            date=self.today,
+            hits=5,
+        )
+
+        write_search_hits(
+            {
+                ("silence", self.today): 2,
+                ("silence", self.today + datetime.timedelta(days=1)): 1,
+                ("worship", self.today): 3,
+            },
+        )
+
+        self.assertEqual(
+            self.get_hits(),
+            {
+                ("silence", self.today): 7,
+                ("silence", self.today + datetime.timedelta(days=1)): 1,
+                ("worship", self.today): 3,
+            },
+        )
+
+    def test_write_search_hits_query_count_is_constant(self) -> None:
+        hits = {(f"query {number}", self.today): number for number in range(50)}
+
+        # A savepoint, then create queries, load their IDs and upsert the hits
+        with self.assertNumQueries(5):
+            write_search_hits(hits)
+
+    def test_failed_flush_keeps_hits(self) -> None:
+        buffer = SearchHitBuffer(flush_interval=60)
+        buffer.add_hit("Silence", self.today)
+
+        with patch("search.hits.write_search_hits", side_effect=Exception):
+            buffer.flush()
+
+        self.assertEqual(buffer.hits, {("silence", self.today): 1})
+
+    def test_repeatedly_failed_flushes_drop_hits(self) -> None:
+        buffer = SearchHitBuffer(flush_interval=60, max_flush_attempts=2)
+        buffer.add_hit("Silence", self.today)
+
+        with patch("search.hits.write_search_hits", side_effect=Exception):
+            buffer.flush()
+            buffer.flush()
+
+        self.assertEqual(buffer.hits, {})
+
+        buffer.add_hit("Worship", self.today)
+        buffer.flush()
+
+        self.assertEqual(self.get_hits(), {("worship", self.today): 1})
+
+    def test_query_strings_are_sanitized(self) -> None:
+        buffer = SearchHitBuffer(flush_interval=60)
+
+        buffer.add_hit("Sil\x00ence", self.today)
+        buffer.add_hit("a" * 300, self.today)
+        buffer.flush()
+
+        self.assertEqual(
+            self.get_hits(),
+            {("silence", self.today): 1, ("a" * 255, self.today): 1},
+        )
+
+
+class SearchResultPagesTestCase(TestCase):
+    def setUp(self) -> None:
+        self.client = Client()
+
+        site_root = Page.objects.get(id=2)
+
+        self.home_page = HomePage(title="Home")
+        site_root.add_child(instance=self.home_page)
+
+        Site.objects.all().update(root_page=self.home_page)
+
+        magazine_index = MagazineIndexPage(title="Magazine")
+        self.home_page.add_child(instance=magazine_index)
+
+        self.magazine_issue = MagazineIssue(
+            title="Issue",
+            publication_date=datetime.date(2023, 5, 1),
+        )
+        magazine_index.add_child(instance=self.magazine_issue)
+
+        department_index = MagazineDepartmentIndexPage(title="Departments")
+        magazine_index.add_child(instance=department_index)
+
+        self.magazine_department = MagazineDepartment(title="Department")
+        department_index.add_child(instance=self.magazine_department)
+
+        self.library_index = LibraryIndexPage(title="Library")
+        self.home_page.add_child(instance=self.library_index)
+
+        self.authors = PersonFactory.create_batch(2)
+
+    def add_results(self, number_of_results: int) -> None:
+        """Add magazine articles, library items and plain pages with authors."""
+        for _ in range(number_of_results):
+            article = self.magazine_issue.add_child(
+                instance=MagazineArticle(
+                    title="Quaker article",
+                    department=self.magazine_department,
+                    teaser="<p>A quaker teaser</p>",
+                ),
+            )
+            library_item = self.library_index.add_child(
+                instance=LibraryItem(title="Quaker library item"),
+            )
+            self.home_page.add_child(instance=WfPage(title="Quaker page", body=[]))
+
+            for author in self.authors:
+                MagazineArticleAuthor.objects.create(article=article, author=author)
+                LibraryItemAuthor.objects.create(
+                    library_item=library_item,
+                    author=author,
+                )
+
+    @patch("search.views.record_search_hit")
+    def test_search_results_are_specific(self, mock_record_search_hit: Mock) -> None:
+        self.add_results(1)
+
+        response = self.client.get(reverse("search"), {"query": "quaker"})
+        results = list(response.context["paginated_search_results"].page)
+
+        self.assertEqual(
+            {type(result) for result in results},
+            {MagazineArticle, LibraryItem, WfPage},
+        )
+        self.assertContains(response, self.authors[0].title)
+        self.assertContains(response, "Issue (May 2023)")
+
+    @patch("search.views.record_search_hit")
+    def test_search_query_count_is_constant(self, mock_record_search_hit: Mock) -> None:
+        """Test that a page of mixed results runs the same queries however
+        many results and authors it shows."""
+        self.add_results(1)
+        self.client.get(reverse("search"), {"query": "quaker"})
+
+        query_counts = []
+
+        for number_of_results in [0, 2]:
+            self.add_results(number_of_results)
+            cache.clear()
+
+            with CaptureQueriesContext(connection) as queries:
+                self.client.get(reverse("search"), {"query": "quaker"})
+
+            query_counts.append(len(queries))
+
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    @patch("search.views.record_search_hit")
+    def test_search_public_access_only(self, mock_record_search_hit: Mock) -> None:
+        """Test that subscriber only articles can be left out of results,
+        unless they are featured."""
+        self.add_results(1)
+
+        recent_issue = self.magazine_issue.get_parent().add_child(
+            instance=MagazineIssue(
+                title="Recent issue",
+                publication_date=datetime.date.today(),
+            ),
+        )
+
+        for title, is_featured in [
+            ("Quaker subscriber article", False),
+            ("Quaker featured article", True),
+        ]:
+            recent_issue.add_child(
+                instance=MagazineArticle(
+                    title=title,
+                    department=self.magazine_department,
+                    is_featured=is_featured,
+                ),
+            )
+
+        response = self.client.get(
+            reverse("search"),
+            {"query": "quaker", "access": "public"},
+        )
+        result_titles = {
+            result.title for result in response.context["paginated_search_results"].page
+        }
+
+        self.assertNotIn("Quaker subscriber article", result_titles)
+        self.assertIn("Quaker featured article", result_titles)
+        self.assertIn("Quaker article", result_titles)
+        self.assertIn("Quaker page", result_titles)
+
+    @patch("search.views.record_search_hit")
+    def test_snippets_leave_out_subscriber_only_bodies(
+        self,
+        mock_record_search_hit: Mock,
+    ) -> None:
+        recent_issue = self.magazine_issue.get_parent().add_child(
+            instance=MagazineIssue(
+                title="Recent issue",
+                publication_date=datetime.date.today(),
+            ),
+        )
+
+        for title, is_featured in [
+            ("Subscriber article", False),
+            ("Featured article", True),
+        ]:
+            recent_issue.add_child(
+                instance=MagazineArticle(
+                    title=title,
+                    department=self.magazine_department,
+                    is_featured=is_featured,
+                    teaser=f"<p>{title} teaser about stillness</p>",
+                    body=[
+                        (
+                            "rich_text",
+                            RichText(f"<p>{title} body about stillness</p>"),
+                        ),
+                    ],
+                ),
+            )
+
+        response = self.client.get(reverse("search"), {"query": "stillness"})
+        result_titles = {
+            result.title for result in response.context["paginated_search_results"].page
+        }
+
+        self.assertIn("Subscriber article", result_titles)
+        self.assertContains(response, "Subscriber article teaser about")
+        self.assertNotContains(response, "Subscriber article body")
+        self.assertContains(response, "Featured article body")
+
+
+class ArchiveIssueTextTestCase(TestCase):
+    def setUp(self) -> None:
+        self.client = Client()
+
+        site_root = Page.objects.get(id=2)
+
+        home_page = HomePage(title="Home")
+        site_root.add_child(instance=home_page)
+
+        Site.objects.all().update(root_page=home_page)
+
+        magazine_index = MagazineIndexPage(title="Magazine")
+        home_page.add_child(instance=magazine_index)
+
+        deep_archive_index = DeepArchiveIndexPage(title="Deep archive")
+        magazine_index.add_child(instance=deep_archive_index)
+
+        self.archive_issue = ArchiveIssue(
+            title="Friends Bulletin 1975",
+            internet_archive_identifier="friendsbulletin1975",
+            publication_date=datetime.date(1975, 1, 1),
+        )
+        deep_archive_index.add_child(instance=self.archive_issue)
+
+        ArchiveArticle.objects.create(
+            issue=self.archive_issue,
+            title="Editorial",
+            toc_page_number=1,
+        )
+        ArchiveArticle.objects.create(
+            issue=self.archive_issue,
+            title="Yearly meeting epistle",
+            toc_page_number=3,
+            pdf_page_number=2,
+        )
+
+        temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary_directory.cleanup)
+        self.directory = Path(temporary_directory.name)
+
+        self.issue_file = self.directory / "friendsbulletin1975_djvu.txt"
+        self.issue_file.write_text(
+            "Welcome to the bulletin\f"
+            "The epistle of the yearly meeting\n"
+            "speaks of gathered worship\f"
+            "\f"
+            "Notices of the monthly meeting\f",
+        )
+
+    def test_issue_pages_are_indexed(self) -> None:
+        output = StringIO()
+        call_command(
+            "index_archive_issue_text",
+            self.directory,
+            workers=2,
+            stdout=output,
+        )
+
+        self.assertIn("Indexed 1 archive issues", output.getvalue())
+        self.assertEqual(
+            list(
+                ArchiveIssuePageEntry.objects.order_by("page_number").values_list(
+                    "page_number",
+                    "text",
+                ),
+            ),
+            [
+                (1, "Welcome to the bulletin"),
+                (2, "The epistle of the yearly meeting speaks of gathered worship"),
+                (4, "Notices of the monthly meeting"),
+            ],
+        )
+
+    def test_unchanged_files_are_skipped(self) -> None:
+        (self.directory / "unknownissue.txt").write_text("No issue")
+
+        result = index_archive_issue_files([self.issue_file])
+        self.assertEqual(result.indexed, 1)
+
+        result = index_archive_issue_files(
+            [self.issue_file, self.directory / "unknownissue.txt"],
+        )
+        self.assertEqual(
+            (result.indexed, result.unchanged, result.unmatched), (0, 1, 1)
+        )
+
+        self.issue_file.write_text("A corrected scan")
+
+        result = index_archive_issue_files([self.issue_file])
+        self.assertEqual(result.indexed, 1)
+        self.assertEqual(
+            list(ArchiveIssuePageEntry.objects.values_list("text", flat=True)),
+            ["A corrected scan"],
+        )
+
+    @patch("search.views.record_search_hit")
+    def test_search_returns_archive_page_hits(
+        self,
+        mock_record_search_hit: Mock,
+    ) -> None:
+        index_archive_issue_files([self.issue_file])
+
+        response = self.client.get(reverse("search"), {"query": "worship"})
+        archive_page_hits = response.context["archive_page_hits"]
+
+        self.assertEqual(len(archive_page_hits), 1)
+        self.assertEqual(archive_page_hits[0].page_number, 2)
+        self.assertEqual(
+            archive_page_hits[0].archive_article.title,
+            "Yearly meeting epistle",
+        )
+        self.assertContains(response, "Friends Bulletin 1975, page 2")
+        self.assertContains(response, "gathered <mark>worship</mark>")
+        self.assertContains(response, "?pdf_page_number=2")
@@ -1,24 +1,33 @@
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import render
-from wagtail.models import Page
-from wagtail.search.models import Query
 
 from pagination.helpers import get_paginated_items
+from search.hits import record_search_hit
+from search.models import (
+    PageSearchEntry,
+    get_archive_page_hits,
+    get_search_result_pages,
+    search_archive_issue_pages,
+    search_pages,
+)
+
+# Archive page hits are shown above the first page of results
+ARCHIVE_PAGE_HITS_PER_SEARCH = 5
 
 
 def search(request: HttpRequest) -> HttpResponse:
     search_query = request.GET.get("query", None)
     page = request.GET.get("page", "1")
+    public_access_only = request.GET.get("access") == "public"
 
     # Search
     if search_query:
-        search_results = Page.objects.live().search(search_query)
-        query = Query.get(search_query)
+        search_results = search_pages(search_query, public_access_only)
 
-        # Record hit
-        query.add_hit()
+        # Record hit, which is written with other hits in the next flush
+        record_search_hit(search_query)
     else:
-        search_results = Page.objects.none()
+        search_results = PageSearchEntry.objects.none()
 
     paginated_search_results = get_paginated_items(
         search_results,
@@ -26,11 +35,28 @@ def search(request: HttpRequest) -> HttpResponse:
         page,
     )
 
+    archive_page_hits = []
+
+    if search_query:
+        # Highlight the results on this page, rather than every match
+        paginated_search_results.page.object_list = get_search_result_pages(
+            paginated_search_results.page,
+            search_query,
+        )
+
+        if paginated_search_results.page.number == 1:
+            archive_page_hits = get_archive_page_hits(
+                search_archive_issue_pages(search_query)[:ARCHIVE_PAGE_HITS_PER_SEARCH],
+                search_query,
+            )
+
     return render(
         request,
         "search/search.html",
         {
             "search_query": search_query,
+            "public_access_only": public_access_only,
             "paginated_search_results": paginated_search_results,
+            "archive_page_hits": archive_page_hits,
         },
     )
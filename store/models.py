@@ -8,6 +8,9 @@ from wagtail.models import Orderable, Page
 from cart.forms import CartAddProductForm
 from common.models import DrupalFields
 
+# Renditions of product images shown in the cart, store and product pages
+PRODUCT_IMAGE_FILTER_SPECS = ["max-100x100", "max-150x150", "max-320x200"]
+
 
 class StoreIndexPage(Page):
     intro = RichTextField(blank=True)
@@ -81,6 +84,11 @@ class Product(DrupalFields, Page):  # type: ignore
 
         return context
 
+    def get_image_filter_specs(self) -> list[tuple[int | None, list[str]]]:
+        """Get the renditions of the product image, generated in the
+        background."""
+        return [(self.image_id, PRODUCT_IMAGE_FILTER_SPECS)]
+
 
 class Book(Product):  # type: ignore
     content_panels = Product.content_panels + [
@@ -95,6 +103,15 @@ class Book(Product):  # type: ignore
     ]
     subpage_types: list[str] = []
 
+    def get_listing_page_ids(self) -> set[int]:
+        """Get the IDs of the author pages that list this book, whose cached
+        responses change with it."""
+        return {
+            author_id
+            for author_id in self.authors.values_list("author_id", flat=True)
+            if author_id is not None
+        }
+
 
 class BookAuthor(Orderable):
     book = ParentalKey(
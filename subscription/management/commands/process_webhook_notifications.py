@@ -0,0 +1,60 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from subscription.webhooks import (
+    WEBHOOK_BATCH_SIZE,
+    WebhookNotificationResult,
+    process_webhook_notifications,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Apply the received Braintree webhook notifications, until none are "
+        "left or, with --forever, as a background worker"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=WEBHOOK_BATCH_SIZE,
+            help="Number of notifications each batch applies",
+        )
+        parser.add_argument(
+            "--forever",
+            action="store_true",
+            help="Keep waiting for notifications once none are left",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5,
+            help="Seconds to wait between checks for new notifications",
+        )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        total = WebhookNotificationResult()
+
+        while True:
+            result = process_webhook_notifications(
+                batch_size=options["batch_size"],  # type: ignore
+            )
+            total.processed += result.processed
+            total.failed += result.failed
+
+            if result.processed or result.failed:
+                continue
+
+            if not options["forever"]:
+                break
+
+            time.sleep(options["poll_interval"])  # type: ignore
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Processed {total.processed} webhook notifications, "
+                f"{total.failed} failed",
+            ),
+        )
@@ -0,0 +1,29 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandParser
+
+from subscription.webhooks import WEBHOOK_RETENTION_DAYS, prune_webhook_notifications
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete the processed Braintree webhook notifications received before "
+        "the retention period. Run daily by run_scheduled_commands"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=WEBHOOK_RETENTION_DAYS,
+            help="Number of days processed notifications are kept",
+        )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        deleted = prune_webhook_notifications(
+            retention=timedelta(days=options["days"]),  # type: ignore
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Deleted {deleted} webhook notifications"),
+        )
@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from subscription.webhooks import replay_webhook_notifications
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue failed Braintree webhook notifications, or those with the given "
+        "IDs, to be applied again by process_webhook_notifications"
+    )
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "notification_ids",
+            nargs="*",
+            help="IDs of notifications to replay, even if they were processed",
+        )
+        parser.add_argument(
+            "--since",
+            help="Only replay notifications received since this date and time",
+        )
+
+    def handle(self, *args: tuple, **options: dict) -> None:
+        since = None
+
+        if options["since"]:
+            since = parse_datetime(options["since"])  # type: ignore
+
+            if since is None:
+                raise CommandError(f"Invalid date and time: {options['since']}")
+
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since)
+
+        replayed = replay_webhook_notifications(
+            notification_ids=options["notification_ids"],  # type: ignore
+            since=since,
+        )
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Queued {replayed} webhook notifications"),
+        )
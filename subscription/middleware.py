@@ -0,0 +1,30 @@
+from collections.abc import Callable
+
+from django.http import HttpRequest, HttpResponse
+from django.utils.functional import SimpleLazyObject
+
+
+def get_request_user_is_subscriber(request: HttpRequest) -> bool:
+    """Check whether the request user is an authenticated subscriber."""
+    user = request.user
+
+    return user.is_authenticated and user.is_subscriber  # type: ignore
+
+
+class SubscriberMiddleware:
+    """Add a `user_is_subscriber` flag to each request.
+
+    The flag is computed the first time it is used and then reused for the
+    rest of the request, e.g. by the paywall check and the main menu.
+    Must come after AuthenticationMiddleware.
+    """
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponse]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponse:
+        request.user_is_subscriber = SimpleLazyObject(  # type: ignore
+            lambda: get_request_user_is_subscriber(request),
+        )
+
+        return self.get_response(request)
@@ -0,0 +1,61 @@
+# Generated by Django 4.2.4 on 2026-10-18 09:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("subscription", "0006_alter_subscription_price_group"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BraintreeWebhookNotification",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "notification_id",
+                    models.CharField(editable=False, max_length=64, unique=True),
+                ),
+                ("bt_signature", models.TextField()),
+                ("bt_payload", models.TextField()),
+                ("received_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("processed", "Processed"),
+                            ("failed", "Failed"),
+                        ],
+                        default="pending",
+                        max_length=255,
+                    ),
+                ),
+                ("kind", models.CharField(blank=True, max_length=255)),
+                (
+                    "braintree_subscription_id",
+                    models.CharField(blank=True, max_length=255),
+                ),
+                ("notified_at", models.DateTimeField(blank=True, null=True)),
+                ("processed_at", models.DateTimeField(blank=True, null=True)),
+                ("error", models.TextField(blank=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["status", "received_at"],
+                        name="webhook_notification_status",
+                    )
+                ],
+            },
+        ),
+    ]
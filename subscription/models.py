@@ -5,7 +5,9 @@ from typing import TYPE_CHECKING, Any
 
 from django.conf import settings
 from django.contrib.auth.base_user import AbstractBaseUser
-from django.db import models
+from django.core.cache import cache
+from django.db import models, transaction
+from django.db.models import Max
 from django.http import HttpRequest, HttpResponse
 from django.shortcuts import redirect
 from django.template.response import TemplateResponse
@@ -24,6 +26,13 @@ logger = logging.getLogger(__name__)
 if TYPE_CHECKING:
     from accounts.models import User  # pragma: no cover
 
+# Subscription changes invalidate the cached dates,
+# so the timeout only bounds how long a missed invalidation could last
+SUBSCRIPTION_ACTIVE_UNTIL_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Distinguishes a cache miss from a cached "no paid subscription"
+NOT_CACHED = object()
+
 
 class MagazineFormatChoices(models.TextChoices):
     PDF = "pdf", "PDF"
@@ -283,6 +292,55 @@ class Subscription(models.Model):
 
         super().save(*args, **kwargs)
 
+        invalidate_subscription_active_until(self.user_id)  # type: ignore
+
+    def delete(self, *args: Any, **kwargs: Any) -> tuple[int, dict[str, int]]:
+        deleted = super().delete(*args, **kwargs)
+
+        invalidate_subscription_active_until(self.user_id)  # type: ignore
+
+        return deleted
+
+
+def get_subscription_active_until_cache_key(user_id: int) -> str:
+    return f"subscription_active_until:{user_id}"
+
+
+def get_subscription_active_until(user_id: int) -> datetime.date | None:
+    """Get the latest end date of the user's paid subscriptions.
+
+    The date is cached per user, so checking whether a user is a subscriber
+    doesn't query the subscriptions table on every request.
+    """
+    cache_key = get_subscription_active_until_cache_key(user_id)
+    active_until = cache.get(cache_key, NOT_CACHED)
+
+    if active_until is NOT_CACHED:
+        active_until = Subscription.objects.filter(
+            user_id=user_id,
+            paid=True,
+        ).aggregate(active_until=Max("end_date"))["active_until"]
+
+        cache.set(
+            cache_key,
+            active_until,
+            SUBSCRIPTION_ACTIVE_UNTIL_CACHE_TIMEOUT,
+        )
+
+    return active_until  # type: ignore
+
+
+def invalidate_subscription_active_until(user_id: int) -> None:
+    """Remove the user's cached active-until date.
+
+    The date is removed again after the transaction commits, so a request
+    that read the old row before the commit can't leave it in the cache.
+    """
+    cache_key = get_subscription_active_until_cache_key(user_id)
+
+    cache.delete(cache_key)
+    transaction.on_commit(lambda: cache.delete(cache_key))
+
 
 class SubscriptionIndexPage(Page):
     intro = RichTextField(blank=True)
@@ -399,3 +457,49 @@ class ManageSubscriptionPage(Page):
             context["subscriptions"] = subscriptions
 
         return context
+
+
+class WebhookNotificationStatusChoices(models.TextChoices):
+    PENDING = "pending", "Pending"
+    PROCESSED = "processed", "Processed"
+    FAILED = "failed", "Failed"
+
+
+class BraintreeWebhookNotification(models.Model):
+    """A Braintree webhook notification, stored as received and processed
+    in the background.
+
+    Braintree sends the same payload again when it retries a delivery, so
+    notifications are identified by a hash of their payload.
+    """
+
+    notification_id = models.CharField(
+        max_length=64,
+        unique=True,
+        editable=False,
+    )
+    bt_signature = models.TextField()
+    bt_payload = models.TextField()
+    received_at = models.DateTimeField(auto_now_add=True)
+    status = models.CharField(
+        max_length=255,
+        choices=WebhookNotificationStatusChoices.choices,
+        default=WebhookNotificationStatusChoices.PENDING,
+    )
+    # Parsed from the payload when processed
+    kind = models.CharField(max_length=255, blank=True)
+    braintree_subscription_id = models.CharField(max_length=255, blank=True)
+    notified_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["status", "received_at"],
+                name="webhook_notification_status",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.kind or 'unparsed'}: {self.notification_id}"
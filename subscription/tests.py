@@ -1,10 +1,15 @@
 import datetime
 import braintree
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.core.cache import cache
 from django.db.models.query import QuerySet
-from django.http import HttpRequest
+from django.http import HttpRequest, HttpResponse
 from django.test import RequestFactory, TestCase, Client
 from django.urls import reverse
+from django.utils import timezone
 import json
+from io import StringIO
 from unittest.mock import Mock, patch
 from wagtail.models import Site
 
@@ -12,17 +17,26 @@ from accounts.factories import UserFactory
 from accounts.models import User
 from subscription.factories import SubscriptionFactory
 from subscription.forms import SubscriptionCreateForm
+from subscription.middleware import SubscriberMiddleware
 from subscription.models import (
     SUBSCRIPTION_PRICE_COMPONENTS,
+    BraintreeWebhookNotification,
     MagazineFormatChoices,
     MagazinePriceGroupChoices,
     ManageSubscriptionPage,
     Subscription,
     SubscriptionIndexPage,
+    WebhookNotificationStatusChoices,
+    get_subscription_active_until,
     process_subscription_form,
 )
 from home.models import HomePage
-from .views import GRACE_PERIOD_DAYS, handle_subscription_webhook
+from .views import (
+    ONE_YEAR_WITH_GRACE_PERIOD,
+    WEBHOOK_MAX_BODY_SIZE,
+    handle_subscription_webhook,
+)
+from .webhooks import process_webhook_notifications, prune_webhook_notifications
 
 
 class SubscriptionWebhookTestCase(TestCase):
@@ -85,12 +99,128 @@ class SubscriptionWebhookTestCase(TestCase):
             datetime.date(2022, 1, 6),
         )
 
+    def test_handle_subscription_webhook_invalidates_active_until(self) -> None:
+        self.subscription.paid = True
+        self.subscription.save()
+
+        # Cache the end date before the webhook extends it
+        self.assertEqual(
+            get_subscription_active_until(self.user.id),
+            datetime.date(2021, 1, 1),
+        )
+
+        handle_subscription_webhook(
+            self.braintree_subscription_with_paid_through_date,
+        )
+
+        self.assertEqual(
+            get_subscription_active_until(self.user.id),
+            datetime.date(2022, 7, 6),
+        )
+
     def tearDown(self) -> None:
         self.subscription.delete()
         self.user.delete()
         return super().tearDown()
 
 
+class SubscriptionActiveUntilTestCase(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+        self.user = User.objects.create_user(  # type: ignore
+            email="test@user.com",
+            password="testpassword",
+        )
+        self.today = datetime.date.today()
+
+        self.subscription = Subscription.objects.create(
+            user=self.user,
+            end_date=self.today + datetime.timedelta(days=30),
+            paid=True,
+        )
+        # Unpaid subscriptions don't extend access
+        Subscription.objects.create(
+            user=self.user,
+            end_date=self.today + datetime.timedelta(days=365),
+        )
+
+    def test_get_subscription_active_until_is_cached(self) -> None:
+        with self.assertNumQueries(1):
+            active_until = get_subscription_active_until(self.user.id)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_subscription_active_until(self.user.id), active_until)
+
+        self.assertEqual(active_until, self.today + datetime.timedelta(days=30))
+
+    def test_get_subscription_active_until_without_subscription(self) -> None:
+        other_user = User.objects.create_user(  # type: ignore
+            email="other@user.com",
+            password="testpassword",
+        )
+
+        self.assertIsNone(get_subscription_active_until(other_user.id))
+
+        with self.assertNumQueries(0):
+            self.assertIsNone(get_subscription_active_until(other_user.id))
+
+    def test_subscription_save_invalidates_active_until(self) -> None:
+        get_subscription_active_until(self.user.id)
+
+        self.subscription.end_date = self.today - datetime.timedelta(days=1)
+        self.subscription.save()
+
+        self.assertEqual(
+            get_subscription_active_until(self.user.id),
+            self.today - datetime.timedelta(days=1),
+        )
+        self.assertFalse(self.user.is_subscriber)
+
+    def test_subscription_delete_invalidates_active_until(self) -> None:
+        get_subscription_active_until(self.user.id)
+
+        self.subscription.delete()
+
+        self.assertIsNone(get_subscription_active_until(self.user.id))
+        self.assertFalse(self.user.is_subscriber)
+
+
+class SubscriberMiddlewareTestCase(TestCase):
+    def setUp(self) -> None:
+        cache.clear()
+
+        self.factory = RequestFactory()
+        self.middleware = SubscriberMiddleware(lambda request: HttpResponse())
+
+        self.subscriber = User.objects.create_user(  # type: ignore
+            email="subscriber@user.com",
+            password="testpassword",
+        )
+        Subscription.objects.create(user=self.subscriber, paid=True)
+
+    def test_anonymous_user_is_not_subscriber(self) -> None:
+        request = self.factory.get("/")
+        request.user = AnonymousUser()
+
+        self.middleware(request)
+
+        with self.assertNumQueries(0):
+            self.assertFalse(request.user_is_subscriber)  # type: ignore
+
+    def test_subscriber_flag_is_computed_once(self) -> None:
+        request = self.factory.get("/")
+        request.user = self.subscriber
+
+        # The flag is lazy, so the middleware itself doesn't query
+        with self.assertNumQueries(0):
+            self.middleware(request)
+
+        with self.assertNumQueries(1):
+            self.assertTrue(request.user_is_subscriber)  # type: ignore
+            self.assertTrue(request.user_is_subscriber)  # type: ignore
+
+
 class SubscriptionTestCase(TestCase):
     def setUp(self) -> None:
         self.user = User.objects.create_user(  # type: ignore
@@ -258,134 +388,243 @@ class SubscriptionWebhookViewTests(TestCase):
         self.client = Client()
         self.url = reverse("braintree-subscription-webhook")
 
-        self.webhook_notification = {
-            "bt_signature": "signature",
-            "bt_payload": "payload",
+        # Sign notifications locally, with keys of a test gateway
+        self.braintree_gateway = braintree.BraintreeGateway(
+            braintree.Configuration(
+                braintree.Environment.Sandbox,  # type: ignore
+                merchant_id="merchant_id",
+                public_key="public_key",
+                private_key="private_key",
+            ),
+        )
+        for module in ["subscription.views", "subscription.webhooks"]:
+            patcher = patch(f"{module}.braintree_gateway", self.braintree_gateway)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def sample_notification(
+        self,
+        kind: str = "subscription_charged_successfully",
+        braintree_subscription_id: str = "test_subscription_id",
+        notified_at: datetime.datetime | None = None,
+    ) -> dict[str, str]:
+        with patch("braintree.webhook_testing_gateway.datetime") as mock_datetime:
+            # Sample notifications are sent now, in UTC, unless told otherwise
+            mock_datetime.utcnow.return_value = (
+                notified_at or datetime.datetime.utcnow()
+            )
+            notification = self.braintree_gateway.webhook_testing.sample_notification(
+                kind,
+                braintree_subscription_id,
+            )
+
+        return {
+            "bt_signature": notification["bt_signature"],
+            "bt_payload": notification["bt_payload"].decode(),
         }
 
-    @patch("subscription.views.braintree_gateway.webhook_notification.parse")
-    def test_csrf_exempt(
-        self,
-        mock_parse: Mock,
-    ) -> None:
-        # Get the current date and time
-        now = datetime.datetime.now()
-        one_year_later = now + datetime.timedelta(days=365)
+    def post_notification(self, notification: dict[str, str]) -> HttpResponse:
+        csrf_client = Client(enforce_csrf_checks=True)
 
-        # Set paid_through_date to one year from now
-        mock_braintree_subscription = Mock()
-        mock_braintree_subscription.id = self.subscription.braintree_subscription_id  # type: ignore  # noqa: E501
-        mock_braintree_subscription.paid_through_date = one_year_later
+        return csrf_client.post(
+            self.url,
+            data=json.dumps(notification),
+            content_type="application/json",
+        )
 
-        mock_webhook_notification = Mock()
-        mock_webhook_notification.kind = "subscription_charged_successfully"
-        mock_webhook_notification.subscription = mock_braintree_subscription
+    def test_notification_is_stored_and_acknowledged(self) -> None:
+        with self.assertNumQueries(1):
+            response = self.post_notification(self.sample_notification())
 
-        # mock parse method to return the mock notification
-        mock_parse.return_value = mock_webhook_notification
+        self.assertEqual(response.status_code, 200)
 
-        csrf_client = Client(enforce_csrf_checks=True)
-        response = csrf_client.post(
+        notification = BraintreeWebhookNotification.objects.get()
+        self.assertEqual(notification.status, WebhookNotificationStatusChoices.PENDING)
+
+        # The subscription is updated by the worker, not the request
+        end_date = self.subscription.end_date  # type: ignore
+        self.subscription.refresh_from_db()  # type: ignore
+        self.assertEqual(self.subscription.end_date, end_date)  # type: ignore
+
+    def test_invalid_body_is_rejected(self) -> None:
+        response = self.client.post(
             self.url,
-            data=json.dumps(self.webhook_notification),
-            content_type="application/json",
+            data="bt_signature=signature",
+            content_type="application/x-www-form-urlencoded",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(BraintreeWebhookNotification.objects.exists())
+
+    def test_subscription_end_date_updated(self) -> None:
+        end_date = self.subscription.end_date  # type: ignore
+
+        self.post_notification(self.sample_notification())
+
+        result = process_webhook_notifications()
+
+        self.assertEqual(result.processed, 1)
+
+        notification = BraintreeWebhookNotification.objects.get()
+        self.assertEqual(
+            notification.status,
+            WebhookNotificationStatusChoices.PROCESSED,
+        )
+        self.assertEqual(
+            notification.braintree_subscription_id,
+            "test_subscription_id",
         )
 
-        # assert that parse was called with the correct arguments
-        mock_parse.assert_called_once_with(
-            self.webhook_notification["bt_signature"],
-            self.webhook_notification["bt_payload"],
+        # Sample notifications have no paid through date
+        self.subscription.refresh_from_db()  # type: ignore
+        self.assertEqual(
+            self.subscription.end_date,  # type: ignore
+            end_date + ONE_YEAR_WITH_GRACE_PERIOD,
         )
 
-        # check the response status code
+    def test_duplicate_deliveries_are_applied_once(self) -> None:
+        notification = self.sample_notification()
+
+        self.post_notification(notification)
+        response = self.post_notification(notification)
+
         self.assertEqual(response.status_code, 200)
+        self.assertEqual(BraintreeWebhookNotification.objects.count(), 1)
+
+        self.assertEqual(process_webhook_notifications().processed, 1)
+        self.assertEqual(process_webhook_notifications().processed, 0)
+
+    def test_notifications_are_applied_in_order_per_subscription(self) -> None:
+        applied = []
+
+        for kind, braintree_subscription_id in [
+            ("subscription_charged_successfully", "second"),
+            ("subscription_charged_successfully", "first"),
+            ("subscription_went_past_due", "second"),
+        ]:
+            self.post_notification(
+                self.sample_notification(
+                    kind=kind,
+                    braintree_subscription_id=braintree_subscription_id,
+                ),
+            )
+
+        with patch(
+            "subscription.webhooks.apply_webhook_notification",
+            side_effect=lambda webhook_notification: applied.append(
+                (webhook_notification.subscription.id, webhook_notification.kind),
+            ),
+        ):
+            process_webhook_notifications()
 
-    @patch("subscription.views.braintree_gateway.webhook_notification.parse")
-    def test_subscription_end_date_updated_with_paid_through_date(
-        self,
-        mock_parse: Mock,
-    ) -> None:
-        # Get the current date without time
-        today = datetime.date.today()
-        one_year_later = today + datetime.timedelta(days=365)
+        self.assertEqual(
+            applied,
+            [
+                ("first", "subscription_charged_successfully"),
+                ("second", "subscription_charged_successfully"),
+                ("second", "subscription_went_past_due"),
+            ],
+        )
 
-        # Set paid_through_date to one year from now
-        mock_braintree_subscription = Mock()
-        mock_braintree_subscription.id = self.subscription.braintree_subscription_id  # type: ignore  # noqa: E501
-        mock_braintree_subscription.paid_through_date = one_year_later
+    def test_older_notifications_in_later_batches_are_skipped(self) -> None:
+        sent_at = datetime.datetime.utcnow()
 
-        mock_webhook_notification = Mock()
-        mock_webhook_notification.kind = "subscription_charged_successfully"
-        mock_webhook_notification.subscription = mock_braintree_subscription
+        self.post_notification(self.sample_notification(notified_at=sent_at))
+        process_webhook_notifications()
 
-        # mock parse method to return the mock notification
-        mock_parse.return_value = mock_webhook_notification
+        self.subscription.refresh_from_db()  # type: ignore
+        end_date = self.subscription.end_date  # type: ignore
 
-        csrf_client = Client(enforce_csrf_checks=True)
-        response = csrf_client.post(
-            self.url,
-            data=json.dumps(self.webhook_notification),
-            content_type="application/json",
+        # A retry of an earlier notification arrives after the newer one
+        self.post_notification(
+            self.sample_notification(
+                notified_at=sent_at - datetime.timedelta(hours=1),
+            ),
         )
 
-        # assert that parse was called with the correct arguments
-        mock_parse.assert_called_once_with(
-            self.webhook_notification["bt_signature"],
-            self.webhook_notification["bt_payload"],
-        )
+        with patch("subscription.webhooks.apply_webhook_notification") as apply:
+            result = process_webhook_notifications()
 
-        # check the response status code
-        self.assertEqual(response.status_code, 200)
+        apply.assert_not_called()
+        self.assertEqual(result.processed, 1)
+        self.assertFalse(
+            BraintreeWebhookNotification.objects.exclude(
+                status=WebhookNotificationStatusChoices.PROCESSED,
+            ).exists(),
+        )
 
-        # Refresh subscription from db
         self.subscription.refresh_from_db()  # type: ignore
+        self.assertEqual(self.subscription.end_date, end_date)  # type: ignore
 
-        # check that the end_date is updated
-        expected_end_date = one_year_later + GRACE_PERIOD_DAYS
-        self.assertEqual(self.subscription.end_date, expected_end_date)  # type: ignore
+    def test_failed_notifications_can_be_replayed(self) -> None:
+        self.post_notification(
+            self.sample_notification(braintree_subscription_id="unknown_id"),
+        )
+        self.post_notification(self.sample_notification())
 
-    @patch("subscription.views.braintree_gateway.webhook_notification.parse")
-    def test_subscription_end_date_updated_without_paid_through_date(
-        self,
-        mock_parse: Mock,
-    ) -> None:
-        # Calculate the expected end_date
-        one_year_with_grace_period = datetime.timedelta(days=365) + GRACE_PERIOD_DAYS
-        expected_end_date = self.subscription.end_date + one_year_with_grace_period  # type: ignore  # noqa: E501
+        result = process_webhook_notifications()
 
-        # Set up the Braintree subscription mock without paid_through_date
-        mock_braintree_subscription = Mock()
-        mock_braintree_subscription.id = self.subscription.braintree_subscription_id  # type: ignore  # noqa: E501
-        mock_braintree_subscription.paid_through_date = None
+        self.assertEqual((result.processed, result.failed), (1, 1))
 
-        mock_webhook_notification = Mock()
-        mock_webhook_notification.kind = "subscription_charged_successfully"
-        mock_webhook_notification.subscription = mock_braintree_subscription
+        failed_notification = BraintreeWebhookNotification.objects.get(
+            status=WebhookNotificationStatusChoices.FAILED,
+        )
+        self.assertIn("Http404", failed_notification.error)
 
-        # mock parse method to return the mock notification
-        mock_parse.return_value = mock_webhook_notification
+        # The subscription is created after its first payment
+        SubscriptionFactory(braintree_subscription_id="unknown_id")
 
-        csrf_client = Client(enforce_csrf_checks=True)
-        response = csrf_client.post(
-            self.url,
-            data=json.dumps(self.webhook_notification),
-            content_type="application/json",
+        call_command("replay_webhook_notifications", stdout=StringIO())
+        call_command("process_webhook_notifications", stdout=StringIO())
+
+        failed_notification.refresh_from_db()
+        self.assertEqual(
+            failed_notification.status,
+            WebhookNotificationStatusChoices.PROCESSED,
         )
+        self.assertEqual(failed_notification.error, "")
+
+    def test_notifications_with_invalid_signature_are_rejected(self) -> None:
+        notification = self.sample_notification()
+        notification["bt_signature"] = "public_key|invalid"
+
+        response = self.post_notification(notification)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(BraintreeWebhookNotification.objects.exists())
+
+    def test_large_bodies_are_rejected(self) -> None:
+        notification = self.sample_notification()
+        notification["bt_payload"] += "=" * WEBHOOK_MAX_BODY_SIZE
+
+        response = self.post_notification(notification)
+
+        self.assertEqual(response.status_code, 413)
+        self.assertFalse(BraintreeWebhookNotification.objects.exists())
 
-        # assert that parse was called with the correct arguments
-        mock_parse.assert_called_once_with(
-            self.webhook_notification["bt_signature"],
-            self.webhook_notification["bt_payload"],
+    def test_old_processed_notifications_are_pruned(self) -> None:
+        self.post_notification(self.sample_notification())
+        self.post_notification(
+            self.sample_notification(braintree_subscription_id="unknown_id"),
         )
+        process_webhook_notifications()
 
-        # check the response status code
-        self.assertEqual(response.status_code, 200)
+        self.assertEqual(prune_webhook_notifications(), 0)
 
-        # Refresh subscription from db
-        self.subscription.refresh_from_db()  # type: ignore
+        BraintreeWebhookNotification.objects.update(
+            received_at=timezone.now() - datetime.timedelta(days=31),
+        )
+
+        output = StringIO()
+        call_command("prune_webhook_notifications", stdout=output)
 
-        # check that the end_date is updated
-        self.assertEqual(self.subscription.end_date, expected_end_date)  # type: ignore
+        self.assertIn("Deleted 1 webhook notifications", output.getvalue())
+
+        # Failed notifications are kept for replays
+        self.assertEqual(
+            BraintreeWebhookNotification.objects.get().status,
+            WebhookNotificationStatusChoices.FAILED,
+        )
 
 
 class SubscriptionCreateFormTestCase(TestCase):
@@ -1,24 +1,28 @@
 from datetime import date
+import hashlib
 import json
 import os
 from datetime import timedelta
 
 import braintree
 from braintree import Subscription as BraintreeSubscription
-from braintree import WebhookNotification
-from django.http import HttpRequest, HttpResponse
+from braintree.exceptions import InvalidChallengeError, InvalidSignatureError
+from django.http import HttpRequest, HttpResponse, HttpResponseBadRequest
 from django.http.response import HttpResponseBase
 from django.shortcuts import get_object_or_404
 from django.utils.decorators import method_decorator
 from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 
-from subscription.models import Subscription
+from subscription.models import BraintreeWebhookNotification, Subscription
 
 # Grace period so subscribers maintain access
 GRACE_PERIOD_DAYS = timedelta(days=5)
 ONE_YEAR_WITH_GRACE_PERIOD: timedelta = timedelta(days=365) + GRACE_PERIOD_DAYS
 
+# Braintree notifications are a few kilobytes
+WEBHOOK_MAX_BODY_SIZE = 1024 * 1024
+
 braintree_environment = (
     braintree.Environment.Production  # type: ignore
     if os.environ.get("BRAINTREE_ENVIRONMENT") == "production"
@@ -53,9 +57,10 @@ def calculate_end_date_from_braintree_subscription(
 def handle_subscription_webhook(
     braintree_subscription: BraintreeSubscription,
 ) -> None:
-    # Make sure we can find the subscription
+    # Make sure we can find the subscription, and lock it so notifications
+    # of the same subscription are applied one at a time
     subscription = get_object_or_404(
-        Subscription,
+        Subscription.objects.select_for_update(),
         # TODO: determine why mypy cannot find the `braintree_subscription.id` property
         braintree_subscription_id=braintree_subscription.id,  # type: ignore
     )
@@ -68,6 +73,20 @@ def handle_subscription_webhook(
     subscription.save()  # type: ignore
 
 
+def receive_webhook_notification(bt_signature: str, bt_payload: str) -> None:
+    """Store a webhook notification for the worker, once per payload."""
+    BraintreeWebhookNotification.objects.bulk_create(
+        [
+            BraintreeWebhookNotification(
+                notification_id=hashlib.sha256(bt_payload.encode()).hexdigest(),
+                bt_signature=bt_signature,
+                bt_payload=bt_payload,
+            ),
+        ],
+        ignore_conflicts=True,
+    )
+
+
 class SubscriptionWebhookView(View):
     @method_decorator(csrf_exempt)
     def dispatch(
@@ -84,21 +103,32 @@ class SubscriptionWebhookView(View):
         *args: tuple,
         **kwargs: dict,
     ) -> HttpResponse:
-        # Parse Braintree webhook
-        # https://developer.paypal.com/braintree/docs/guides/webhooks/parse
-        body: dict = json.loads(request.body)
-        webhook_notification: WebhookNotification = (
-            braintree_gateway.webhook_notification.parse(
-                body["bt_signature"],
-                body["bt_payload"],
-            )
+        if len(request.body) > WEBHOOK_MAX_BODY_SIZE:
+            return HttpResponse(status=413)
+
+        try:
+            body: dict = json.loads(request.body)
+            bt_signature = body["bt_signature"]
+            bt_payload = body["bt_payload"]
+
+            # Only store notifications from Braintree, which is checked
+            # locally, from the signature
+            braintree_gateway.webhook_notification.parse(bt_signature, bt_payload)
+        except (
+            AttributeError,
+            ValueError,
+            KeyError,
+            TypeError,
+            InvalidChallengeError,
+            InvalidSignatureError,
+        ):
+            return HttpResponseBadRequest()
+
+        # Store the notification and acknowledge it, without waiting for the
+        # database rows it changes; `process_webhook_notifications` applies it
+        receive_webhook_notification(
+            bt_signature=bt_signature,
+            bt_payload=bt_payload,
         )
 
-        # webhook_notification.kind should be available on the notification object
-        # https://developer.paypal.com/braintree/docs/reference/general/webhooks/subscription/python  # noqa: E501
-        if webhook_notification.kind == "subscription_charged_successfully":  # type: ignore # noqa: E501
-            handle_subscription_webhook(
-                braintree_subscription=webhook_notification.subscription,
-            )
-
         return HttpResponse()
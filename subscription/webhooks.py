@@ -0,0 +1,269 @@
+"""Apply Braintree webhook notifications in the background.
+
+The webhook view only stores each notification, so a slow database or a
+storm of retries from Braintree doesn't tie up web workers, and a repeated
+delivery of a notification is stored once. `process_webhook_notifications`
+workers then verify and apply the stored notifications in batches, in the
+order Braintree sent them for each subscription. Notifications that arrive
+after a newer one of their subscription was applied, e.g. retries or
+replays, are skipped, so they don't undo it.
+
+Notifications that fail, e.g. for subscriptions that don't exist yet, are
+kept for `replay_webhook_notifications`, while processed notifications are
+deleted by `prune_webhook_notifications` once Braintree stopped retrying
+them.
+"""
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone as datetime_timezone
+
+from braintree import WebhookNotification
+from django.db import transaction
+from django.db.models import Max
+from django.utils import timezone
+
+from .models import BraintreeWebhookNotification, WebhookNotificationStatusChoices
+from .views import braintree_gateway, handle_subscription_webhook
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_BATCH_SIZE = 100
+
+# Processed notifications are kept long enough to deduplicate deliveries
+# Braintree retries, and to look into recent changes of subscriptions
+WEBHOOK_RETENTION_DAYS = 30
+
+# Notifications that update subscriptions
+# https://developer.paypal.com/braintree/docs/reference/general/webhooks/subscription/python  # noqa: E501
+SUBSCRIPTION_WEBHOOK_KINDS = {"subscription_charged_successfully"}
+
+
+def parse_webhook_notification(
+    notification: BraintreeWebhookNotification,
+) -> WebhookNotification:
+    """Verify the signature of a notification and record what it is about."""
+    webhook_notification: WebhookNotification = (
+        braintree_gateway.webhook_notification.parse(
+            notification.bt_signature,
+            notification.bt_payload,
+        )
+    )
+
+    notification.kind = webhook_notification.kind  # type: ignore
+    notification.notified_at = getattr(webhook_notification, "timestamp", None)
+
+    if notification.notified_at and timezone.is_naive(notification.notified_at):
+        # Braintree timestamps are in UTC
+        notification.notified_at = timezone.make_aware(
+            notification.notified_at,
+            datetime_timezone.utc,
+        )
+
+    braintree_subscription = getattr(webhook_notification, "subscription", None)
+
+    if braintree_subscription is not None:
+        notification.braintree_subscription_id = braintree_subscription.id
+
+    return webhook_notification
+
+
+def apply_webhook_notification(webhook_notification: WebhookNotification) -> None:
+    if webhook_notification.kind in SUBSCRIPTION_WEBHOOK_KINDS:  # type: ignore
+        handle_subscription_webhook(
+            braintree_subscription=webhook_notification.subscription,  # type: ignore  # noqa: E501
+        )
+
+
+def get_application_order(
+    notification: BraintreeWebhookNotification,
+) -> tuple[str, datetime, datetime]:
+    """Order notifications by subscription, then as Braintree sent them."""
+    return (
+        notification.braintree_subscription_id,
+        notification.notified_at or notification.received_at,
+        notification.received_at,
+    )
+
+
+def get_latest_applied_notification_times(
+    braintree_subscription_ids: set[str],
+) -> dict[str, datetime]:
+    """Get when Braintree sent the latest applied subscription notification
+    of each subscription."""
+    return dict(
+        BraintreeWebhookNotification.objects.filter(
+            status=WebhookNotificationStatusChoices.PROCESSED,
+            kind__in=SUBSCRIPTION_WEBHOOK_KINDS,
+            braintree_subscription_id__in=braintree_subscription_ids,
+            notified_at__isnull=False,
+        )
+        .values("braintree_subscription_id")
+        .annotate(latest_notified_at=Max("notified_at"))
+        .values_list("braintree_subscription_id", "latest_notified_at"),
+    )
+
+
+def is_stale_notification(
+    notification: BraintreeWebhookNotification,
+    latest_applied_notification_times: dict[str, datetime],
+) -> bool:
+    """Check whether a newer notification of the subscription was applied."""
+    if (
+        notification.kind not in SUBSCRIPTION_WEBHOOK_KINDS
+        or notification.notified_at is None
+    ):
+        return False
+
+    latest_notified_at = latest_applied_notification_times.get(
+        notification.braintree_subscription_id,
+    )
+
+    return (
+        latest_notified_at is not None and notification.notified_at < latest_notified_at
+    )
+
+
+@dataclass
+class WebhookNotificationResult:
+    """Counts of the notifications a worker processed."""
+
+    processed: int = 0
+    failed: int = 0
+
+
+def process_webhook_notifications(
+    batch_size: int = WEBHOOK_BATCH_SIZE,
+) -> WebhookNotificationResult:
+    """Apply a batch of pending notifications, oldest first.
+
+    The batch stays locked until it is applied, so other workers skip it,
+    and notifications of a worker that stops are left pending. Each
+    notification is applied in a savepoint, so one that fails doesn't undo
+    the others. Notifications older than the latest one applied to their
+    subscription, by an earlier batch, are marked processed without being
+    applied.
+    """
+    result = WebhookNotificationResult()
+
+    with transaction.atomic():
+        notifications = list(
+            BraintreeWebhookNotification.objects.select_for_update(skip_locked=True)
+            .filter(status=WebhookNotificationStatusChoices.PENDING)
+            .order_by("received_at", "id")[:batch_size],
+        )
+
+        webhook_notifications = {}
+
+        for notification in notifications:
+            try:
+                webhook_notifications[notification.pk] = parse_webhook_notification(
+                    notification,
+                )
+            except Exception as error:
+                logger.exception(
+                    "Could not parse webhook notification %s",
+                    notification.notification_id,
+                )
+                notification.error = repr(error)
+
+        latest_applied_notification_times = get_latest_applied_notification_times(
+            {
+                notification.braintree_subscription_id
+                for notification in notifications
+                if notification.braintree_subscription_id
+            },
+        )
+
+        for notification in sorted(notifications, key=get_application_order):
+            webhook_notification = webhook_notifications.get(notification.pk)
+
+            if webhook_notification is not None and is_stale_notification(
+                notification,
+                latest_applied_notification_times,
+            ):
+                logger.info(
+                    "Skipped webhook notification %s, sent before the latest "
+                    "applied notification of subscription %s",
+                    notification.notification_id,
+                    notification.braintree_subscription_id,
+                )
+                notification.error = ""
+            elif webhook_notification is not None:
+                try:
+                    with transaction.atomic():
+                        apply_webhook_notification(webhook_notification)
+                except Exception as error:
+                    logger.exception(
+                        "Could not apply webhook notification %s",
+                        notification.notification_id,
+                    )
+                    notification.error = repr(error)
+                else:
+                    notification.error = ""
+
+            if notification.error:
+                notification.status = WebhookNotificationStatusChoices.FAILED
+                result.failed += 1
+            else:
+                notification.status = WebhookNotificationStatusChoices.PROCESSED
+                result.processed += 1
+
+            notification.processed_at = timezone.now()
+
+        BraintreeWebhookNotification.objects.bulk_update(
+            notifications,
+            [
+                "status",
+                "kind",
+                "braintree_subscription_id",
+                "notified_at",
+                "processed_at",
+                "error",
+            ],
+        )
+
+    return result
+
+
+def replay_webhook_notifications(
+    notification_ids: list[str] | None = None,
+    since: datetime | None = None,
+) -> int:
+    """Queue notifications to be applied again.
+
+    Without IDs, the failed notifications are queued. Notifications with
+    IDs are queued whatever their status, so processed notifications are
+    only applied twice when asked for by ID.
+    """
+    notifications = BraintreeWebhookNotification.objects.exclude(
+        status=WebhookNotificationStatusChoices.PENDING,
+    )
+
+    if notification_ids:
+        notifications = notifications.filter(notification_id__in=notification_ids)
+    else:
+        notifications = notifications.filter(
+            status=WebhookNotificationStatusChoices.FAILED,
+        )
+
+    if since is not None:
+        notifications = notifications.filter(received_at__gte=since)
+
+    return notifications.update(
+        status=WebhookNotificationStatusChoices.PENDING,
+        processed_at=None,
+        error="",
+    )
+
+
+def prune_webhook_notifications(
+    retention: timedelta = timedelta(days=WEBHOOK_RETENTION_DAYS),
+) -> int:
+    """Delete the processed notifications received before the retention
+    period, keeping failed ones for replays."""
+    deleted, _ = BraintreeWebhookNotification.objects.filter(
+        status=WebhookNotificationStatusChoices.PROCESSED,
+        received_at__lt=timezone.now() - retention,
+    ).delete()
+
+    return deleted